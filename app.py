@@ -2,94 +2,54 @@ import os
 import logging
 import sys
 from logging.handlers import RotatingFileHandler
-from dotenv import load_dotenv
-from flask import Flask
-from app.extensions import db
-from app.routes.api import api_bp
-from app.routes.main import main_bp
-from app.config import Config
 
-# Configure logging
-log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, 'app.log')
-
-# Create console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.DEBUG)
-
-# Create file handler
-file_handler = RotatingFileHandler(
-    log_file,
-    maxBytes=1024 * 1024,  # 1MB
-    backupCount=5,
-    encoding='utf-8'
-)
-file_handler.setLevel(logging.DEBUG)
-
-# Create formatter
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
-# Add formatter to handlers
-console_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
-
-# Get root logger
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.DEBUG)
-
-# Remove any existing handlers
-for handler in root_logger.handlers[:]:
-    root_logger.removeHandler(handler)
-
-# Add our handlers
-root_logger.addHandler(console_handler)
-root_logger.addHandler(file_handler)
-
-# Get logger for this module
-logger = logging.getLogger(__name__)
-
-# Test logging
-logger.debug("Debug message")
-logger.info("Info message")
-logger.warning("Warning message")
-logger.error("Error message")
-
-# Force flush handlers
-for handler in root_logger.handlers:
-    handler.flush()
-
-# Load environment variables
-load_dotenv()
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+
+def configure_logging(level=logging.DEBUG):
+    """Send root logging to stdout and to a rotating logs/app.log"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # Create console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
+
+    # Create file handler
+    file_handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, 'app.log'),
+        maxBytes=1024 * 1024,  # 1MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    file_handler.setLevel(level)
+
+    # Create formatter
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    console_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+
+    # Replace any existing root handlers with ours
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(console_handler)
+    root_logger.addHandler(file_handler)
 
 def create_app():
-    app = Flask(__name__,
-                template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'templates'),
-                static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'static'))
-    
-    # Configure app
-    app.config.from_object('app.config.Config')
+    # Imported here so that importing this module stays cheap
+    from dotenv import load_dotenv
+    from app import create_app as create_package_app
+    from app.config import Config
+
+    load_dotenv()
+    app = create_package_app(start_workers=True)
     Config.init_app(app)
-    
-    # Initialize extensions
-    db.init_app(app)
-    
-    # Create upload directory
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    
-    # Register blueprints
-    app.register_blueprint(main_bp)
-    app.register_blueprint(api_bp)
-    
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-    
     return app
 
 if __name__ == '__main__':
+    configure_logging()
     app = create_app()
     app.run(debug=True, port=5000)
@@ -2,10 +2,24 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 import os
 import logging
+import threading
 from logging.handlers import RotatingFileHandler
 from .extensions import db
+from .schema import upgrade_schema
 
-def create_app():
+def _warm_up_matcher(app):
+    from .services.matcher import warm_up
+    warm_up(app)
+
+def create_app(start_workers=False):
+    """
+    Build the application
+
+    Background ingest and ranking workers and the matcher warm-up only start
+    with start_workers=True, which the WSGI entry points pass; scripts such
+    as create_db.py and migrate_db.py get an app that never parses or ranks
+    anything.
+    """
     app = Flask(__name__)
     
     # Setup logging first
@@ -47,6 +61,7 @@ def create_app():
     with app.app_context():
         try:
             db.create_all()
+            upgrade_schema()
             app.logger.info("Database tables created successfully")
         except Exception as e:
             app.logger.error(f"Error creating database tables: {str(e)}")
@@ -56,4 +71,28 @@ def create_app():
             app.logger.error(f"Full error traceback:\n{error_details}")
             raise
     
+    # Stage timings, cache and queue metrics for /metrics
+    from .services import metrics
+    metrics.init_app(app)
+    
+    # Opt-in request profiling, see services/profiler.py
+    from .services import profiler
+    profiler.init_app(app)
+    
+    # Push candidate status changes to watchers
+    from .services.status_notifier import status_notifier
+    status_notifier.init_app(app)
+    
+    # Background resume parsing and candidate ranking queues
+    from .services.ingest_queue import ingest_queue
+    from .services.ranking import ranking_queue
+    ingest_queue.init_app(app)
+    ranking_queue.init_app(app)
+    if start_workers:
+        ingest_queue.start()
+        ranking_queue.start()
+        # Load the local candidate matcher off the request path; NumPy is imported on that thread
+        app.extensions['matcher_ready'] = threading.Event()
+        threading.Thread(target=_warm_up_matcher, args=(app,), name='matcher-warmup', daemon=True).start()
+    
     return app
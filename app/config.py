@@ -18,6 +18,7 @@ class Config:
     UPLOAD_FOLDER = os.path.join(BASE_DIR, os.getenv('UPLOAD_FOLDER', 'uploads'))
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB default
     ALLOWED_EXTENSIONS = set(os.getenv('ALLOWED_EXTENSIONS', 'pdf,docx').split(','))
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')  # Content-addressed resume storage, see services/storage.py
     
     # Database Configuration
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///' + str(BASE_DIR / 'hr_resume.db'))
@@ -29,6 +30,108 @@ class Config:
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_ORG_ID = os.getenv('OPENAI_ORG_ID')
+    OPENAI_API_BASE = os.getenv('OPENAI_API_BASE', 'https://api.openai.com/v1')  # Point at a fake server for tests
+    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', 60))  # Seconds to wait for a response
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', 5))
+    OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', 3))
+    OPENAI_REQUESTS_PER_MINUTE = float(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 500))  # Per process
+    OPENAI_TOKENS_PER_MINUTE = float(os.getenv('OPENAI_TOKENS_PER_MINUTE', 90000))  # Per process
+    OPENAI_POOL_SIZE = int(os.getenv('OPENAI_POOL_SIZE', 10))  # Keep-alive connections per process
+    OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', 8))  # Threads for concurrent completions
+    OPENAI_READINESS_INTERVAL = float(os.getenv('OPENAI_READINESS_INTERVAL', 60))  # Seconds between connectivity probes
+    
+    # Prompt Budget Configuration
+    PROMPT_TOKENIZER = os.getenv('PROMPT_TOKENIZER', 'auto')  # auto uses tiktoken when installed, heuristic never does
+    PROMPT_RESUME_TOKENS = int(os.getenv('PROMPT_RESUME_TOKENS', 1500))  # Resume text in an evaluation prompt
+    PROMPT_JOB_TOKENS = int(os.getenv('PROMPT_JOB_TOKENS', 800))  # Job requirements in an evaluation prompt
+    PROMPT_CHAT_CONTEXT_TOKENS = int(os.getenv('PROMPT_CHAT_CONTEXT_TOKENS', 800))  # Candidate context in /api/chat
+    
+    # Background Ingestion Configuration
+    INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', 2))  # Parser threads per web process, 0 disables
+    INGEST_POLL_INTERVAL = float(os.getenv('INGEST_POLL_INTERVAL', 2.0))  # Seconds between job table polls
+    INGEST_JOB_TIMEOUT = int(os.getenv('INGEST_JOB_TIMEOUT', 600))  # Seconds before a parsing job is reclaimed
+    INGEST_MAX_ATTEMPTS = int(os.getenv('INGEST_MAX_ATTEMPTS', 3))
+    
+    # Batch Upload Configuration
+    BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', 1000))
+    BATCH_MAX_UNCOMPRESSED_BYTES = int(os.getenv('BATCH_MAX_UNCOMPRESSED_BYTES', 2 * 1024 * 1024 * 1024))  # 2GB default
+    BATCH_PROGRESS_TIMEOUT = int(os.getenv('BATCH_PROGRESS_TIMEOUT', 900))  # Seconds to stream parse progress
+    BATCH_POLL_INTERVAL = float(os.getenv('BATCH_POLL_INTERVAL', 1.0))
+    
+    # Status Updates Configuration
+    # Each open /api/candidates/events stream holds one gunicorn thread until it
+    # ends, and every browser tab with uploads still parsing keeps one open. Size
+    # workers x threads for the expected watchers plus normal traffic: 4 workers
+    # x 16 threads serve about 40 watching tabs and still leave 24 threads for
+    # requests. Streams end after STATUS_STREAM_TIMEOUT and reconnect, which
+    # rebalances them across workers and frees threads held by vanished clients.
+    STATUS_POLL_INTERVAL = float(os.getenv('STATUS_POLL_INTERVAL', 1.0))  # Seconds between change checks while clients watch
+    STATUS_LOOKBACK = int(os.getenv('STATUS_LOOKBACK', 5))  # Seconds of changes re-read to catch late commits
+    STATUS_STREAM_TIMEOUT = int(os.getenv('STATUS_STREAM_TIMEOUT', 60))  # Seconds before a watcher reconnects
+    STATUS_MAX_WATCHED = int(os.getenv('STATUS_MAX_WATCHED', 200))  # Candidate ids per event stream
+    
+    # Candidate Ranking Configuration
+    RANKING_WORKERS = int(os.getenv('RANKING_WORKERS', 1))  # Ranking jobs run at once per web process, 0 disables
+    RANKING_POLL_INTERVAL = float(os.getenv('RANKING_POLL_INTERVAL', 2.0))
+    RANKING_JOB_TIMEOUT = int(os.getenv('RANKING_JOB_TIMEOUT', 900))  # Seconds without progress before a job is reclaimed
+    RANKING_MAX_ATTEMPTS = int(os.getenv('RANKING_MAX_ATTEMPTS', 3))
+    RANKING_CONCURRENCY = int(os.getenv('RANKING_CONCURRENCY', 4))  # Default concurrent evaluations per job
+    RANKING_MAX_CONCURRENCY = int(os.getenv('RANKING_MAX_CONCURRENCY', 16))
+    RANKING_MAX_CANDIDATES = int(os.getenv('RANKING_MAX_CANDIDATES', 1000))
+    RANKING_TOKEN_BUDGET = int(os.getenv('RANKING_TOKEN_BUDGET', 0))  # Default per-job token budget, 0 for unlimited
+    
+    # Local Matching Configuration
+    MATCHER_DIMS = int(os.getenv('MATCHER_DIMS', 2 ** 20))  # Hashed feature space, power of two
+    MATCHER_SYNC_INTERVAL = float(os.getenv('MATCHER_SYNC_INTERVAL', 5.0))  # Seconds between pulls of new candidates
+    
+    # Parse Cache Configuration
+    PARSE_CACHE_ENABLED = os.getenv('PARSE_CACHE_ENABLED', 'true').lower() == 'true'
+    PARSE_CACHE_MAX_BYTES = int(os.getenv('PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # 256MB default
+    
+    # Evaluation Cache Configuration
+    EVAL_CACHE_ENABLED = os.getenv('EVAL_CACHE_ENABLED', 'true').lower() == 'true'
+    EVAL_CACHE_TTL = int(os.getenv('EVAL_CACHE_TTL', 7 * 24 * 3600))  # Seconds, 7 days default
+    EVAL_CACHE_MAX_BYTES = int(os.getenv('EVAL_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # 64MB default
+    
+    # Skill Taxonomy Configuration
+    SKILL_TAXONOMY_PATH = os.getenv('SKILL_TAXONOMY_PATH', os.path.join(BASE_DIR, 'app', 'data', 'skills.json'))
+    SKILL_TAXONOMY_CHECK_INTERVAL = float(os.getenv('SKILL_TAXONOMY_CHECK_INTERVAL', 30))  # Seconds between file change checks
+    SKILL_ADMIN_HEADER = os.getenv('SKILL_ADMIN_HEADER', 'X-Admin-Token')
+    SKILL_ADMIN_TOKEN = os.getenv('SKILL_ADMIN_TOKEN', '')  # Required by POST /api/skills/reload; unset disables it
+    
+    # Parser Configuration
+    PARSER_PDF_BACKENDS = os.getenv('PARSER_PDF_BACKENDS', 'pypdf2,pdfminer')  # Fastest first, see benchmarks/bench_parsers.py
+    PARSER_DOCX_BACKENDS = os.getenv('PARSER_DOCX_BACKENDS', 'docx2txt,python-docx')
+    PARSER_BACKENDS = {'pdf': PARSER_PDF_BACKENDS, 'docx': PARSER_DOCX_BACKENDS}
+    PARSER_MIN_CHARS_PER_PAGE = int(os.getenv('PARSER_MIN_CHARS_PER_PAGE', 50))  # Less text than this means a scan
+    PARSER_MAX_GARBAGE = float(os.getenv('PARSER_MAX_GARBAGE', 0.1))  # Share of missing-glyph characters tolerated
+    PARSER_DOCUMENT_CACHE = int(os.getenv('PARSER_DOCUMENT_CACHE', 32))  # Extracted documents kept per process
+    
+    # OCR Configuration
+    OCR_WORKERS = int(os.getenv('OCR_WORKERS', min(4, os.cpu_count() or 1)))  # OCR processes per web process
+    OCR_DPI = int(os.getenv('OCR_DPI', 200))
+    OCR_GRAYSCALE = os.getenv('OCR_GRAYSCALE', 'true').lower() == 'true'
+    OCR_LANG = os.getenv('OCR_LANG', 'vie+eng')
+    OCR_PAGE_TIMEOUT = int(os.getenv('OCR_PAGE_TIMEOUT', 120))  # Seconds without any page finishing
+    
+    # Metrics Configuration
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', '')  # Shared by all workers so /metrics sums them, see gunicorn.conf.py
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # Seconds between snapshot writes
+    
+    # Profiling Configuration
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'  # Off: no middleware at all
+    PROFILE_HEADER = os.getenv('PROFILE_HEADER', 'X-Profile-Token')  # Send it to profile one request
+    PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')  # Required header value, also guards /api/admin/profiles; unset keeps profiling off
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))  # Share of all requests profiled
+    PROFILE_JOB_SAMPLE_RATE = float(os.getenv('PROFILE_JOB_SAMPLE_RATE', 0))  # Share of parse jobs profiled
+    PROFILE_MIN_SECONDS = float(os.getenv('PROFILE_MIN_SECONDS', 0))  # Sampled profiles faster than this are dropped
+    PROFILE_FORMAT = os.getenv('PROFILE_FORMAT', 'pstats')  # pstats (cProfile) or collapsed (sampled stacks)
+    PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', 0.005))  # Seconds between stack samples
+    PROFILE_DIR = os.path.join(BASE_DIR, os.getenv('PROFILE_DIR', 'profiles'))
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 50))
+    PROFILE_MAX_BYTES = int(os.getenv('PROFILE_MAX_BYTES', 100 * 1024 * 1024))  # 100MB
     
     # Logging Configuration
     LOG_DIR = os.path.join(BASE_DIR, 'logs')
@@ -1 +1,7 @@
 from app.models.candidate import Candidate
+from app.models.candidate_skill import CandidateSkill
+from app.models.parse_job import ParseJob
+from app.models.parse_cache import ParseCacheEntry
+from app.models.evaluation_cache import EvaluationCacheEntry
+from app.models.ranking_job import RankingJob
+from app.models.ranking_result import RankingResult
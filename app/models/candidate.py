@@ -4,6 +4,11 @@ from ..extensions import db
 class Candidate(db.Model):
     """Candidate model for storing resume information"""
     __tablename__ = 'candidates'
+    __table_args__ = (
+        db.Index('ix_candidates_status_id', 'status', 'id'),  # Status filter + keyset pagination
+        db.Index('ix_candidates_created_at', 'created_at'),
+        db.Index('ix_candidates_updated_at', 'updated_at', 'id'),  # Incremental sync of the local matcher
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
@@ -13,10 +18,16 @@ class Candidate(db.Model):
     education = db.Column(db.Text)
     experience = db.Column(db.Text)
     resume_path = db.Column(db.String(255))
-    status = db.Column(db.String(20), default='pending')  # pending, reviewed, accepted, rejected
+    status = db.Column(db.String(20), default='pending')  # queued, parsing, parsed, failed, pending, reviewed, accepted, rejected
     evaluation = db.Column(db.Text)  # Store AI evaluation
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Normalized copy of skills for indexed search, kept in sync by skill_search.set_candidate_skills
+    skill_links = db.relationship('CandidateSkill', cascade='all, delete-orphan', passive_deletes=True)
+
+    FIELDS = ('id', 'name', 'email', 'phone', 'skills', 'education', 'experience',
+              'resume_path', 'status', 'evaluation', 'created_at', 'updated_at')
+    SUMMARY_FIELDS = ('id', 'name', 'email', 'phone', 'skills', 'status', 'created_at', 'updated_at')
 
     def __init__(self, name=None, email=None, phone=None, skills=None, 
                  education=None, experience=None, resume_path=None, 
@@ -34,19 +45,11 @@ class Candidate(db.Model):
     def __repr__(self):
         return f'<Candidate {self.name or "Unknown"}>'
 
-    def to_dict(self):
-        """Convert candidate to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'phone': self.phone,
-            'skills': self.skills,
-            'education': self.education,
-            'experience': self.experience,
-            'resume_path': self.resume_path,
-            'status': self.status,
-            'evaluation': self.evaluation,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    def to_dict(self, fields=None):
+        """Convert candidate to dictionary, optionally only the given fields"""
+        # Only requested attributes are touched, so deferred columns stay unloaded
+        data = {}
+        for field in fields or self.FIELDS:
+            value = getattr(self, field)
+            data[field] = value.isoformat() if isinstance(value, datetime) else value
+        return data
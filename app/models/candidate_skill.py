@@ -0,0 +1,18 @@
+from ..extensions import db
+
+class CandidateSkill(db.Model):
+    """One normalized skill of a candidate, for indexed skill search"""
+    __tablename__ = 'candidate_skills'
+    __table_args__ = (
+        db.Index('ix_candidate_skills_skill', 'skill', 'candidate_id'),
+    )
+
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True)
+    skill = db.Column(db.String(100), primary_key=True)  # Lowercased canonical name
+
+    def __init__(self, candidate_id=None, skill=None):
+        self.candidate_id = candidate_id
+        self.skill = skill
+
+    def __repr__(self):
+        return f'<CandidateSkill {self.candidate_id} {self.skill}>'
@@ -0,0 +1,28 @@
+from datetime import datetime
+from ..extensions import db
+
+class EvaluationCacheEntry(db.Model):
+    """LLM evaluation result keyed by SHA-256 of (model, prompt version, resume, job requirements)"""
+    __tablename__ = 'evaluation_cache'
+
+    key = db.Column(db.String(64), primary_key=True)
+    model = db.Column(db.String(50), nullable=False)
+    prompt_version = db.Column(db.Integer, nullable=False)
+    result = db.Column(db.Text, nullable=False)
+    size_bytes = db.Column(db.Integer, default=0)
+    hits = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __init__(self, key=None, model=None, prompt_version=None, result=None, size_bytes=0, expires_at=None):
+        self.key = key
+        self.model = model
+        self.prompt_version = prompt_version
+        self.result = result
+        self.size_bytes = size_bytes
+        self.expires_at = expires_at
+        self.hits = 0
+
+    def __repr__(self):
+        return f'<EvaluationCacheEntry {self.key[:12]}>'
@@ -0,0 +1,26 @@
+from datetime import datetime
+from ..extensions import db
+
+class ParseCacheEntry(db.Model):
+    """Extracted text and parsed fields for a resume, keyed by SHA-256 of its bytes"""
+    __tablename__ = 'parse_cache'
+
+    digest = db.Column(db.String(64), primary_key=True)
+    parser_version = db.Column(db.String(40), nullable=False)
+    text = db.Column(db.Text)
+    fields = db.Column(db.Text)  # Store as JSON string
+    size_bytes = db.Column(db.Integer, default=0)
+    hits = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __init__(self, digest=None, parser_version=None, text=None, fields=None, size_bytes=0):
+        self.digest = digest
+        self.parser_version = parser_version
+        self.text = text
+        self.fields = fields
+        self.size_bytes = size_bytes
+        self.hits = 0
+
+    def __repr__(self):
+        return f'<ParseCacheEntry {self.digest[:12]}>'
@@ -0,0 +1,38 @@
+from datetime import datetime
+from ..extensions import db
+
+class ParseJob(db.Model):
+    """Background job that parses an uploaded resume into its Candidate"""
+    __tablename__ = 'parse_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), index=True)
+    file_path = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, parsing, parsed, failed
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __init__(self, candidate_id=None, file_path=None, status='queued'):
+        self.candidate_id = candidate_id
+        self.file_path = file_path
+        self.status = status
+        self.attempts = 0
+
+    def __repr__(self):
+        return f'<ParseJob {self.id} {self.status}>'
+
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'candidate_id': self.candidate_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from ..extensions import db
+
+class RankingJob(db.Model):
+    """Background job that scores a set of candidates against one job description"""
+    __tablename__ = 'ranking_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)  # analyze_job_requirements output, computed once per job
+    candidate_ids = db.Column(db.Text)  # Store as JSON string
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    concurrency = db.Column(db.Integer, default=4)
+    token_budget = db.Column(db.Integer)  # Estimated tokens this job may spend, None for unlimited
+    tokens_used = db.Column(db.Integer, default=0)
+    total = db.Column(db.Integer, default=0)
+    evaluated = db.Column(db.Integer, default=0)
+    failed = db.Column(db.Integer, default=0)
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # Last progress, used to detect dead workers
+    finished_at = db.Column(db.DateTime)
+
+    def __init__(self, job_description=None, candidate_ids=None, concurrency=4, token_budget=None):
+        self.job_description = job_description
+        self.candidate_ids = json.dumps(list(candidate_ids or []))
+        self.total = len(candidate_ids or [])
+        self.concurrency = concurrency
+        self.token_budget = token_budget
+        self.status = 'queued'
+        self.tokens_used = 0
+        self.evaluated = 0
+        self.failed = 0
+        self.attempts = 0
+
+    def __repr__(self):
+        return f'<RankingJob {self.id} {self.status}>'
+
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'evaluated': self.evaluated,
+            'failed': self.failed,
+            'concurrency': self.concurrency,
+            'token_budget': self.token_budget,
+            'tokens_used': self.tokens_used,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
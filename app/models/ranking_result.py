@@ -0,0 +1,26 @@
+from datetime import datetime
+from ..extensions import db
+
+class RankingResult(db.Model):
+    """One candidate's evaluation within a ranking job"""
+    __tablename__ = 'ranking_results'
+    __table_args__ = (
+        db.Index('ix_ranking_results_job_score', 'ranking_job_id', 'score'),  # Best-first rankings
+    )
+
+    ranking_job_id = db.Column(db.Integer, db.ForeignKey('ranking_jobs.id', ondelete='CASCADE'), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float)  # matchScore 0-100, None if the evaluation failed
+    evaluation = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __init__(self, ranking_job_id=None, candidate_id=None, score=None, evaluation=None, error=None):
+        self.ranking_job_id = ranking_job_id
+        self.candidate_id = candidate_id
+        self.score = score
+        self.evaluation = evaluation
+        self.error = error
+
+    def __repr__(self):
+        return f'<RankingResult {self.ranking_job_id}:{self.candidate_id} {self.score}>'
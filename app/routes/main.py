@@ -1,20 +1,29 @@
-from flask import Blueprint, render_template, request, jsonify, current_app, send_from_directory
-from werkzeug.utils import secure_filename
-import os
+from flask import Blueprint, render_template, request, jsonify, current_app, send_from_directory, Response, stream_with_context
+from sqlalchemy.orm import load_only
+import hmac
+import json
+import time
+from ..config import Config
 from ..extensions import db
 from ..models.candidate import Candidate
-from ..services.resume_parser import parse_resume
-import openai
+from ..models.parse_job import ParseJob
+from ..models.ranking_job import RankingJob
+from ..services.ingest_queue import ingest_queue
+from ..services.batch_upload import process_batch
+from ..services.ranking import ranking_queue, get_rankings
+from ..services import metrics, profiler, search
+from ..services.candidate_query import list_candidates
+from ..services.skill_search import set_candidate_skills
+from ..services.skill_taxonomy import get_taxonomy, reload_taxonomy
+from ..services.openai_client import get_client, readiness
+from ..services.prompt_builder import build_candidate_context, normalize_whitespace
+from ..services.status_notifier import status_notifier
+from ..services.storage import StorageLimitError, get_storage
 
 bp = Blueprint('main', __name__)
 
-# Configure upload folder
-UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -26,12 +35,66 @@ def index():
 @bp.route('/health')
 def health():
     current_app.logger.info("Health check requested")
-    return jsonify({'status': 'healthy'})
+    # Cached probe result; never waits on or pays for an OpenAI call
+    return jsonify({'status': 'healthy', 'openai': readiness()})
+
+@bp.route('/metrics')
+def prometheus_metrics():
+    if not Config.METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    # Sums every gunicorn worker's snapshot, whichever worker answers
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@bp.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    if not profiler.enabled():
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    if not profiler.authorized(request.headers.get(Config.PROFILE_HEADER)):
+        return jsonify({'error': f'Missing or wrong {Config.PROFILE_HEADER} header'}), 403
+    return jsonify({'profiles': profiler.list_profiles()})
+
+@bp.route('/api/admin/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """
+    Download a profile, or ?summary=1 for the top functions of a pstats profile
+
+    Open .prof files with `python -m pstats` or snakeviz and .collapsed
+    files with flamegraph.pl or speedscope.
+    """
+    if not profiler.enabled():
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    if not profiler.authorized(request.headers.get(Config.PROFILE_HEADER)):
+        return jsonify({'error': f'Missing or wrong {Config.PROFILE_HEADER} header'}), 403
+    if not profiler.is_profile_name(name):
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('summary') and name.endswith('.prof'):
+        try:
+            return jsonify({'name': name, 'functions': profiler.summary(name, request.args.get('limit', 20, type=int))})
+        except FileNotFoundError:
+            return jsonify({'error': 'Profile not found'}), 404
+    return send_from_directory(Config.PROFILE_DIR, name, as_attachment=True)
 
 @bp.route('/api/candidates', methods=['GET'])
 def get_candidates():
-    candidates = Candidate.query.all()
-    return jsonify([candidate.to_dict() for candidate in candidates])
+    try:
+        return jsonify(list_candidates(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/search', methods=['GET'])
+def search_candidates():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No query provided'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    try:
+        return jsonify({'query': query, 'results': search.search_candidates(query, limit)})
+    except Exception as e:
+        current_app.logger.error(f"Error searching candidates: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @bp.route('/api/upload', methods=['POST'])
 def upload_resume():
@@ -44,37 +107,64 @@ def upload_resume():
             return jsonify({'error': 'No selected file'}), 400
         
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(filepath)
-            
-            # Parse resume
-            parsed_data = parse_resume(filepath)
+            # Hashed while streamed to disk; identical bytes share one blob
+            with metrics.STAGE_SECONDS.time(stage='file_save'):
+                stored = get_storage().save(file.stream, file.filename.rsplit('.', 1)[1], limit=Config.MAX_CONTENT_LENGTH)
             
-            # Create candidate
-            candidate = Candidate(
-                name=parsed_data.get('name'),
-                email=parsed_data.get('email'),
-                phone=parsed_data.get('phone'),
-                skills=parsed_data.get('skills'),
-                education=parsed_data.get('education'),
-                experience=parsed_data.get('experience'),
-                resume_path=filepath,
-                status='pending'
-            )
-            
-            db.session.add(candidate)
-            db.session.commit()
+            candidate, job, cache_hit = ingest_queue.submit(stored.address)
+            if cache_hit:
+                # Identical bytes were parsed before: extraction was skipped entirely
+                return jsonify({
+                    'message': 'Resume uploaded successfully',
+                    'cache_hit': True,
+                    'candidate_id': candidate.id,
+                    'candidate': candidate.to_dict()
+                }), 201
             
             return jsonify({
-                'message': 'Resume uploaded successfully',
-                'candidate': candidate.to_dict()
-            }), 201
+                'message': 'Resume queued for processing',
+                'cache_hit': False,
+                'job_id': job.id,
+                'candidate_id': candidate.id,
+                'status': job.status
+            }), 202
+        
+        return jsonify({'error': 'File type not allowed'}), 400
             
+    except StorageLimitError as e:
+        return jsonify({'error': str(e)}), 413
     except Exception as e:
         current_app.logger.error(f"Error uploading resume: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/api/upload/batch', methods=['POST'])
+def upload_batch():
+    """
+    Upload many resumes (or ZIP archives of resumes) in one request
+
+    Progress is streamed back as one JSON object per line, or as
+    Server-Sent Events when the client sends Accept: text/event-stream.
+    Pass wait=0 to end the stream as soon as every file is queued.
+    """
+    files = request.files.getlist('resumes') + request.files.getlist('resume')
+    if not any(f.filename for f in files):
+        return jsonify({'error': 'No file part'}), 400
+
+    wait = request.args.get('wait', '1').lower() not in ('0', 'false', 'no')
+    use_sse = 'text/event-stream' in request.headers.get('Accept', '')
+
+    def generate():
+        for event in process_batch(files, allowed_file, wait=wait):
+            payload = json.dumps(event, ensure_ascii=False)
+            if use_sse:
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+            else:
+                yield payload + '\n'
+
+    mimetype = 'text/event-stream' if use_sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @bp.route('/api/chat', methods=['POST'])
 def chat():
     try:
@@ -82,10 +172,9 @@ def chat():
         if not data or 'message' not in data:
             return jsonify({'error': 'No message provided'}), 400
 
-        # Get OpenAI API key from environment variable
-        openai.api_key = os.environ.get('OPENAI_API_KEY')
-        openai.organization = os.environ.get('OPENAI_ORG_ID')
-        if not openai.api_key:
+        # Shared client: pooled connections, rate limits and retries
+        client = get_client()
+        if not client.configured:
             return jsonify({'error': 'OpenAI API key not configured'}), 500
 
         # Get candidate context if provided
@@ -94,49 +183,75 @@ def chat():
         if candidate_id:
             candidate = Candidate.query.get(candidate_id)
             if candidate:
-                context = f"""
-                Candidate Information:
-                Name: {candidate.name}
-                Email: {candidate.email}
-                Phone: {candidate.phone}
-                Skills: {candidate.skills}
-                Education: {candidate.education}
-                Experience: {candidate.experience}
-                Status: {candidate.status}
-                """
+                # Compacted to PROMPT_CHAT_CONTEXT_TOKENS, most relevant fields first
+                context = build_candidate_context(candidate)
 
         # Prepare messages for ChatGPT
         messages = [
             {
                 "role": "system", 
-                "content": """Bạn là trợ lý HR, giúp đánh giá hồ sơ ứng viên và trả lời các câu hỏi về tuyển dụng.
+                "content": normalize_whitespace("""Bạn là trợ lý HR, giúp đánh giá hồ sơ ứng viên và trả lời các câu hỏi về tuyển dụng.
                 Hãy trả lời bằng tiếng Việt một cách chuyên nghiệp và thân thiện.
                 Khi đánh giá ứng viên, hãy dựa trên:
                 1. Trình độ học vấn
                 2. Kinh nghiệm làm việc
                 3. Kỹ năng chuyên môn và kỹ năng mềm
                 4. Sự phù hợp với vị trí
-                """
+                """)
             },
-            {"role": "user", "content": f"{context}\n\nCâu hỏi: {data['message']}"}
+            {"role": "user", "content": f"{context}\n\nCâu hỏi: {data['message']}".strip()}
         ]
 
+        if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+            return _stream_chat(client, messages)
+
         # Call ChatGPT API
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
+        reply = client.chat(
+            messages,
             max_tokens=1000,  # Tăng độ dài phản hồi
             temperature=0.7
         )
 
         return jsonify({
-            'message': response.choices[0].message['content'].strip()
+            'message': reply
         })
 
     except Exception as e:
         current_app.logger.error(f"Error in chat endpoint: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _stream_chat(client, messages):
+    """
+    Relay completion deltas as Server-Sent Events as soon as they arrive
+
+    The first delta is awaited before responding, so failures that happen
+    before any text (bad key, retries exhausted) still return a JSON error.
+    Events: 'delta' {content}, then 'done' {ttft_ms, total_ms} or 'error'.
+    """
+    started = time.perf_counter()
+    chunks = client.stream_chat(messages, max_tokens=1000, temperature=0.7)
+    first = next(chunks, None)
+    ttft_ms = (time.perf_counter() - started) * 1000
+    current_app.logger.info(f"Chat time to first token: {ttft_ms:.0f}ms")
+    logger = current_app.logger
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    def generate():
+        try:
+            if first is not None:
+                yield sse('delta', {'content': first})
+            for chunk in chunks:
+                yield sse('delta', {'content': chunk})
+            yield sse('done', {'ttft_ms': round(ttft_ms), 'total_ms': round((time.perf_counter() - started) * 1000)})
+        except Exception as e:
+            logger.error(f"Error streaming chat reply: {str(e)}")
+            yield sse('error', {'error': str(e)})
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @bp.route('/api/candidates', methods=['POST'])
 def create_candidate():
     try:
@@ -145,12 +260,14 @@ def create_candidate():
             name=data.get('name'),
             email=data.get('email'),
             phone=data.get('phone'),
-            skills=data.get('skills'),
             education=data.get('education'),
             experience=data.get('experience'),
             status='pending'
         )
+        set_candidate_skills(candidate, data.get('skills'))
         db.session.add(candidate)
+        db.session.flush()
+        search.index_candidate(candidate)
         db.session.commit()
         return jsonify(candidate.to_dict()), 201
     except Exception as e:
@@ -161,3 +278,153 @@ def create_candidate():
 def get_candidate(id):
     candidate = Candidate.query.get_or_404(id)
     return jsonify(candidate.to_dict())
+
+@bp.route('/api/jobs/<int:id>', methods=['GET'])
+def get_job(id):
+    job = ParseJob.query.get_or_404(id)
+    return jsonify(job.to_dict())
+
+@bp.route('/api/candidates/events', methods=['GET'])
+def candidate_events():
+    """
+    Server-Sent Events stream of candidate status changes
+
+    Pass ids=1,2,3 to watch specific candidates (their current status is
+    sent first), or nothing to hear about every candidate. Each 'status'
+    event carries id, name, status, updated_at and, for failures, error.
+    The stream ends after STATUS_STREAM_TIMEOUT; EventSource reconnects.
+    """
+    ids = None
+    if request.args.get('ids'):
+        try:
+            ids = {int(i) for i in request.args['ids'].split(',') if i.strip()}
+        except ValueError:
+            return jsonify({'error': 'ids must be comma-separated integers'}), 400
+        if len(ids) > Config.STATUS_MAX_WATCHED:
+            return jsonify({'error': f'At most {Config.STATUS_MAX_WATCHED} candidates per stream'}), 400
+
+    def sse(payload):
+        return f"event: status\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    def generate():
+        # Subscribe before the snapshot so nothing committed in between is lost
+        with status_notifier.subscribe(ids) as subscription:
+            yield 'retry: 3000\n\n'
+            if ids:
+                for event in status_notifier.snapshot(ids):
+                    yield sse(event)
+                db.session.remove()  # Return the connection while the stream idles
+            deadline = time.monotonic() + Config.STATUS_STREAM_TIMEOUT
+            while time.monotonic() < deadline and not subscription.overflowed:
+                event = subscription.get(timeout=15)
+                yield sse(event) if event is not None else ': keepalive\n\n'
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/api/skills/lookup', methods=['GET'])
+def lookup_skill():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No query provided'}), 400
+    taxonomy = get_taxonomy()
+    canonical = taxonomy.canonical(query)
+    return jsonify({
+        'query': query,
+        'canonical': canonical,
+        'category': taxonomy.category(canonical) if canonical else None
+    })
+
+@bp.route('/api/skills/reload', methods=['POST'])
+def reload_skills():
+    """Reload the skill taxonomy in this worker now; needs SKILL_ADMIN_TOKEN in SKILL_ADMIN_HEADER"""
+    if not Config.SKILL_ADMIN_TOKEN:
+        return jsonify({'error': 'Skill reload is disabled'}), 404
+    token = request.headers.get(Config.SKILL_ADMIN_HEADER, '')
+    if not hmac.compare_digest(token.encode('utf-8'), Config.SKILL_ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({'error': f'Missing or wrong {Config.SKILL_ADMIN_HEADER} header'}), 403
+    try:
+        # Other workers pick up the change on their next file check
+        taxonomy = reload_taxonomy()
+        return jsonify(taxonomy.to_dict())
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # The file is missing or malformed; this worker keeps the taxonomy it had
+        current_app.logger.error(f"Error reloading skill taxonomy: {str(e)}")
+        return jsonify({'error': f'Could not load skill taxonomy: {str(e)}',
+                        'current': get_taxonomy().to_dict()}), 422
+    except Exception as e:
+        current_app.logger.error(f"Error reloading skill taxonomy: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def _matcher_ready():
+    """False while this worker's matcher warm-up thread is still loading candidates"""
+    ready = current_app.extensions.get('matcher_ready')
+    return ready is None or ready.is_set()
+
+def _matcher_warming_up():
+    response = jsonify({'error': 'Candidate matcher is still loading, retry shortly'})
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+@bp.route('/api/rankings', methods=['POST'])
+def create_ranking():
+    """
+    Rank candidates against a job description in the background
+
+    Body: job_description, optional candidate_ids (default: every parsed
+    candidate), concurrency, token_budget and prefilter (evaluate only the
+    N best local matches).
+    """
+    data = request.get_json() or {}
+    job_description = (data.get('job_description') or '').strip()
+    if not job_description:
+        return jsonify({'error': 'No job description provided'}), 400
+    if data.get('prefilter') and not _matcher_ready():
+        return _matcher_warming_up()
+    try:
+        job = ranking_queue.submit(
+            job_description,
+            candidate_ids=data.get('candidate_ids'),
+            concurrency=data.get('concurrency'),
+            token_budget=data.get('token_budget'),
+            prefilter=data.get('prefilter')
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(job.to_dict()), 202
+
+@bp.route('/api/rankings/<int:ranking_id>', methods=['GET'])
+def get_ranking(ranking_id):
+    """Job progress plus the best candidates scored so far"""
+    job = RankingJob.query.get_or_404(ranking_id)
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 1000)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    include_failed = request.args.get('include_failed', '').lower() in ('1', 'true', 'yes')
+    return jsonify(dict(job.to_dict(), rankings=get_rankings(job, limit, include_failed)))
+
+@bp.route('/api/match', methods=['POST'])
+def match():
+    """Rank candidates against a job description locally, without calling OpenAI"""
+    data = request.get_json() or {}
+    job_description = (data.get('job_description') or '').strip()
+    if not job_description:
+        return jsonify({'error': 'No job description provided'}), 400
+    try:
+        limit = min(max(int(data.get('limit', 50)), 1), 1000)
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid limit'}), 400
+    if not _matcher_ready():
+        return _matcher_warming_up()
+    from ..services.matcher import match_candidates  # NumPy is loaded on first match, not at boot
+
+    matches = match_candidates(job_description, limit, data.get('candidate_ids'))
+    summary_columns = [getattr(Candidate, f) for f in Candidate.SUMMARY_FIELDS if f != 'id']
+    candidates = {c.id: c for c in (Candidate.query
+                                    .options(load_only(*summary_columns))
+                                    .filter(Candidate.id.in_([cid for cid, _ in matches]))
+                                    .all())}
+    results = [dict(candidates[cid].to_dict(Candidate.SUMMARY_FIELDS), score=score)
+               for cid, score in matches if cid in candidates]
+    return jsonify({'results': results})
@@ -0,0 +1,21 @@
+import logging
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+def upgrade_schema() -> None:
+    """
+    Bring an existing database up to the current models
+
+    db.create_all() only creates missing tables, so indexes added to a
+    model after its table exists are created here. Every step is idempotent
+    and safe to run on each startup.
+    """
+    from .services import search
+
+    engine = db.engine
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    search.ensure_schema()
+    logger.info("Database schema is up to date")
@@ -0,0 +1,124 @@
+import os
+import time
+import logging
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+from werkzeug.datastructures import FileStorage
+from ..config import Config
+from ..extensions import db
+from ..models.parse_job import ParseJob
+from .ingest_queue import ingest_queue
+from .metrics import STAGE_SECONDS
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+
+def _is_zip(storage: FileStorage) -> bool:
+    return storage.filename.lower().endswith('.zip') or storage.mimetype in ('application/zip', 'application/x-zip-compressed')
+
+def _iter_sources(files: Iterable[FileStorage]) -> Iterator[Tuple[str, Callable]]:
+    """
+    Yield (name, opener) for every resume in the request
+
+    Uploaded parts are already spooled to temporary files by Werkzeug; ZIP
+    archives are read through their central directory and each member is
+    decompressed lazily when its opener is called.
+    """
+    for storage in files:
+        if not storage or not storage.filename:
+            continue
+        if not _is_zip(storage):
+            yield storage.filename, lambda storage=storage: storage.stream
+            continue
+        try:
+            archive = zipfile.ZipFile(storage.stream)
+        except zipfile.BadZipFile:
+            yield storage.filename, None
+            continue
+        with archive:
+            for info in archive.infolist():
+                name = info.filename
+                basename = os.path.basename(name)
+                if info.is_dir() or name.startswith('__MACOSX/') or basename.startswith('.'):
+                    continue
+                yield name, lambda info=info: archive.open(info)
+
+def process_batch(files: Iterable[FileStorage], allowed_file: Callable[[str], bool],
+                  wait: bool = True) -> Iterator[Dict]:
+    """
+    Save and queue every resume in a batch, yielding progress events
+
+    Events are dictionaries with an 'event' key: 'accepted' or 'rejected'
+    as each file is stored, then 'parsed'/'failed' as background
+    workers finish, periodic 'progress' heartbeats, and a final 'done'
+    summary. With wait=False the stream ends once every file is queued.
+    """
+    counts = {'accepted': 0, 'rejected': 0, 'parsed': 0, 'failed': 0}
+    pending: Dict[int, str] = {}
+    total_bytes = 0
+
+    for name, opener in _iter_sources(files):
+        if counts['accepted'] + counts['rejected'] >= Config.BATCH_MAX_FILES:
+            counts['rejected'] += 1
+            yield {'event': 'rejected', 'file': name, 'error': f"Batch is limited to {Config.BATCH_MAX_FILES} files"}
+            continue
+        if opener is None:
+            counts['rejected'] += 1
+            yield {'event': 'rejected', 'file': name, 'error': 'Not a valid ZIP archive'}
+            continue
+        if not allowed_file(name):
+            counts['rejected'] += 1
+            yield {'event': 'rejected', 'file': name, 'error': 'File type not allowed'}
+            continue
+
+        try:
+            limit = min(Config.MAX_CONTENT_LENGTH, Config.BATCH_MAX_UNCOMPRESSED_BYTES - total_bytes)
+            with opener() as source, STAGE_SECONDS.time(stage='file_save'):
+                stored = get_storage().save(source, name.rsplit('.', 1)[1], limit=limit)
+            total_bytes += stored.size
+            # Stored blobs are kept on failure: identical uploads may already share them
+            candidate, job, cache_hit = ingest_queue.submit(stored.address)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error accepting {name} from batch: {str(e)}")
+            counts['rejected'] += 1
+            yield {'event': 'rejected', 'file': name, 'error': str(e)}
+            continue
+
+        counts['accepted'] += 1
+        yield {'event': 'accepted', 'file': name, 'candidate_id': candidate.id,
+               'job_id': job.id if job else None, 'cache_hit': cache_hit}
+        if cache_hit:
+            counts['parsed'] += 1
+            yield {'event': 'parsed', 'file': name, 'candidate_id': candidate.id, 'cache_hit': True}
+        else:
+            pending[job.id] = name
+
+    if wait:
+        yield from _wait_for_jobs(pending, counts)
+    yield dict(counts, event='done', pending=len(pending))
+
+def _wait_for_jobs(pending: Dict[int, str], counts: Dict[str, int]) -> Iterator[Dict]:
+    """Poll the job table for the whole batch at once until every job finished"""
+    deadline = time.monotonic() + Config.BATCH_PROGRESS_TIMEOUT
+    last_event = time.monotonic()
+    while pending and time.monotonic() < deadline:
+        db.session.rollback()  # End the read transaction so other workers' commits are visible
+        finished = (db.session.query(ParseJob.id, ParseJob.status, ParseJob.candidate_id, ParseJob.error)
+                    .filter(ParseJob.id.in_(list(pending)), ParseJob.status.in_(('parsed', 'failed')))
+                    .all())
+        for job_id, status, candidate_id, error in finished:
+            name = pending.pop(job_id)
+            counts[status] += 1
+            event = {'event': status, 'file': name, 'candidate_id': candidate_id, 'job_id': job_id}
+            if error:
+                event['error'] = error
+            yield event
+            last_event = time.monotonic()
+        if pending:
+            if time.monotonic() - last_event >= HEARTBEAT_SECONDS:
+                last_event = time.monotonic()
+                yield dict(counts, event='progress', pending=len(pending))
+            time.sleep(Config.BATCH_POLL_INTERVAL)
@@ -0,0 +1,82 @@
+import json
+import base64
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import load_only
+from ..models.candidate import Candidate
+from .skill_search import filter_by_skills
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+def encode_cursor(candidate_id: int) -> str:
+    """Opaque cursor pointing just past the given candidate"""
+    return base64.urlsafe_b64encode(json.dumps({'id': candidate_id}).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """Validate a comma-separated fields= projection, defaulting to the summary fields"""
+    if not value:
+        return Candidate.SUMMARY_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in Candidate.FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def _parse_datetime(value: str, name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}, expected an ISO date")
+
+def list_candidates(args) -> Dict:
+    """
+    Keyset-paginated candidate listing, newest first
+
+    Args:
+        args: Request query parameters: limit, cursor, fields, status
+              (comma-separated), created_after, created_before and
+              skill/skills_all/skills_any (comma-separated)
+
+    Returns:
+        Dictionary with the projected candidates and the cursor of the next page
+    """
+    try:
+        limit = min(max(int(args.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        raise ValueError('Invalid limit')
+    fields = parse_fields(args.get('fields'))
+
+    # Load only the projected columns; large Text columns stay deferred
+    columns = [getattr(Candidate, f) for f in fields if f != 'id']
+    query = Candidate.query.options(load_only(*columns)) if columns else Candidate.query
+
+    statuses = [s.strip() for s in args.get('status', '').split(',') if s.strip()]
+    if statuses:
+        query = query.filter(Candidate.status.in_(statuses))
+    if args.get('created_after'):
+        query = query.filter(Candidate.created_at >= _parse_datetime(args['created_after'], 'created_after'))
+    if args.get('created_before'):
+        query = query.filter(Candidate.created_at < _parse_datetime(args['created_before'], 'created_before'))
+    # skill/skills_all: every listed skill (AND), skills_any: at least one (OR)
+    all_of = (args.get('skills_all') or args.get('skill') or '').split(',')
+    any_of = (args.get('skills_any') or '').split(',')
+    query = filter_by_skills(query, all_of=all_of, any_of=any_of)
+    if args.get('cursor'):
+        query = query.filter(Candidate.id < decode_cursor(args['cursor']))
+
+    rows: List[Candidate] = query.order_by(Candidate.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'candidates': [candidate.to_dict(fields) for candidate in rows],
+        'next_cursor': encode_cursor(rows[-1].id) if has_more else None,
+        'limit': limit
+    }
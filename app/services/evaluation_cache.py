@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from ..config import Config
+from ..extensions import db
+from ..models.evaluation_cache import EvaluationCacheEntry
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+    if name in ('hits', 'misses'):
+        CACHE_REQUESTS.inc(amount, cache='evaluation', result='hit' if name == 'hits' else 'miss')
+
+def cache_key(model: str, prompt_version: int, *parts: str) -> str:
+    """SHA-256 over the model, prompt template version and every prompt input"""
+    sha = hashlib.sha256(f"{model}\0{prompt_version}".encode('utf-8'))
+    for part in parts:
+        encoded = (part or '').encode('utf-8')
+        # Length-prefix each part so ('ab', 'c') and ('a', 'bc') differ
+        sha.update(b'\0%d\0' % len(encoded))
+        sha.update(encoded)
+    return sha.hexdigest()
+
+def get(key: str) -> Optional[str]:
+    """
+    Return a cached, unexpired result and mark it as recently used
+
+    Cache failures are logged and treated as misses so evaluation still works.
+    """
+    if not Config.EVAL_CACHE_ENABLED:
+        return None
+    try:
+        entry = EvaluationCacheEntry.query.get(key)
+        now = datetime.utcnow()
+        if entry is None or entry.expires_at <= now:
+            _count('misses')
+            return None
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = now
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f"Evaluation cache lookup failed: {str(e)}")
+        _count('misses')
+        return None
+    _count('hits')
+    return entry.result
+
+def put(key: str, model: str, prompt_version: int, result: str, ttl: Optional[int] = None) -> None:
+    """Store a successful result, then evict expired and least recently used entries"""
+    if not Config.EVAL_CACHE_ENABLED or not result:
+        return
+    now = datetime.utcnow()
+    try:
+        entry = EvaluationCacheEntry.query.get(key)
+        if entry is None:
+            entry = EvaluationCacheEntry(key=key)
+            db.session.add(entry)
+        entry.model = model
+        entry.prompt_version = prompt_version
+        entry.result = result
+        entry.size_bytes = len(result.encode('utf-8'))
+        entry.expires_at = now + timedelta(seconds=Config.EVAL_CACHE_TTL if ttl is None else ttl)
+        entry.last_used_at = now
+        db.session.commit()
+        _count('stores')
+        evict()
+    except SQLAlchemyError as e:
+        # Another worker stored the same evaluation first, or the cache is unavailable
+        db.session.rollback()
+        logger.warning(f"Evaluation cache store failed: {str(e)}")
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """Delete expired entries, then least recently used ones until the cache fits in max_bytes"""
+    max_bytes = Config.EVAL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    removed = (EvaluationCacheEntry.query
+               .filter(EvaluationCacheEntry.expires_at <= datetime.utcnow())
+               .delete(synchronize_session=False))
+
+    total = db.session.query(func.coalesce(func.sum(EvaluationCacheEntry.size_bytes), 0)).scalar()
+    if total > max_bytes:
+        oldest = (db.session.query(EvaluationCacheEntry.key, EvaluationCacheEntry.size_bytes)
+                  .order_by(EvaluationCacheEntry.last_used_at)
+                  .yield_per(100))
+        doomed = []
+        for key, size_bytes in oldest:
+            if total <= max_bytes:
+                break
+            doomed.append(key)
+            total -= size_bytes or 0
+        for i in range(0, len(doomed), 500):
+            removed += (EvaluationCacheEntry.query
+                        .filter(EvaluationCacheEntry.key.in_(doomed[i:i + 500]))
+                        .delete(synchronize_session=False))
+    db.session.commit()
+    if removed:
+        _count('evictions', removed)
+        logger.info(f"Evicted {removed} evaluation cache entries")
+    return removed
+
+def stats() -> Dict[str, int]:
+    """Hit/miss/store/eviction counters for this process"""
+    with _stats_lock:
+        return dict(_stats)
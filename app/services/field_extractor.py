@@ -0,0 +1,186 @@
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+from .metrics import FIELD_SECONDS
+from .skill_taxonomy import TOKEN_RE, SkillMatcher, get_taxonomy
+
+# Tất cả mẫu regex được biên dịch một lần khi import module
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RES = (
+    re.compile(r'(?:(?:\+|00)84|0)\s*[35789](?:\d\s*){8}'),  # +84, 84, 0 + 9 số
+    re.compile(r'(?:\+\d{1,3}[-.]?)?\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),  # Mẫu chung
+)
+PHONE_SEPARATORS_RE = re.compile(r'[-.\s]')
+NAME_LABEL_RE = re.compile(r'(?:Họ và tên|Name)[:\s]*(.*)', re.IGNORECASE)
+SKILL_LABEL_RE = re.compile(r'skills?|kỹ năng', re.IGNORECASE)
+SKILL_LABEL_MAX_WORDS = 4  # "Technical Skills:", "KỸ NĂNG CHUYÊN MÔN"...
+SKILL_SPLIT_RE = re.compile(r'[,•]')
+VN_SURNAMES = ('Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng', 'Bùi', 'Đỗ')
+NAME_SEARCH_LINES = 10
+
+def _keyword_re(keywords: Iterable[str]) -> 're.Pattern':
+    """Gộp danh sách từ khóa (chữ thường) thành một regex tìm chuỗi con"""
+    return re.compile('|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+EDUCATION_START_RE = _keyword_re([
+    'education', 'academic', 'qualification', 'degree', 'university', 'college',
+    'học vấn', 'trường', 'đại học', 'cao đẳng', 'bằng cấp', 'chứng chỉ'
+])
+EDUCATION_STOP_RE = _keyword_re(['experience', 'work', 'kinh nghiệm', 'công việc'])
+EXPERIENCE_START_RE = _keyword_re([
+    'experience', 'employment', 'work history', 'professional background',
+    'kinh nghiệm', 'công việc', 'dự án', 'làm việc', 'chức vụ'
+])
+EXPERIENCE_STOP_RE = _keyword_re(['education', 'học vấn', 'skills', 'kỹ năng'])
+
+class _Section:
+    """Trạng thái thu thập một phần (học vấn/kinh nghiệm) trong lượt duyệt"""
+
+    def __init__(self, start_re, stop_re):
+        self.start_re = start_re
+        self.stop_re = stop_re
+        self.lines: List[str] = []
+        self.capturing = False
+        self.done = False
+
+    def feed(self, line: str, lower: str) -> None:
+        if self.done:
+            return
+        # Dòng chứa từ khóa bắt đầu luôn được giữ lại
+        if self.start_re.search(lower):
+            self.capturing = True
+            self.lines.append(line)
+        elif self.capturing:
+            if not line or self.stop_re.search(lower):
+                self.done = True
+            else:
+                self.lines.append(line)
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+class FieldExtractor:
+    """Trích xuất mọi trường của hồ sơ trong một lượt duyệt văn bản"""
+
+    def __init__(self, skill_matcher: Optional[SkillMatcher] = None):
+        # Mặc định dùng danh mục kỹ năng hiện hành (có thể được nạp lại)
+        self._skill_matcher = skill_matcher
+
+    @property
+    def skill_matcher(self) -> SkillMatcher:
+        return self._skill_matcher or get_taxonomy().matcher
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """
+        Trích xuất name, email, phone, skills, education, experience
+
+        Văn bản được tách dòng và tách token đúng một lần; mỗi dòng được đưa
+        qua bộ dò tên, hai bộ thu thập phần và bộ dò kỹ năng cùng lúc.
+        """
+        started = time.perf_counter()
+        education = _Section(EDUCATION_START_RE, EDUCATION_STOP_RE)
+        experience = _Section(EXPERIENCE_START_RE, EXPERIENCE_STOP_RE)
+        name = None
+        fallback_name = None
+        tokens: List[str] = []
+        cased_tokens: List[str] = []  # Cùng dãy token, giữ chữ hoa cho bí danh như "AI"
+        listed_skills: List[str] = []
+        expect_skill_list = False
+
+        lines = unicodedata.normalize('NFC', text).split('\n')
+        for number, raw_line in enumerate(lines):
+            line = raw_line.strip()
+            lower = line.lower()
+
+            if number < NAME_SEARCH_LINES and name is None and line:
+                name_match = NAME_LABEL_RE.search(line)
+                if name_match:
+                    name = name_match.group(1).strip()
+                elif line.startswith(VN_SURNAMES) and 2 <= len(line.split()) <= 6:
+                    name = line
+                elif fallback_name is None and 2 <= len(line.split()) <= 6:
+                    fallback_name = line
+
+            education.feed(line, lower)
+            experience.feed(line, lower)
+
+            line_tokens = TOKEN_RE.findall(line)
+            if line_tokens:
+                cased_tokens.extend(line_tokens)
+                cased_tokens.append('')
+                tokens.extend(token.lower() for token in line_tokens)
+                tokens.append('')  # Kỹ năng không khớp qua ranh giới dòng
+
+            # Kỹ năng liệt kê sau nhãn "Skills:"/"Kỹ năng:" (cùng dòng hoặc dòng kế tiếp)
+            listed = None
+            if expect_skill_list and line and not line.endswith(':'):
+                listed = line
+                expect_skill_list = False
+            label = SKILL_LABEL_RE.search(line)
+            if label:
+                head, colon, rest = line.partition(':')
+                if colon and label.start() < len(head) and len(head.split()) <= SKILL_LABEL_MAX_WORDS:
+                    listed = rest.strip()
+                    expect_skill_list = not listed
+                elif not colon and len(line.split()) <= SKILL_LABEL_MAX_WORDS:
+                    expect_skill_list = True
+            if listed:
+                listed_skills.extend(s.strip(' -*') for s in SKILL_SPLIT_RE.split(listed))
+
+        scanned = time.perf_counter()
+
+        # Đưa các kỹ năng liệt kê về tên chuẩn nếu có trong danh mục ("JS" -> "JavaScript")
+        matcher = self.skill_matcher
+        listed_skills = [matcher.lookup(skill) or skill for skill in listed_skills]
+        skills = _unique(matcher.find(tokens, cased_tokens) + listed_skills)
+        matched = time.perf_counter()
+        email = self.extract_email(text)
+        emailed = time.perf_counter()
+        phone = self.extract_phone(text)
+
+        # Tên, học vấn và kinh nghiệm được lấy trong cùng lượt duyệt dòng nên đo chung
+        FIELD_SECONDS.observe(scanned - started, field='lines')
+        FIELD_SECONDS.observe(matched - scanned, field='skills')
+        FIELD_SECONDS.observe(emailed - matched, field='email')
+        FIELD_SECONDS.observe(time.perf_counter() - emailed, field='phone')
+        return {
+            'name': name if name is not None else (fallback_name or ''),
+            'email': email,
+            'phone': phone,
+            'skills': skills,
+            'education': education.text,
+            'experience': experience.text
+        }
+
+    @staticmethod
+    def extract_email(text: str) -> str:
+        match = EMAIL_RE.search(text)
+        return match.group(0) if match else ''
+
+    @staticmethod
+    def extract_phone(text: str) -> str:
+        for pattern in PHONE_RES:
+            match = pattern.search(text)
+            if match:
+                # Chuẩn hóa số điện thoại
+                return PHONE_SEPARATORS_RE.sub('', match.group(0))
+        return ''
+
+def _unique(skills: List[str]) -> List[str]:
+    """Loại bỏ trùng lặp (không phân biệt hoa thường), giữ thứ tự"""
+    seen = set()
+    result = []
+    for skill in skills:
+        key = skill.lower()
+        if skill and key not in seen:
+            seen.add(key)
+            result.append(skill)
+    return result
+
+default_extractor = FieldExtractor()
+
+def extract_fields(text: str) -> Dict[str, Any]:
+    """Trích xuất mọi trường bằng bộ trích xuất mặc định"""
+    return default_extractor.extract(text)
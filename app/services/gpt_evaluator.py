@@ -1,44 +1,31 @@
 import os
 import logging
-import openai
-from functools import lru_cache
+import threading
 from typing import Dict, List, Optional, Union
 from ..config import Config
+from . import evaluation_cache
+from .openai_client import get_client
+from .prompt_builder import build_resume_context, count_tokens, normalize_whitespace, truncate_to_tokens
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GPTEvaluator:
-    def __init__(self):
-        """Initialize GPT Evaluator with API credentials"""
-        self.api_key = Config.OPENAI_API_KEY
-        self.org_id = Config.OPENAI_ORG_ID
+    # Bump whenever the evaluation prompt changes so cached results are not reused
+    EVALUATE_PROMPT_VERSION = 2
+    EVALUATE_MAX_TOKENS = 1000
+
+    def __init__(self, client=None):
+        """Initialize GPT Evaluator on the shared, pooled OpenAI client"""
+        self.client = client or get_client()
+        self.model = self.client.model
         
-        if not self.api_key:
+        if not self.client.configured:
             logger.error("OpenAI API key not found in environment variables")
             raise ValueError("OpenAI API key not configured")
-            
-        openai.api_key = self.api_key
-        if self.org_id:
-            openai.organization = self.org_id
-            
-        self._test_connection()
-
-    def _test_connection(self) -> None:
-        """Test connection to OpenAI API"""
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=5
-            )
-            logger.info("Successfully connected to OpenAI API")
-        except Exception as e:
-            logger.error(f"Failed to connect to OpenAI API: {str(e)}")
-            raise
+        # No test completion here: connectivity is reported by openai_client.readiness()
 
-    @lru_cache(maxsize=100)
     def evaluate_resume(self, resume_text: str, job_requirements: str) -> Dict:
         """
         Evaluate resume against job requirements
@@ -49,7 +36,21 @@ class GPTEvaluator:
             
         Returns:
             Dictionary containing evaluation results
+
+        Successful evaluations are cached in the database and shared by all
+        workers; error results are never cached. The resume and requirements
+        are compacted to the configured token budgets first, and the cache
+        key covers the compacted prompt inputs.
         """
+        raw_tokens = count_tokens(resume_text) + count_tokens(job_requirements)
+        resume_text = build_resume_context(resume_text)
+        job_requirements = truncate_to_tokens(normalize_whitespace(job_requirements), Config.PROMPT_JOB_TOKENS)
+        key = evaluation_cache.cache_key(self.model, self.EVALUATE_PROMPT_VERSION, resume_text, job_requirements)
+        cached = evaluation_cache.get(key)
+        if cached is not None:
+            logger.info(f"Evaluation cache hit ({key[:12]})")
+            return cached
+
         try:
             prompt = f"""
             Resume Text:
@@ -66,15 +67,18 @@ class GPTEvaluator:
             
             Format the response as JSON with these keys: matchScore, strengths, improvements, assessment
             """
+            prompt = normalize_whitespace(prompt)
+            logger.info(f"Evaluation prompt: {raw_tokens} tokens of raw input -> {count_tokens(prompt)} tokens sent")
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
+            result = self.client.chat(
+                [{"role": "user", "content": prompt}],
+                model=self.model,
+                max_tokens=self.EVALUATE_MAX_TOKENS,
                 temperature=0.7
             )
             
-            return response.choices[0].message.content
+            evaluation_cache.put(key, self.model, self.EVALUATE_PROMPT_VERSION, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error evaluating resume: {str(e)}")
@@ -101,18 +105,16 @@ class GPTEvaluator:
             When provided with resume information, analyze it carefully and provide insights based on the data.
             If no resume data is available, inform the user and answer general HR-related questions."""
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return self.client.chat(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": message}
                 ],
+                model=self.model,
                 max_tokens=1000,
                 temperature=0.7
             )
             
-            return response.choices[0].message['content'].strip()
-            
         except Exception as e:
             logger.error(f"Error in chat_with_gpt: {str(e)}")
             raise
@@ -141,15 +143,13 @@ class GPTEvaluator:
             Format the response as JSON with these keys: skills, experience, education, responsibilities
             """
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
+            return self.client.chat(
+                [{"role": "user", "content": prompt}],
+                model=self.model,
                 max_tokens=1000,
                 temperature=0.7
             )
             
-            return response.choices[0].message.content
-            
         except Exception as e:
             logger.error(f"Error analyzing requirements: {str(e)}")
             return {
@@ -159,3 +159,14 @@ class GPTEvaluator:
                 "education": "Not available",
                 "responsibilities": []
             }
+
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+def get_evaluator() -> GPTEvaluator:
+    """Process-wide evaluator, created on first use"""
+    global _evaluator
+    with _evaluator_lock:
+        if _evaluator is None:
+            _evaluator = GPTEvaluator()
+        return _evaluator
@@ -0,0 +1,201 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from ..config import Config
+from ..extensions import db
+from ..models.candidate import Candidate
+from ..models.parse_job import ParseJob
+from . import parse_cache, profiler, search, storage
+from .metrics import STAGE_SECONDS
+from .parse_cache import parse_with_cache
+from .skill_search import set_candidate_skills
+from .status_notifier import status_notifier
+
+logger = logging.getLogger(__name__)
+
+class IngestQueue:
+    """Database-backed queue that parses uploaded resumes on background threads.
+
+    Jobs live in the ``parse_jobs`` table, so no external broker is needed and
+    queued work survives restarts. Every web process runs its own pool of
+    worker threads; a job is claimed with a conditional UPDATE, which keeps
+    workers in different gunicorn processes from parsing the same file twice.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Register with the app; jobs can be submitted, but nothing runs them until start()"""
+        self.app = app
+        app.extensions['ingest_queue'] = self
+
+    def start(self, workers: Optional[int] = None) -> None:
+        """Start the worker pool for this process"""
+        workers = Config.INGEST_WORKERS if workers is None else workers
+        for i in range(len(self._threads), workers):
+            thread = threading.Thread(target=self._run, name=f'ingest-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if workers:
+            self.app.logger.info(f"Started {workers} resume ingestion workers")
+
+    def stop(self) -> None:
+        """Signal worker threads to exit after their current job"""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def submit(self, file_path: str) -> Tuple[Candidate, Optional[ParseJob], bool]:
+        """
+        Create a candidate for a saved resume (requires an app context)
+
+        Identical bytes that were parsed before produce an already parsed
+        candidate straight from the parse cache; anything else is queued.
+
+        Args:
+            file_path: Content address from storage (or a plain file path)
+
+        Returns:
+            Tuple of (candidate, parse job or None on a cache hit, cache hit)
+        """
+        digest = storage.digest_of(file_path)
+        cached = parse_cache.lookup(digest) if digest else None
+        if cached is not None:
+            candidate = Candidate(
+                name=cached.get('name'),
+                email=cached.get('email'),
+                phone=cached.get('phone'),
+                education=cached.get('education'),
+                experience=cached.get('experience'),
+                resume_path=file_path,
+                status='parsed'
+            )
+            set_candidate_skills(candidate, cached.get('skills'))
+            db.session.add(candidate)
+            db.session.flush()
+            search.index_candidate(candidate, cached.get('text'))
+            db.session.commit()
+            return candidate, None, True
+
+        candidate = Candidate(resume_path=file_path, status='queued')
+        db.session.add(candidate)
+        db.session.commit()
+        return candidate, self.enqueue(candidate, file_path), False
+
+    def enqueue(self, candidate: Candidate, file_path: str) -> ParseJob:
+        """Queue a saved resume for parsing (requires an app context)"""
+        candidate.status = 'queued'
+        job = ParseJob(candidate_id=candidate.id, file_path=file_path)
+        db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        return job
+
+    def pending_count(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return ParseJob.query.filter_by(status='queued').count()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    job_id = self._claim_next()
+                    if job_id is not None:
+                        with STAGE_SECONDS.time(stage='parse_job'), \
+                                profiler.maybe_profile('job', f'parse-{job_id}', Config.PROFILE_JOB_SAMPLE_RATE):
+                            self._process(job_id)
+                        status_notifier.notify()
+                        continue
+            except Exception as e:
+                logger.error(f"Ingest worker error: {str(e)}")
+            self._wakeup.wait(Config.INGEST_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def _claim_next(self) -> Optional[int]:
+        """Atomically move one queued job to 'parsing' and return its id"""
+        self._requeue_stale()
+        candidates = (db.session.query(ParseJob.id)
+                      .filter(ParseJob.status == 'queued')
+                      .order_by(ParseJob.id)
+                      .limit(5)
+                      .all())
+        for (job_id,) in candidates:
+            claimed = (ParseJob.query
+                       .filter(ParseJob.id == job_id, ParseJob.status == 'queued')
+                       .update({'status': 'parsing',
+                                'started_at': datetime.utcnow(),
+                                'attempts': ParseJob.attempts + 1},
+                               synchronize_session=False))
+            db.session.commit()
+            if claimed:
+                return job_id
+        return None
+
+    def _requeue_stale(self) -> None:
+        """Give jobs abandoned by a dead worker another chance"""
+        cutoff = datetime.utcnow() - timedelta(seconds=Config.INGEST_JOB_TIMEOUT)
+        stale = (ParseJob.query
+                 .filter(ParseJob.status == 'parsing', ParseJob.started_at < cutoff)
+                 .all())
+        for job in stale:
+            if job.attempts >= Config.INGEST_MAX_ATTEMPTS:
+                self._mark_failed(job, 'Parsing timed out')
+            else:
+                logger.warning(f"Requeueing stale parse job {job.id}")
+                job.status = 'queued'
+        if stale:
+            db.session.commit()
+
+    def _process(self, job_id: int) -> None:
+        job = ParseJob.query.get(job_id)
+        candidate = Candidate.query.get(job.candidate_id)
+        if candidate is None:
+            self._mark_failed(job, 'Candidate no longer exists')
+            db.session.commit()
+            return
+
+        candidate.status = 'parsing'
+        db.session.commit()
+
+        try:
+            with storage.resolve(job.file_path) as local_path:
+                if local_path is None:
+                    raise FileNotFoundError(f"Resume file is missing: {job.file_path}")
+                parsed_data, cache_hit = parse_with_cache(local_path, storage.digest_of(job.file_path))
+        except Exception as e:
+            db.session.rollback()
+            self._mark_failed(job, str(e))
+            db.session.commit()
+            return
+
+        candidate.name = parsed_data.get('name')
+        candidate.email = parsed_data.get('email')
+        candidate.phone = parsed_data.get('phone')
+        set_candidate_skills(candidate, parsed_data.get('skills'))
+        candidate.education = parsed_data.get('education')
+        candidate.experience = parsed_data.get('experience')
+        candidate.status = 'parsed'
+        search.index_candidate(candidate, parsed_data.get('text'))
+        job.status = 'parsed'
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        logger.info(f"Parse job {job.id} finished for candidate {candidate.id} (cache hit: {cache_hit})")
+
+    @staticmethod
+    def _mark_failed(job: ParseJob, error: str) -> None:
+        logger.error(f"Parse job {job.id} failed: {error}")
+        job.status = 'failed'
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        candidate = Candidate.query.get(job.candidate_id) if job.candidate_id else None
+        if candidate is not None:
+            candidate.status = 'failed'
+
+ingest_queue = IngestQueue()
@@ -0,0 +1,293 @@
+import math
+import time
+import zlib
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+from ..config import Config
+from ..models.candidate import Candidate
+from .skill_search import decode_skills, normalize_skill
+from .skill_taxonomy import fold_diacritics, get_taxonomy, tokenize
+
+logger = logging.getLogger(__name__)
+
+SKILL_WEIGHT = 3.0  # Canonical skill features weigh three times a plain word or word pair
+MAX_FEATURES = 256  # Per document, keeps very long fields from dominating memory
+SYNC_BATCH_SIZE = 2000
+
+def _hash(feature: str, dims: int) -> int:
+    return zlib.crc32(feature.encode('utf-8')) & (dims - 1)
+
+def text_features(text: Optional[str]) -> Counter:
+    """Skill, word and word-pair counts for free text, ignoring case and diacritics"""
+    counts = Counter()
+    if not text:
+        return counts
+    # The taxonomy also indexes folded skill names, so one folded token list serves both
+    cased_tokens = tokenize(fold_diacritics(text), lower=False)
+    tokens = [token.lower() for token in cased_tokens]
+    counts.update('s:' + normalize_skill(skill) for skill in get_taxonomy().matcher.find(tokens, cased_tokens))
+    words = [w for w in tokens if len(w) > 1]
+    counts.update('w:' + w for w in words)
+    counts.update(f'b:{a} {b}' for a, b in zip(words, words[1:]))
+    return counts
+
+def candidate_features(skills, education: Optional[str], experience: Optional[str]) -> Counter:
+    counts = Counter()
+    counts.update('s:' + normalize_skill(skill) for skill in decode_skills(skills))
+    counts.update(text_features(education))
+    counts.update(text_features(experience))
+    return counts
+
+def vectorize(counts: Counter, dims: int, max_features: Optional[int] = MAX_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed sparse vector of sublinear term frequencies as (indices, unnormalized weights)"""
+    hashed: Dict[int, float] = {}
+    for feature, count in counts.most_common(max_features):
+        index = _hash(feature, dims)
+        weight = (1.0 + math.log(count)) * (SKILL_WEIGHT if feature.startswith('s:') else 1.0)
+        hashed[index] = hashed.get(index, 0.0) + weight
+    indices = np.fromiter(hashed.keys(), dtype=np.int32, count=len(hashed))
+    weights = np.fromiter(hashed.values(), dtype=np.float32, count=len(hashed))
+    return indices, weights
+
+class CandidateMatcher:
+    """
+    Local candidate-job matching over hashed n-gram vectors
+
+    Every candidate is one row of a sparse matrix held as NumPy arrays
+    (CSR-style: feature indices, weights and the row of each entry), built
+    from the skills, education and experience parse_resume produces. A job
+    description is vectorized the same way, weighted by inverse document
+    frequency, and all rows are scored in one vectorized pass. Rows are
+    appended as candidates arrive or change; replaced rows are tombstoned
+    and compacted away once they pile up.
+    """
+
+    def __init__(self, dims: Optional[int] = None):
+        self.dims = dims or Config.MATCHER_DIMS
+        if self.dims & (self.dims - 1):
+            raise ValueError('MATCHER_DIMS must be a power of two')
+        self._lock = threading.RLock()
+        self._indices = np.empty(1024, dtype=np.int32)
+        self._weights = np.empty(1024, dtype=np.float32)
+        self._entry_rows = np.empty(1024, dtype=np.int32)
+        self._nnz = 0
+        self._row_starts = np.zeros(256, dtype=np.int64)
+        self._row_ids = np.empty(256, dtype=np.int64)
+        self._live = np.zeros(256, dtype=bool)
+        self._rows = 0
+        self._row_of: Dict[int, int] = {}
+        self._df = np.zeros(self.dims, dtype=np.int32)
+        self._watermark: Optional[Tuple[datetime, int]] = None
+        self._seen: Dict[int, datetime] = {}  # updated_at indexed per candidate, within the lookback window
+        self._synced_at = None
+
+    def __len__(self):
+        return len(self._row_of)
+
+    @staticmethod
+    def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+        if needed <= len(array):
+            return array
+        grown = np.empty(max(needed, len(array) * 2), dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add(self, candidate_id: int, skills=None, education: Optional[str] = None,
+            experience: Optional[str] = None) -> None:
+        """Add or replace a candidate's row"""
+        indices, weights = vectorize(candidate_features(skills, education, experience), self.dims)
+        if len(indices):
+            weights /= np.linalg.norm(weights)
+        with self._lock:
+            self._remove_locked(candidate_id)
+            if not len(indices):
+                return
+            row, start, end = self._rows, self._nnz, self._nnz + len(indices)
+            self._indices = self._grow(self._indices, end)
+            self._weights = self._grow(self._weights, end)
+            self._entry_rows = self._grow(self._entry_rows, end)
+            self._indices[start:end] = indices
+            self._weights[start:end] = weights
+            self._entry_rows[start:end] = row
+            self._nnz = end
+            self._row_ids = self._grow(self._row_ids, row + 1)
+            self._live = self._grow(self._live, row + 1)
+            self._row_starts = self._grow(self._row_starts, row + 2)
+            self._row_ids[row] = candidate_id
+            self._live[row] = True
+            self._row_starts[row + 1] = end
+            self._rows = row + 1
+            self._row_of[candidate_id] = row
+            self._df[indices] += 1
+
+    def remove(self, candidate_id: int) -> None:
+        with self._lock:
+            self._remove_locked(candidate_id)
+
+    def _remove_locked(self, candidate_id: int) -> None:
+        row = self._row_of.pop(candidate_id, None)
+        if row is None:
+            return
+        self._live[row] = False
+        self._df[self._indices[self._row_starts[row]:self._row_starts[row + 1]]] -= 1
+        dead = self._rows - len(self._row_of)
+        if dead > 1000 and dead > len(self._row_of) // 4:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows and renumber the rest"""
+        live_rows = np.flatnonzero(self._live[:self._rows])
+        keep = self._live[self._entry_rows[:self._nnz]]
+        lengths = np.diff(self._row_starts[:self._rows + 1])[live_rows]
+        new_row = np.full(self._rows, -1, dtype=np.int32)
+        new_row[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+        self._indices = self._indices[:self._nnz][keep].copy()
+        self._weights = self._weights[:self._nnz][keep].copy()
+        self._entry_rows = new_row[self._entry_rows[:self._nnz][keep]]
+        self._nnz = len(self._indices)
+        self._row_starts = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self._row_ids = self._row_ids[live_rows].copy()
+        self._live = np.ones(len(live_rows), dtype=bool)
+        self._rows = len(live_rows)
+        self._row_of = {int(cid): row for row, cid in enumerate(self._row_ids)}
+        logger.info(f"Compacted candidate matcher to {self._rows} rows")
+
+    def sync(self, force: bool = False) -> int:
+        """
+        Pull candidates created or updated since the last sync (requires an app context)
+
+        Runs at most once per MATCHER_SYNC_INTERVAL unless forced, so every
+        web process converges on the database without extra messaging.
+        Rows are re-read over a STATUS_LOOKBACK window behind the watermark,
+        so a transaction that commits late (a parse finishing on another
+        worker) is not skipped; rows already indexed at that updated_at are
+        left alone. Returns the number of candidates (re)indexed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._synced_at is not None and now - self._synced_at < Config.MATCHER_SYNC_INTERVAL:
+                return 0
+            self._synced_at = now
+            started = time.perf_counter()
+            synced = 0
+            cursor = None
+            if self._watermark is not None:
+                since = self._watermark[0] - timedelta(seconds=Config.STATUS_LOOKBACK)
+                self._seen = {cid: seen for cid, seen in self._seen.items() if seen >= since}
+                cursor = (since, 0)
+            while True:
+                query = Candidate.query.options(load_only(
+                    Candidate.skills, Candidate.education, Candidate.experience, Candidate.updated_at))
+                if cursor is not None:
+                    updated_at, last_id = cursor
+                    query = query.filter(or_(Candidate.updated_at > updated_at,
+                                             and_(Candidate.updated_at == updated_at, Candidate.id > last_id)))
+                batch = (query.filter(Candidate.updated_at.isnot(None))
+                         .order_by(Candidate.updated_at, Candidate.id)
+                         .limit(SYNC_BATCH_SIZE)
+                         .all())
+                for candidate in batch:
+                    if self._seen.get(candidate.id) == candidate.updated_at:
+                        continue
+                    self.add(candidate.id, candidate.skills, candidate.education, candidate.experience)
+                    self._seen[candidate.id] = candidate.updated_at
+                    synced += 1
+                if batch:
+                    cursor = (batch[-1].updated_at, batch[-1].id)
+                    if self._watermark is None or cursor > self._watermark:
+                        self._watermark = cursor
+                if len(batch) < SYNC_BATCH_SIZE:
+                    break
+            if synced:
+                logger.info(f"Candidate matcher synced {synced} candidates in {time.perf_counter() - started:.2f}s")
+            return synced
+
+    def query_vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Job description vector with idf weights from the current candidate set"""
+        indices, weights = vectorize(text_features(text), self.dims, max_features=None)
+        if not len(indices):
+            return indices, weights
+        idf = np.log((1.0 + len(self._row_of)) / (1.0 + self._df[indices])) + 1.0
+        weights *= idf.astype(np.float32)
+        weights /= np.linalg.norm(weights)
+        return indices, weights
+
+    def rank(self, job_description: str, limit: int = 50,
+             candidate_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Candidates most similar to a job description, best first
+
+        Args:
+            job_description: Free text; taxonomy skills in it weigh most
+            limit: Number of results
+            candidate_ids: Only rank these candidates
+
+        Returns:
+            List of (candidate id, cosine similarity in [0, 1])
+        """
+        with self._lock:
+            indices, weights = self.query_vector(job_description)
+            if not len(indices) or not self._row_of:
+                return []
+            query = np.zeros(self.dims, dtype=np.float32)
+            query[indices] = weights
+            nnz = self._nnz
+            # One pass over every stored entry: gather the query weight of its feature and sum per row
+            scores = np.bincount(self._entry_rows[:nnz],
+                                 weights=self._weights[:nnz] * query[self._indices[:nnz]],
+                                 minlength=self._rows)
+            allowed = self._live[:self._rows].copy()
+            if candidate_ids is not None:
+                rows = [self._row_of[cid] for cid in candidate_ids if cid in self._row_of]
+                allowed[:] = False
+                allowed[rows] = True
+            scores[~allowed] = -1.0
+            limit = min(limit, int(allowed.sum()))
+            if limit <= 0:
+                return []
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [(int(self._row_ids[row]), float(scores[row])) for row in top if scores[row] > 0]
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher() -> CandidateMatcher:
+    """Process-wide matcher, loaded from the database on first sync"""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = CandidateMatcher()
+        return _matcher
+
+def warm_up(app) -> None:
+    """
+    Build the process-wide index from the database, then mark it ready
+
+    Runs on a background thread at worker start, so no request pays for the
+    first full load. Until app.extensions['matcher_ready'] is set, routes
+    that match answer 503 instead of building the index themselves.
+    """
+    started = time.perf_counter()
+    try:
+        with app.app_context():
+            get_matcher().sync(force=True)
+        logger.info(f"Candidate matcher ready in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        # Requests fall back to syncing on their own
+        logger.error(f"Candidate matcher warm-up failed: {str(e)}")
+    finally:
+        app.extensions['matcher_ready'].set()
+
+def match_candidates(job_description: str, limit: int = 50,
+                     candidate_ids: Optional[Sequence[int]] = None) -> List[Tuple[int, float]]:
+    """Rank candidates against a job description locally, syncing new candidates first"""
+    matcher = get_matcher()
+    matcher.sync()
+    return matcher.rank(job_description, limit, candidate_ids)
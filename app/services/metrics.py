@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import atexit
+import bisect
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+ARCHIVE_FILE = 'metrics-archive.json'
+
+class _Family:
+    """A named metric with fixed label names; values are kept per label combination"""
+    type = None
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        _registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+class Counter(_Family):
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if not Config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with _registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            _registry.dirty = True
+
+class Histogram(_Family):
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def observe(self, value: float, **labels) -> None:
+        if not Config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)  # len(buckets) is the +Inf bucket
+        with _registry.lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+            _registry.dirty = True
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with block, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+class _Registry:
+    """
+    Metric families of this process, shared with sibling workers through files
+
+    When METRICS_DIR is set (gunicorn.conf.py sets it for every worker),
+    each process writes a snapshot of its counters and histograms to
+    metrics-<pid>.json at most every METRICS_FLUSH_INTERVAL seconds, and
+    /metrics sums every snapshot in the directory, so whichever worker
+    answers the scrape reports totals for the whole server. Snapshots of
+    exited workers are folded into an archive so counters never go back.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.families: Dict[str, _Family] = {}
+        self.collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]] = []
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+
+    def register(self, family: _Family) -> None:
+        self.families[family.name] = family
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {family.name: {
+                'type': family.type,
+                'help': family.help,
+                'labelnames': list(family.labelnames),
+                'buckets': list(getattr(family, 'buckets', [])),
+                'samples': [[list(key), value] for key, value in family._values.items()],
+            } for family in self.families.values()}
+
+    def start_flusher(self) -> None:
+        """Begin writing this process's snapshot to METRICS_DIR (no-op without one)"""
+        if not Config.METRICS_DIR or not Config.METRICS_ENABLED:
+            return
+        with self._flusher_lock:
+            if self._flusher is not None and self._flusher[0] == os.getpid():
+                return
+            os.makedirs(Config.METRICS_DIR, exist_ok=True)
+            thread = threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True)
+            thread.start()
+            self._flusher = (os.getpid(), thread)
+            atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(Config.METRICS_FLUSH_INTERVAL)
+            if self.dirty:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Could not write metrics snapshot: {str(e)}")
+
+    def flush(self) -> None:
+        if not Config.METRICS_DIR:
+            return
+        self.dirty = False
+        _write_json(os.path.join(Config.METRICS_DIR, f'metrics-{os.getpid()}.json'), self.snapshot())
+
+_registry = _Registry()
+
+def _write_json(path: str, data: Dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _read_snapshots() -> List[Dict]:
+    """This process's live values plus the files of every other worker, current or exited"""
+    snapshots = [_registry.snapshot()]
+    if not Config.METRICS_DIR or not os.path.isdir(Config.METRICS_DIR):
+        return snapshots
+    own = f'metrics-{os.getpid()}.json'
+    for name in os.listdir(Config.METRICS_DIR):
+        if not name.endswith('.json') or name == own:
+            continue
+        try:
+            with open(os.path.join(Config.METRICS_DIR, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics snapshot {name}: {str(e)}")
+    return snapshots
+
+def merge(snapshots: Iterable[Dict]) -> Dict:
+    """Sum counters and histogram buckets of several snapshots"""
+    merged: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, dict(family, samples={}))
+            if family['buckets'] != target['buckets']:
+                continue  # Bucket layout changed between deploys; keep the first
+            for key, value in family['samples']:
+                key = tuple(key)
+                if family['type'] == 'histogram':
+                    counts, total = value
+                    old_counts, old_total = target['samples'].get(key, ([0] * len(counts), 0.0))
+                    target['samples'][key] = ([a + b for a, b in zip(old_counts, counts)], old_total + total)
+                else:
+                    target['samples'][key] = target['samples'].get(key, 0.0) + value
+    for family in merged.values():
+        family['samples'] = [[list(key), value] for key, value in family['samples'].items()]
+    return merged
+
+def archive_process(pid: int) -> None:
+    """Fold an exited worker's snapshot into the archive (gunicorn child_exit hook)"""
+    if not Config.METRICS_DIR:
+        return
+    path = os.path.join(Config.METRICS_DIR, f'metrics-{pid}.json')
+    archive_path = os.path.join(Config.METRICS_DIR, ARCHIVE_FILE)
+    snapshots = []
+    for source in (archive_path, path):
+        try:
+            with open(source) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            pass
+    if len(snapshots) == 0 or not os.path.exists(path):
+        return
+    _write_json(archive_path, merge(snapshots))
+    os.remove(path)
+
+def register_collector(collector: Callable) -> Callable:
+    """
+    Add a function computed at scrape time, e.g. a gauge read from the database
+
+    It returns (name, help, type, [(labels, value), ...]) tuples; its values
+    are global already, so they are reported as is rather than summed.
+    """
+    _registry.collectors.append(collector)
+    return collector
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [(n, v) for n, v in zip(names, values)] + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in pairs) + '}'
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for name, family in sorted(merge(_read_snapshots()).items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family['labelnames']
+        for key, value in sorted(family['samples'], key=lambda sample: sample[0]):
+            if family['type'] != 'histogram':
+                lines.append(f"{name}{_labels(labelnames, key)} {_format(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(family['buckets'] + ['+Inf'], counts):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format(bound)
+                lines.append(f"{name}_bucket{_labels(labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labelnames, key)} {_format(total)}")
+            lines.append(f"{name}_count{_labels(labelnames, key)} {cumulative}")
+    for collector in _registry.collectors:
+        try:
+            for name, help, metric_type, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_format(value)}")
+        except Exception as e:
+            logger.error(f"Metrics collector {collector.__name__} failed: {str(e)}")
+    return '\n'.join(lines) + '\n'
+
+# Pipeline stages: saving, parsing and storing an upload
+STAGE_SECONDS = Histogram('hr_stage_duration_seconds', 'Time spent in each resume pipeline stage', ['stage'])
+EXTRACTION_SECONDS = Histogram('hr_text_extraction_seconds',
+                               'Text extraction per document by how most pages were read', ['backend'])
+PAGES = Counter('hr_pages_total', 'PDF pages by extraction path (text backend, ocr, ocr_failed)', ['path'])
+FIELD_SECONDS = Histogram('hr_field_extraction_seconds', 'Field extraction from resume text', ['field'],
+                          buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+DB_COMMIT_SECONDS = Histogram('hr_db_commit_seconds', 'SQLAlchemy session commits',
+                              buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+CACHE_REQUESTS = Counter('hr_cache_requests_total', 'Cache lookups', ['cache', 'result'])
+
+# OpenAI
+OPENAI_SECONDS = Histogram('hr_openai_request_seconds', 'OpenAI calls including retries', ['operation', 'outcome'])
+OPENAI_RETRIES = Counter('hr_openai_retries_total', 'OpenAI attempts that were retried', ['reason'])
+OPENAI_TOKENS = Counter('hr_openai_tokens_total', 'Tokens reported by OpenAI usage', ['kind'])
+
+@register_collector
+def _queue_depth():
+    """Jobs per queue and status, read from the shared job tables"""
+    from sqlalchemy import func
+    from ..extensions import db
+    from ..models.parse_job import ParseJob
+    from ..models.ranking_job import RankingJob
+
+    samples = []
+    for queue, model, active in (('ingest', ParseJob, 'parsing'), ('ranking', RankingJob, 'running')):
+        counts = dict(db.session.query(model.status, func.count())
+                      .filter(model.status.in_(('queued', active)))
+                      .group_by(model.status).all())
+        samples.extend(({'queue': queue, 'status': status}, counts.get(status, 0)) for status in ('queued', active))
+    yield 'hr_queue_depth', 'Jobs waiting or in progress', 'gauge', samples
+
+def init_app(app) -> None:
+    """Time database commits and start sharing this worker's metrics"""
+    if not Config.METRICS_ENABLED:
+        return
+    instrument_sessions()
+    _registry.start_flusher()
+    app.logger.info(f"Metrics enabled (shared directory: {Config.METRICS_DIR or 'none, this process only'})")
+
+def instrument_sessions() -> None:
+    """Time every SQLAlchemy commit in this process"""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if event.contains(Session, 'before_commit', _before_commit):
+        return
+    event.listen(Session, 'before_commit', _before_commit)
+    event.listen(Session, 'after_commit', _after_commit)
+
+def _before_commit(session) -> None:
+    session.info['commit_started'] = time.perf_counter()
+
+def _after_commit(session) -> None:
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import signal
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional
+import pytesseract
+from pdf2image import convert_from_path, pdfinfo_from_path
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PageResult:
+    """OCR output and timings for a single PDF page"""
+    page: int
+    text: str = ''
+    render_seconds: float = 0.0
+    ocr_seconds: float = 0.0
+    error: Optional[str] = None
+
+@dataclass
+class OCRResult:
+    """OCR output for a document, pages in reading order"""
+    pages: List[PageResult] = field(default_factory=list)
+    total_seconds: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(page.text for page in self.pages if page.text)
+
+    def timings(self) -> List[Dict]:
+        """Per-page timings without the recognized text"""
+        return [{k: v for k, v in asdict(page).items() if k != 'text'} for page in self.pages]
+
+def _init_worker() -> None:
+    # Pages are already recognized in parallel; keep tesseract from
+    # spawning its own OpenMP threads on top of that.
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    if hasattr(os, 'setsid'):
+        # Own process group: pdftoppm and tesseract started from this worker
+        # inherit it, so _reset_pool can kill them together with the worker.
+        os.setsid()
+
+def _ocr_page(file_path: str, page: int, dpi: int, grayscale: bool, lang: str) -> PageResult:
+    """Render and recognize one page (runs inside a pool process)"""
+    result = PageResult(page=page)
+    try:
+        started = time.perf_counter()
+        images = convert_from_path(file_path, dpi=dpi, first_page=page, last_page=page,
+                                   grayscale=grayscale)
+        rendered = time.perf_counter()
+        result.render_seconds = rendered - started
+        result.text = '\n'.join(pytesseract.image_to_string(image, lang=lang) for image in images).strip()
+        result.ocr_seconds = time.perf_counter() - rendered
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Process-wide OCR pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the web process runs ingest threads
+            # and forking while they hold locks is unsafe.
+            _pool = ProcessPoolExecutor(max_workers=Config.OCR_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker)
+        return _pool
+
+def _kill_workers(pool: ProcessPoolExecutor) -> None:
+    """Kill every pool process, and on POSIX the renderer/tesseract processes it started"""
+    for process in list((pool._processes or {}).values()):
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass  # Already gone
+
+def _reset_pool() -> None:
+    """Replace the pool after a timeout; hung pages would otherwise keep their processes forever"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _kill_workers(_pool)
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def page_count(file_path: str) -> int:
+    """Number of pages according to poppler"""
+    return int(pdfinfo_from_path(file_path)['Pages'])
+
+def ocr_pdf(file_path: str, pages: Optional[Iterable[int]] = None, dpi: Optional[int] = None,
+            grayscale: Optional[bool] = None, lang: Optional[str] = None) -> OCRResult:
+    """
+    OCR a PDF page by page across the shared process pool
+
+    Each worker renders only the page it is recognizing, and at most
+    ``2 * OCR_WORKERS`` pages are in flight, so memory stays flat no
+    matter how long the document is.
+
+    Args:
+        file_path: Path to the PDF
+        pages: 1-based page numbers to OCR, defaults to every page
+        dpi: Rasterization resolution, defaults to OCR_DPI
+        grayscale: Render pages in grayscale, defaults to OCR_GRAYSCALE
+        lang: Tesseract languages, defaults to OCR_LANG
+
+    Returns:
+        OCRResult with text and timings for every requested page
+    """
+    dpi = dpi or Config.OCR_DPI
+    grayscale = Config.OCR_GRAYSCALE if grayscale is None else grayscale
+    lang = lang or Config.OCR_LANG
+    pages = list(pages) if pages is not None else list(range(1, page_count(file_path) + 1))
+
+    started = time.perf_counter()
+    results = {}
+    pending_pages = iter(pages)
+    in_flight = set()
+    window = max(1, Config.OCR_WORKERS) * 2
+    try:
+        pool = _get_pool()
+        while True:
+            while len(in_flight) < window:
+                page = next(pending_pages, None)
+                if page is None:
+                    break
+                in_flight.add(pool.submit(_ocr_page, file_path, page, dpi, grayscale, lang))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, timeout=Config.OCR_PAGE_TIMEOUT,
+                                   return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"OCR made no progress in {Config.OCR_PAGE_TIMEOUT}s")
+            for future in done:
+                page_result = future.result()
+                results[page_result.page] = page_result
+    except (BrokenProcessPool, TimeoutError):
+        _reset_pool()
+        raise
+
+    result = OCRResult(pages=[results[page] for page in pages],
+                       total_seconds=time.perf_counter() - started)
+    for page in result.pages:
+        if page.error:
+            logger.warning(f"OCR failed on page {page.page} of {file_path}: {page.error}")
+    return result
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='OCR a PDF and print per-page timings')
+    parser.add_argument('file')
+    parser.add_argument('--dpi', type=int)
+    parser.add_argument('--color', action='store_true', help='Render pages in color')
+    parser.add_argument('--lang')
+    args = parser.parse_args()
+
+    ocr_result = ocr_pdf(args.file, dpi=args.dpi, grayscale=False if args.color else None, lang=args.lang)
+    print(json.dumps({'total_seconds': ocr_result.total_seconds, 'pages': ocr_result.timings()}, indent=2))
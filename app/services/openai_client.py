@@ -0,0 +1,386 @@
+import json
+import time
+import random
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Union
+from ..config import Config
+from .metrics import OPENAI_RETRIES, OPENAI_SECONDS, OPENAI_TOKENS
+from .prompt_builder import count_tokens
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+CHARS_PER_TOKEN = 4  # Rough estimate used to reserve tokens before a request
+
+class OpenAIError(Exception):
+    """A chat completion failed after all retries"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute
+
+    acquire() blocks until enough capacity is available, so callers are
+    smoothed to the configured rate instead of being rejected.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1, timeout: Optional[float] = None) -> bool:
+        if self.rate <= 0:
+            return True
+        # Never wait for more than the bucket can ever hold
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.available >= amount:
+                    self.available -= amount
+                    return True
+                wait = (amount - self.available) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def refund(self, amount: float) -> None:
+        """
+        Return capacity that was reserved but not used, or take more when negative
+
+        A debit may leave the bucket below zero; acquire() then waits until
+        the refill has paid the overuse back.
+        """
+        if self.rate <= 0 or not amount:
+            return
+        with self.lock:
+            self._refill()
+            self.available = min(self.capacity, self.available + amount)
+
+    def settle(self, reserved: float, used: float) -> None:
+        """Swap an acquire(reserved) for the amount actually used"""
+        self.refund(min(reserved, self.capacity) - used)
+
+def estimate_tokens(messages: Sequence[Dict[str, str]]) -> int:
+    return sum(len(m.get('content') or '') for m in messages) // CHARS_PER_TOKEN + 4 * len(messages)
+
+class OpenAIClient:
+    """
+    Chat completions over one pooled HTTP session
+
+    Every call goes through the same keep-alive connection pool, is subject
+    to per-process request and token rate limits, and is retried with
+    jittered exponential backoff on rate limiting, server errors and
+    connection failures. api_base can point at a local fake server.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, api_base: Optional[str] = None,
+                 organization: Optional[str] = None, model: Optional[str] = None,
+                 timeout: Optional[float] = None, connect_timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, pool_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None):
+        self.api_key = api_key if api_key is not None else Config.OPENAI_API_KEY
+        self.api_base = (api_base or Config.OPENAI_API_BASE).rstrip('/')
+        self.organization = organization if organization is not None else Config.OPENAI_ORG_ID
+        self.model = model or Config.OPENAI_MODEL
+        self.timeout = timeout or Config.OPENAI_TIMEOUT
+        self.connect_timeout = connect_timeout or Config.OPENAI_CONNECT_TIMEOUT
+        self.max_retries = Config.OPENAI_MAX_RETRIES if max_retries is None else max_retries
+        self.request_bucket = TokenBucket(requests_per_minute or Config.OPENAI_REQUESTS_PER_MINUTE)
+        self.token_bucket = TokenBucket(tokens_per_minute or Config.OPENAI_TOKENS_PER_MINUTE)
+        self.max_concurrency = max_concurrency or Config.OPENAI_MAX_CONCURRENCY
+
+        # requests is imported with the first client, not when the app boots
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        pool_size = pool_size or Config.OPENAI_POOL_SIZE
+        self._transport_errors = (requests.ConnectionError, requests.Timeout)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'}
+        if self.organization:
+            headers['OpenAI-Organization'] = self.organization
+        return headers
+
+    def _backoff(self, attempt: int, response: Optional['requests.Response'] = None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter: uniform in [0, 0.5 * 2^attempt], capped at 20s
+        return random.uniform(0, min(20.0, 0.5 * 2 ** attempt))
+
+    def _post(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None,
+              stream: bool = False) -> 'requests.Response':
+        """POST with rate limiting and retries, returning the successful response"""
+        if not self.configured:
+            raise OpenAIError('OpenAI API key not configured')
+        reserved = estimate_tokens(payload.get('messages', [])) + payload.get('max_tokens', 0)
+        self.request_bucket.acquire(1)
+        self.token_bucket.acquire(reserved)
+
+        url = f"{self.api_base}/{path}"
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(url, json=payload, headers=self._headers(), stream=stream,
+                                             timeout=(self.connect_timeout, timeout or self.timeout))
+                if response.status_code < 400:
+                    return response
+                error = OpenAIError(_error_message(response), response.status_code)
+                retryable = response.status_code in RETRY_STATUSES
+            except self._transport_errors as e:
+                error = OpenAIError(f"Request to OpenAI failed: {str(e)}")
+                retryable = True
+            if response is not None:
+                response.close()
+            if not retryable or attempt == self.max_retries:
+                self.token_bucket.refund(reserved)
+                raise error
+            OPENAI_RETRIES.inc(reason=str(response.status_code) if response is not None else 'transport')
+            delay = self._backoff(attempt, response)
+            logger.warning(f"OpenAI request failed ({str(error)}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def chat_completion(self, messages: Sequence[Dict[str, str]], model: Optional[str] = None,
+                        max_tokens: int = 1000, temperature: float = 0.7,
+                        timeout: Optional[float] = None, **params) -> Dict[str, Any]:
+        """Create a chat completion and return the decoded response body"""
+        payload = dict(params, model=model or self.model, messages=list(messages),
+                       max_tokens=max_tokens, temperature=temperature)
+        started = time.perf_counter()
+        try:
+            response = self._post('chat/completions', payload, timeout=timeout)
+            data = response.json()
+        except Exception:
+            OPENAI_SECONDS.observe(time.perf_counter() - started, operation='chat', outcome='error')
+            raise
+        elapsed = time.perf_counter() - started
+        OPENAI_SECONDS.observe(elapsed, operation='chat', outcome='ok')
+
+        # Give back the unused part of the token reservation, or charge what went over it
+        usage = data.get('usage') or {}
+        if usage.get('total_tokens'):
+            self.token_bucket.settle(estimate_tokens(payload['messages']) + max_tokens, usage['total_tokens'])
+        for kind in ('prompt_tokens', 'completion_tokens'):
+            if usage.get(kind):
+                OPENAI_TOKENS.inc(usage[kind], kind=kind.split('_')[0])
+        logger.info(f"Chat completion ({payload['model']}) took {elapsed:.2f}s, "
+                    f"{usage.get('total_tokens', '?')} tokens")
+        return data
+
+    def chat(self, messages: Sequence[Dict[str, str]], **kwargs) -> str:
+        """Create a chat completion and return the assistant message text"""
+        data = self.chat_completion(messages, **kwargs)
+        try:
+            return data['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError):
+            raise OpenAIError('Malformed chat completion response')
+
+    def stream_chat(self, messages: Sequence[Dict[str, str]], model: Optional[str] = None,
+                    max_tokens: int = 1000, temperature: float = 0.7,
+                    timeout: Optional[float] = None, **params) -> Iterator[str]:
+        """
+        Create a streamed chat completion, yielding text deltas as they arrive
+
+        Retries only happen before the first byte; an error mid-stream is
+        raised to the caller, which has already relayed part of the reply.
+        The token reservation is settled when the stream ends, against the
+        reported usage when stream_options={'include_usage': True} is
+        passed, otherwise against the prompt estimate plus the streamed text.
+        """
+        payload = dict(params, model=model or self.model, messages=list(messages),
+                       max_tokens=max_tokens, temperature=temperature, stream=True)
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = self._post('chat/completions', payload, timeout=timeout, stream=True)
+        except Exception:
+            OPENAI_SECONDS.observe(time.perf_counter() - started, operation='stream', outcome=outcome)
+            raise
+        prompt_estimate = estimate_tokens(payload['messages'])
+        streamed = []
+        usage = None
+        try:
+            for line in response.iter_lines(decode_unicode=False):
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if data == b'[DONE]':
+                    break
+                try:
+                    chunk = json.loads(data)
+                    usage = chunk.get('usage') or usage
+                    choices = chunk['choices']
+                    if not choices:
+                        continue  # The include_usage chunk carries no choices
+                    delta = choices[0].get('delta', {})
+                except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                    raise OpenAIError('Malformed chat completion chunk')
+                if delta.get('content'):
+                    streamed.append(delta['content'])
+                    yield delta['content']
+            outcome = 'ok'
+        except GeneratorExit:
+            outcome = 'cancelled'
+            raise
+        except self._transport_errors as e:
+            raise OpenAIError(f"Chat completion stream interrupted: {str(e)}")
+        finally:
+            response.close()
+            OPENAI_SECONDS.observe(time.perf_counter() - started, operation='stream', outcome=outcome)
+            # Give back the unused part of the token reservation, or charge what went over it
+            if usage and usage.get('total_tokens'):
+                used = usage['total_tokens']
+                for kind in ('prompt_tokens', 'completion_tokens'):
+                    if usage.get(kind):
+                        OPENAI_TOKENS.inc(usage[kind], kind=kind.split('_')[0])
+            else:
+                used = prompt_estimate + count_tokens(''.join(streamed))
+            self.token_bucket.settle(prompt_estimate + max_tokens, used)
+
+    def probe(self) -> None:
+        """Cheap connectivity and credentials check: lists models, no completion is billed"""
+        if not self.configured:
+            raise OpenAIError('OpenAI API key not configured')
+        try:
+            response = self.session.get(f"{self.api_base}/models", headers=self._headers(),
+                                        timeout=(self.connect_timeout, 10))
+        except self._transport_errors as e:
+            raise OpenAIError(f"Request to OpenAI failed: {str(e)}")
+        with response:
+            if response.status_code >= 400:
+                raise OpenAIError(_error_message(response), response.status_code)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix='openai')
+            return self._executor
+
+    def submit(self, messages: Sequence[Dict[str, str]], **kwargs) -> Future:
+        """Run chat() on the client's worker threads"""
+        return self._get_executor().submit(self.chat, messages, **kwargs)
+
+    def chat_many(self, requests_: Sequence[Union[Sequence[Dict[str, str]], Dict[str, Any]]]
+                  ) -> List[Union[str, Exception]]:
+        """
+        Issue many completions concurrently
+
+        Args:
+            requests_: Message lists, or dicts of chat() keyword arguments
+                       including 'messages'
+
+        Returns:
+            Reply text or the raised exception for each request, in order
+        """
+        futures = []
+        for request in requests_:
+            kwargs = dict(request) if isinstance(request, dict) else {'messages': request}
+            futures.append(self.submit(kwargs.pop('messages'), **kwargs))
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+
+def _error_message(response: 'requests.Response') -> str:
+    try:
+        return response.json()['error']['message']
+    except (ValueError, KeyError, TypeError):
+        return f"OpenAI API returned HTTP {response.status_code}"
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> OpenAIClient:
+    """Process-wide client, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAIClient()
+        return _client
+
+_readiness = {'status': 'unknown', 'checked_at': None, 'latency_ms': None, 'error': None}
+_readiness_lock = threading.Lock()
+_last_probe = None
+_probe_running = False
+
+def _run_probe(client: OpenAIClient) -> None:
+    global _probe_running
+    started = time.perf_counter()
+    try:
+        client.probe()
+        result = {'status': 'ready', 'error': None}
+    except Exception as e:
+        logger.warning(f"OpenAI readiness probe failed: {str(e)}")
+        result = {'status': 'unavailable', 'error': str(e)}
+    result['latency_ms'] = round((time.perf_counter() - started) * 1000)
+    result['checked_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with _readiness_lock:
+        _readiness.update(result)
+        _probe_running = False
+
+def readiness() -> Dict[str, Any]:
+    """
+    Last known OpenAI connectivity, refreshed in the background
+
+    At most one probe runs per OPENAI_READINESS_INTERVAL per process and
+    callers never wait for it, so health checks can call this on every hit.
+    """
+    global _last_probe, _probe_running
+    client = get_client()
+    if not client.configured:
+        return {'status': 'unconfigured', 'checked_at': None, 'latency_ms': None,
+                'error': 'OpenAI API key not configured'}
+    with _readiness_lock:
+        now = time.monotonic()
+        due = _last_probe is None or now - _last_probe >= Config.OPENAI_READINESS_INTERVAL
+        if due and not _probe_running:
+            _last_probe = now
+            _probe_running = True
+            threading.Thread(target=_run_probe, args=(client,), name='openai-probe', daemon=True).start()
+        return dict(_readiness)
@@ -0,0 +1,122 @@
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from ..config import Config
+from ..extensions import db
+from ..models.parse_cache import ParseCacheEntry
+from .metrics import CACHE_REQUESTS, STAGE_SECONDS
+from .resume_parser import extract_text, parse_text, parser_version
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 hex digest of a file's bytes"""
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def lookup(digest: str) -> Optional[Dict[str, Any]]:
+    """
+    Return cached parsed fields plus the extracted 'text' for a digest and
+    mark the entry as recently used
+
+    Entries written by another parser version or skill taxonomy count as misses.
+    """
+    if not Config.PARSE_CACHE_ENABLED:
+        return None
+    entry = ParseCacheEntry.query.get(digest)
+    if entry is None or entry.parser_version != parser_version():
+        CACHE_REQUESTS.inc(cache='parse', result='miss')
+        return None
+    CACHE_REQUESTS.inc(cache='parse', result='hit')
+    entry.hits = (entry.hits or 0) + 1
+    entry.last_used_at = datetime.utcnow()
+    db.session.commit()
+    return dict(json.loads(entry.fields), text=entry.text)
+
+def cached_text(digest: str) -> Optional[str]:
+    """Extracted text for a digest from any parser version, if still cached"""
+    entry = ParseCacheEntry.query.get(digest)
+    return entry.text if entry is not None else None
+
+def store(digest: str, text: str, parsed_data: Dict[str, Any]) -> None:
+    """Cache extracted text and parsed fields, then evict down to the size cap"""
+    if not Config.PARSE_CACHE_ENABLED:
+        return
+    fields = json.dumps(parsed_data, ensure_ascii=False)
+    size_bytes = len(text.encode('utf-8')) + len(fields.encode('utf-8'))
+    entry = ParseCacheEntry.query.get(digest)
+    if entry is None:
+        entry = ParseCacheEntry(digest=digest)
+        db.session.add(entry)
+    entry.parser_version = parser_version()
+    entry.text = text
+    entry.fields = fields
+    entry.size_bytes = size_bytes
+    entry.last_used_at = datetime.utcnow()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker cached the same file first
+        db.session.rollback()
+        return
+    evict()
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    max_bytes = Config.PARSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    total = db.session.query(func.coalesce(func.sum(ParseCacheEntry.size_bytes), 0)).scalar()
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    oldest = (db.session.query(ParseCacheEntry.digest, ParseCacheEntry.size_bytes)
+              .order_by(ParseCacheEntry.last_used_at)
+              .yield_per(100))
+    doomed = []
+    for digest, size_bytes in oldest:
+        if total <= max_bytes:
+            break
+        doomed.append(digest)
+        total -= size_bytes or 0
+    for i in range(0, len(doomed), 500):
+        removed += (ParseCacheEntry.query
+                    .filter(ParseCacheEntry.digest.in_(doomed[i:i + 500]))
+                    .delete(synchronize_session=False))
+    db.session.commit()
+    logger.info(f"Evicted {removed} parse cache entries")
+    return removed
+
+def parse_with_cache(file_path: str, digest: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse a resume, reusing earlier results for identical bytes
+
+    Args:
+        file_path: Path to the saved resume
+        digest: SHA-256 of the file if the caller already computed it
+
+    Returns:
+        Tuple of (parsed fields plus the extracted 'text', whether they came from the cache)
+    """
+    digest = digest or file_digest(file_path)
+    cached = lookup(digest)
+    if cached is not None:
+        logger.info(f"Parse cache hit for {file_path} ({digest[:12]})")
+        return cached, True
+
+    logger.info(f"Bắt đầu phân tích hồ sơ: {file_path}")
+    with STAGE_SECONDS.time(stage='text_extraction'):
+        text = extract_text(file_path)
+    with STAGE_SECONDS.time(stage='extract_fields'):
+        parsed_data = parse_text(text)
+    with STAGE_SECONDS.time(stage='cache_store'):
+        store(digest, text, parsed_data)
+    return dict(parsed_data, text=text), False
@@ -1 +1,3 @@
+from app.services.parser.registry import Document, UnsupportedFormatError, open_document, page_stats, register, sniff
 from app.services.parser.pdf_parser import PDFParser
+from app.services.parser.docx_parser import DocxParser
@@ -0,0 +1,31 @@
+from typing import Dict
+from app.services.parser.registry import open_document
+
+class ResumeFileParser:
+    """Common interface of PDFParser and DocxParser over the shared, memoized Document"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.document = open_document(file_path)
+
+    def extract_text(self):
+        """Extract all text from the file (extracted once per document)"""
+        return self.document.text
+
+    def extract_info(self) -> Dict:
+        """Extract basic information from resume"""
+        fields = self.document.fields
+        return {
+            'name': fields['name'],
+            'email': fields['email'],
+            'phone': fields['phone']
+        }
+
+    def extract_sections(self) -> Dict:
+        """Extract different sections from resume"""
+        fields = self.document.fields
+        return {
+            'education': fields['education'] or '',
+            'experience': fields['experience'] or '',
+            'skills': list(fields['skills'])
+        }
@@ -0,0 +1,278 @@
+import os
+import time
+import logging
+import zipfile
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import Config
+from app.services.metrics import EXTRACTION_SECONDS, PAGES
+
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 1024  # The PDF header may follow a little leading junk
+GARBAGE_CHARS = frozenset('�■\x00')  # Replacement char, missing-glyph box, NUL
+
+class UnsupportedFormatError(ValueError):
+    """The file is not a format any registered backend reads"""
+
+@dataclass(frozen=True)
+class Backend:
+    """A text extractor for one format, returning the text of each page"""
+    name: str
+    format: str
+    extract: Callable[[str], List[str]]
+
+_backends: Dict[str, Dict[str, Backend]] = {}
+
+def register(format: str, name: str):
+    """Register a function file_path -> [page text] as a backend for a sniffed format"""
+    def decorator(extract):
+        _backends.setdefault(format, {})[name] = Backend(name, format, extract)
+        return extract
+    return decorator
+
+def backends(format: str) -> List[Backend]:
+    """Backends for a format in the configured order (fastest first), then any others"""
+    registered = _backends.get(format, {})
+    order = [name.strip() for name in Config.PARSER_BACKENDS.get(format, '').split(',') if name.strip()]
+    ordered = [registered[name] for name in order if name in registered]
+    return ordered + [backend for name, backend in registered.items() if name not in order]
+
+def sniff(file_path: str) -> Optional[str]:
+    """File format from its leading bytes: 'pdf', 'docx', 'doc' or None"""
+    with open(file_path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    if b'%PDF-' in head:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        return 'docx' if 'word/document.xml' in names else None
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'doc'  # Legacy OLE Word file
+    return None
+
+def text_quality(pages: List[str]) -> Tuple[int, float]:
+    """(characters per page, share of characters that are extraction garbage)"""
+    text = ''.join(pages)
+    if not text.strip():
+        return 0, 1.0
+    garbage = sum(1 for char in text if char in GARBAGE_CHARS) + 5 * text.count('(cid:')
+    return len(text.strip()) // max(1, len(pages)), garbage / len(text)
+
+def is_usable(pages: List[str]) -> bool:
+    chars_per_page, garbage = text_quality(pages)
+    return chars_per_page >= Config.PARSER_MIN_CHARS_PER_PAGE and garbage <= Config.PARSER_MAX_GARBAGE
+
+_page_counts = Counter()
+_page_counts_lock = threading.Lock()
+
+def page_stats() -> Dict[str, Dict[str, int]]:
+    """
+    How pages were read since the process started
+
+    'pages' counts pages per path: a text backend name, 'ocr', or
+    'ocr_failed' (no text layer and OCR produced nothing); 'documents'
+    counts documents by whether any page needed OCR.
+    """
+    with _page_counts_lock:
+        pages = {key[1]: count for key, count in _page_counts.items() if key[0] == 'page'}
+        documents = {key[1]: count for key, count in _page_counts.items() if key[0] == 'document'}
+    return {'pages': pages, 'documents': documents}
+
+def _record_pages(sources: List[str]) -> None:
+    with _page_counts_lock:
+        _page_counts.update(('page', source) for source in sources)
+        _page_counts[('document', 'ocr' if any(s.startswith('ocr') for s in sources) else 'text')] += 1
+    for source in sources:
+        PAGES.inc(path=source)
+
+class Document:
+    """
+    One resume file, extracted once
+
+    The format is sniffed from magic bytes. Backends are tried in order
+    and the first with usable text wins; text, lines and extracted fields
+    are computed on first access and kept for the life of the object.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.format = sniff(file_path)
+        if self.format is None or self.format not in _backends:
+            raise UnsupportedFormatError(f"Không hỗ trợ định dạng file: {self.format or os.path.splitext(file_path)[1]}")
+        self.backend: Optional[str] = None  # How most pages were read
+        self.page_sources: List[str] = []  # How each page was read, see page_stats()
+        self.extract_seconds = 0.0
+
+    @cached_property
+    def pages(self) -> List[str]:
+        """Text of every page in reading order (DOCX has no pages and yields one)"""
+        started = time.perf_counter()
+        pages = self._pdf_pages() if self.format == 'pdf' else self._first_usable()
+        self.extract_seconds = time.perf_counter() - started
+        EXTRACTION_SECONDS.observe(self.extract_seconds, backend=self.backend or 'none')
+        logger.info(f"Extracted {len(pages)} pages from {self.file_path} "
+                    f"({dict(Counter(self.page_sources))}) in {self.extract_seconds:.3f}s")
+        return pages
+
+    def _first_usable(self) -> List[str]:
+        """Whole-document text from the first backend that gives usable text, else the longest"""
+        best: List[str] = []
+        for backend in backends(self.format):
+            try:
+                pages = [page or '' for page in backend.extract(self.file_path)]
+            except Exception as e:
+                logger.warning(f"{backend.name} could not read {self.file_path}: {str(e)}")
+                continue
+            if is_usable(pages):
+                self.backend, best = backend.name, pages
+                break
+            if len(''.join(best).strip()) < len(''.join(pages).strip()):
+                self.backend, best = backend.name, pages
+        self.page_sources = [self.backend] * len(best)
+        return best
+
+    def _pdf_pages(self) -> List[str]:
+        """
+        Text layer where a page has it, OCR for only the pages that do not
+
+        Later backends are consulted only for pages whose text layer exists
+        but is garbled; pages with no text at all go straight to OCR, which
+        renders just those pages.
+        """
+        pages: List[str] = []
+        sources: List[str] = []
+        missing: List[int] = []
+        for backend in backends('pdf'):
+            if pages and not any(pages[i].strip() for i in missing):
+                break
+            try:
+                extracted = [page or '' for page in backend.extract(self.file_path)]
+            except Exception as e:
+                logger.warning(f"{backend.name} could not read {self.file_path}: {str(e)}")
+                continue
+            if not pages:
+                pages, sources = extracted, [backend.name] * len(extracted)
+            else:
+                for i in missing:
+                    if i < len(extracted) and is_usable([extracted[i]]):
+                        pages[i], sources[i] = extracted[i], backend.name
+            missing = [i for i, page in enumerate(pages) if not is_usable([page])]
+            if not missing:
+                break
+
+        if not pages:
+            # No backend could read the file: treat every page as a scan
+            from app.services.ocr import page_count
+
+            try:
+                num_pages = page_count(self.file_path)
+            except Exception as e:
+                logger.error(f"Could not count pages of {self.file_path}: {str(e)}")
+                num_pages = 0
+            pages, sources, missing = [''] * num_pages, ['ocr'] * num_pages, list(range(num_pages))
+
+        if missing:
+            self._ocr_pages(pages, sources, missing)
+        self.page_sources = sources
+        self.backend = Counter(sources).most_common(1)[0][0] if sources else None
+        _record_pages(sources)
+        return pages
+
+    def _ocr_pages(self, pages: List[str], sources: List[str], missing: List[int]) -> None:
+        """OCR the given 0-based pages in place, keeping any text layer OCR cannot improve on"""
+        from app.services.ocr import ocr_pdf  # pytesseract is only needed for scans
+
+        logger.info(f"Trang {[i + 1 for i in missing]} không có lớp văn bản, thử dùng OCR")
+        try:
+            result = ocr_pdf(self.file_path, pages=[i + 1 for i in missing])
+        except Exception as e:
+            logger.error(f"OCR failed for {self.file_path}: {str(e)}")
+            for i in missing:
+                sources[i] = 'ocr_failed'
+            return
+        logger.info(f"OCR {len(missing)} trang trong {result.total_seconds:.2f}s: {result.timings()}")
+        for page_result in result.pages:
+            i = page_result.page - 1
+            if page_result.text.strip():
+                pages[i], sources[i] = page_result.text, 'ocr'
+            else:
+                sources[i] = 'ocr_failed'
+
+    @cached_property
+    def text(self) -> str:
+        return '\n'.join(page.strip() for page in self.pages if page.strip())
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return [line.strip() for line in self.text.split('\n') if line.strip()]
+
+    @cached_property
+    def fields(self) -> Dict:
+        """name, email, phone, skills, education, experience from the field extractor"""
+        from app.services.field_extractor import extract_fields
+
+        return extract_fields(self.text)
+
+_documents: 'OrderedDict[Tuple, Document]' = OrderedDict()
+_documents_lock = threading.Lock()
+
+def open_document(file_path: str) -> Document:
+    """
+    Document for a file, shared while the file is unchanged
+
+    Keyed by path, size and mtime, so repeated calls for the same upload
+    (extract_info then extract_sections, retries) extract only once.
+    """
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _documents_lock:
+        document = _documents.get(key)
+        if document is not None:
+            _documents.move_to_end(key)
+            return document
+    document = Document(file_path)
+    with _documents_lock:
+        _documents[key] = document
+        while len(_documents) > Config.PARSER_DOCUMENT_CACHE:
+            _documents.popitem(last=False)
+    return document
+
+@register('pdf', 'pypdf2')
+def _pypdf2_pages(file_path: str) -> List[str]:
+    import PyPDF2
+
+    with open(file_path, 'rb') as f:
+        return [page.extract_text() for page in PyPDF2.PdfReader(f).pages]
+
+@register('pdf', 'pdfminer')
+def _pdfminer_pages(file_path: str) -> List[str]:
+    from pdfminer.high_level import extract_text
+
+    # pdfminer ends every page with a form feed
+    pages = extract_text(file_path).split('\x0c')
+    return pages[:-1] if len(pages) > 1 and not pages[-1].strip() else pages
+
+@register('docx', 'docx2txt')
+def _docx2txt_pages(file_path: str) -> List[str]:
+    import docx2txt
+
+    return [docx2txt.process(file_path)]
+
+@register('docx', 'python-docx')
+def _python_docx_pages(file_path: str) -> List[str]:
+    from docx import Document as DocxDocument
+
+    document = DocxDocument(file_path)
+    paragraphs = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            paragraphs.append(' | '.join(cell.text for cell in row.cells))
+    return ['\n'.join(paragraphs)]
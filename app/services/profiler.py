@@ -0,0 +1,256 @@
+import os
+import re
+import sys
+import hmac
+import time
+import random
+import pstats
+import logging
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {'pstats': '.prof', 'collapsed': '.collapsed'}
+PROFILE_NAME_RE = re.compile(r'^[0-9]{8}T[0-9]{12}-[0-9]+-[a-z]+-[A-Za-z0-9_.-]{1,80}\.(prof|collapsed)$')
+LABEL_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+# cProfile allows one active profiler per process on newer Pythons, and one
+# profiled request at a time keeps the worst-case overhead bounded
+_active = threading.Lock()
+
+class Profile:
+    """
+    Profile of one unit of work on the current thread
+
+    'pstats' runs cProfile (exact call counts, open with pstats or snakeviz);
+    'collapsed' samples the thread's stack every PROFILE_SAMPLE_INTERVAL
+    seconds from a helper thread and writes folded stacks for flamegraph.pl
+    or speedscope, which costs far less on regex-heavy code.
+    """
+
+    def __init__(self, kind: str, label: str, format: Optional[str] = None):
+        self.kind = kind
+        self.label = LABEL_RE.sub('_', label).strip('_')[:80] or 'root'
+        self.format = format or Config.PROFILE_FORMAT
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown profile format: {self.format}")
+        self.started_at = datetime.utcnow()
+        self.name = (f"{self.started_at:%Y%m%dT%H%M%S%f}-{os.getpid()}-{self.kind}-{self.label}"
+                     f"{FORMATS[self.format]}")
+        self.seconds = 0.0
+        self._started = None
+        self._profiler = None
+        self._stacks: Counter = Counter()
+        self._sampling = threading.Event()
+        self._sampler = None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.format == 'pstats':
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampling.set()
+            self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),),
+                                             name='profile-sampler', daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampling.clear()
+            self._sampler.join()
+        self.seconds = time.perf_counter() - self._started
+
+    def _sample(self, thread_id: int) -> None:
+        interval = Config.PROFILE_SAMPLE_INTERVAL
+        while self._sampling.is_set():
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[';'.join(reversed(stack))] += 1
+            time.sleep(interval)
+
+    def save(self) -> str:
+        """Write the profile to PROFILE_DIR, rotate old ones out and return the file name"""
+        name = self.name
+        os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=Config.PROFILE_DIR, suffix='.tmp')
+        try:
+            if self._profiler is not None:
+                os.close(fd)
+                self._profiler.dump_stats(tmp_path)
+            else:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for stack, count in self._stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+            os.replace(tmp_path, os.path.join(Config.PROFILE_DIR, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        rotate()
+        logger.info(f"Saved {self.kind} profile {name} ({self.seconds:.3f}s)")
+        return name
+
+def rotate() -> None:
+    """Delete the oldest profiles beyond PROFILE_MAX_FILES or PROFILE_MAX_BYTES"""
+    profiles = list_profiles()  # Newest first
+    kept_bytes = 0
+    for i, profile in enumerate(profiles):
+        kept_bytes += profile['size']
+        if i >= Config.PROFILE_MAX_FILES or kept_bytes > Config.PROFILE_MAX_BYTES:
+            try:
+                os.remove(os.path.join(Config.PROFILE_DIR, profile['name']))
+            except FileNotFoundError:
+                pass  # Another worker rotated it first
+
+def list_profiles() -> List[Dict]:
+    """Saved profiles, newest first"""
+    if not os.path.isdir(Config.PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(Config.PROFILE_DIR):
+        if not PROFILE_NAME_RE.match(entry.name):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        profiles.append({'name': entry.name, 'size': stat.st_size,
+                         'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat()})
+    profiles.sort(key=lambda profile: (profile['created_at'], profile['name']), reverse=True)
+    return profiles
+
+def summary(name: str, limit: int = 20) -> List[Dict]:
+    """Functions with the most cumulative time in a pstats profile"""
+    stats = pstats.Stats(os.path.join(Config.PROFILE_DIR, name))
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({'function': f"{function} ({os.path.basename(filename)}:{line})", 'calls': calls,
+                     'own_seconds': round(own, 6), 'cumulative_seconds': round(cumulative, 6)})
+    rows.sort(key=lambda row: -row['cumulative_seconds'])
+    return rows[:limit]
+
+def is_profile_name(name: str) -> bool:
+    return bool(PROFILE_NAME_RE.match(name))
+
+def enabled() -> bool:
+    """PROFILING_ENABLED only takes effect together with a PROFILE_TOKEN"""
+    return Config.PROFILING_ENABLED and bool(Config.PROFILE_TOKEN)
+
+def authorized(token: Optional[str]) -> bool:
+    """Whether a PROFILE_HEADER value may trigger profiling or read profiles"""
+    if not Config.PROFILE_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), Config.PROFILE_TOKEN.encode('utf-8'))
+
+@contextmanager
+def _profiled(kind: str, label: str, force: bool = False) -> Iterator[Optional[Profile]]:
+    """Profile the block unless another profile is running in this process"""
+    if not _active.acquire(blocking=False):
+        yield None
+        return
+    profile = Profile(kind, label)
+    try:
+        profile.start()
+        try:
+            yield profile
+        finally:
+            profile.stop()
+        if force or profile.seconds >= Config.PROFILE_MIN_SECONDS:
+            try:
+                profile.save()
+            except OSError as e:
+                logger.error(f"Could not save profile {profile.name}: {str(e)}")
+    finally:
+        _active.release()
+
+def maybe_profile(kind: str, label: str, sample_rate: float):
+    """Profile a sampled share of background work; a no-op when profiling is off"""
+    if not enabled() or random.random() >= sample_rate:
+        return nullcontext()
+    return _profiled(kind, label)
+
+class ProfilingMiddleware:
+    """
+    WSGI middleware that profiles requests carrying PROFILE_HEADER or a
+    sampled PROFILE_SAMPLE_RATE share of all requests
+
+    It covers the whole response, including streamed bodies. Only
+    installed when PROFILING_ENABLED and PROFILE_TOKEN are both set, so it
+    costs nothing otherwise.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self.header = 'HTTP_' + Config.PROFILE_HEADER.upper().replace('-', '_')
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith('/api/admin/profiles'):
+            return self.wsgi_app(environ, start_response)
+        requested = authorized(environ.get(self.header))
+        if not requested and random.random() >= Config.PROFILE_SAMPLE_RATE:
+            return self.wsgi_app(environ, start_response)
+
+        label = f"{environ.get('REQUEST_METHOD', '')}{environ.get('PATH_INFO', '')}"
+        context = _profiled('request', label, force=requested)
+        profile = context.__enter__()
+        if profile is None:
+            context.__exit__(None, None, None)
+            return self.wsgi_app(environ, start_response)
+        if requested:
+            # Tell the caller which profile to download from /api/admin/profiles
+            def start_response(status, headers, exc_info=None, _start_response=start_response):
+                return _start_response(status, headers + [('X-Profile-Name', profile.name)], exc_info)
+        try:
+            body = self.wsgi_app(environ, start_response)
+        except BaseException:
+            context.__exit__(*sys.exc_info())
+            raise
+        return _ClosingIterator(body, context)
+
+class _ClosingIterator:
+    """Iterates a response body and ends the profile when the server closes it"""
+
+    def __init__(self, body, context):
+        self._body = body
+        self._iterator = iter(body)
+        self._context = context
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close()
+        finally:
+            self._context.__exit__(None, None, None)
+
+def init_app(app) -> None:
+    """Wrap the app in the profiling middleware when PROFILING_ENABLED"""
+    if not Config.PROFILING_ENABLED:
+        return
+    if not Config.PROFILE_TOKEN:
+        app.logger.error("PROFILING_ENABLED is set but PROFILE_TOKEN is not: profiling stays off")
+        return
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app)
+    app.logger.info(f"Profiling enabled ({Config.PROFILE_FORMAT}, sample rate {Config.PROFILE_SAMPLE_RATE}, "
+                    f"writing to {Config.PROFILE_DIR})")
@@ -0,0 +1,160 @@
+import re
+import logging
+import threading
+from typing import Iterable, Optional, Tuple
+from ..config import Config
+from .field_extractor import extract_fields
+from .skill_search import decode_skills
+
+logger = logging.getLogger(__name__)
+
+PIECE_RE = re.compile(r'\w+|[^\w\s]')
+INLINE_SPACE_RE = re.compile(r'[ \t\f\v\u00a0]+')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+TRUNCATION_MARK = '…'
+PROFILE_LINES = 8  # Lines from the top of a resume kept as the candidate's profile
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+def _get_encoding():
+    """tiktoken encoding when installed and usable, else False (heuristic counting)"""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            _encoding = False
+            if Config.PROMPT_TOKENIZER != 'heuristic':
+                try:
+                    import tiktoken  # Optional dependency
+                    _encoding = tiktoken.encoding_for_model(Config.OPENAI_MODEL)
+                except Exception as e:
+                    logger.info(f"tiktoken unavailable ({str(e)}), estimating token counts")
+        return _encoding
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Token count for the configured model
+
+    Uses tiktoken when available. Otherwise words are estimated at four
+    characters per token for ASCII and two for accented (Vietnamese) words,
+    with one token per punctuation mark, which tracks cl100k closely enough
+    for budgeting.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    count = 0
+    for piece in PIECE_RE.findall(text):
+        per_token = 4 if piece.isascii() else 2
+        count += max(1, -(-len(piece) // per_token))
+    return count
+
+def normalize_whitespace(text: Optional[str]) -> str:
+    """Strip every line, collapse runs of spaces and keep at most one blank line"""
+    if not text:
+        return ''
+    lines = (INLINE_SPACE_RE.sub(' ', line).strip() for line in text.replace('\r\n', '\n').split('\n'))
+    return BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Keep the head of text within budget tokens, cutting at a line boundary when possible"""
+    if budget <= 0:
+        return ''
+    if count_tokens(text) <= budget:
+        return text
+    kept, used = [], 0
+    for line in text.split('\n'):
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            if not kept:
+                # A single overlong line: cut by words
+                words = []
+                for word in line.split(' '):
+                    used += count_tokens(word)
+                    if used > budget - 1:
+                        break
+                    words.append(word)
+                kept.append(' '.join(words))
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept).rstrip() + TRUNCATION_MARK
+
+def compact_sections(sections: Iterable[Tuple[str, str]], budget: int) -> str:
+    """
+    Fit labelled sections into a token budget in priority order
+
+    Each section gets whatever budget the sections before it left over,
+    so the most relevant ones are kept whole and later ones are truncated
+    or dropped.
+    """
+    parts = []
+    remaining = budget
+    for label, text in sections:
+        text = normalize_whitespace(text)
+        if not text:
+            continue
+        header = f'{label}:'
+        available = remaining - count_tokens(header) - 1
+        if available <= 0:
+            break
+        text = truncate_to_tokens(text, available)
+        parts.append(f'{header}\n{text}')
+        remaining -= count_tokens(parts[-1]) + 1
+    return '\n\n'.join(parts)
+
+def _log_savings(what: str, before: int, after: int) -> None:
+    saved = 100.0 * (before - after) / before if before else 0.0
+    logger.info(f"{what}: {before} -> {after} tokens ({saved:.0f}% saved)")
+
+def build_resume_context(resume_text: str, budget: Optional[int] = None) -> str:
+    """
+    Compact resume text for an evaluation prompt
+
+    Whitespace is always normalized. A resume over budget is rebuilt from
+    the field extractor's sections, kept in order of
+    relevance: skills, experience (most recent entries are listed first
+    in resumes, so the head is kept), education, then the profile lines
+    at the top of the resume.
+    """
+    budget = Config.PROMPT_RESUME_TOKENS if budget is None else budget
+    normalized = normalize_whitespace(resume_text)
+    if count_tokens(normalized) <= budget:
+        _log_savings('Resume context', count_tokens(resume_text), count_tokens(normalized))
+        return normalized
+    fields = extract_fields(normalized)
+    profile = '\n'.join(normalized.split('\n')[:PROFILE_LINES])
+    context = compact_sections([
+        ('Skills', ', '.join(fields['skills'])),
+        ('Experience', fields['experience']),
+        ('Education', fields['education']),
+        ('Profile', profile),
+    ], budget)
+    if not context:
+        # Nothing recognizable: fall back to the head of the raw text
+        context = truncate_to_tokens(normalized, budget)
+    _log_savings('Resume context', count_tokens(resume_text), count_tokens(context))
+    return context
+
+def build_candidate_context(candidate, budget: Optional[int] = None) -> str:
+    """Compact candidate fields for the chat context block, most relevant first"""
+    budget = Config.PROMPT_CHAT_CONTEXT_TOKENS if budget is None else budget
+    header = '\n'.join(f'{label}: {value}' for label, value in (
+        ('Name', candidate.name),
+        ('Email', candidate.email),
+        ('Phone', candidate.phone),
+        ('Status', candidate.status),
+    ) if value)
+    sections = [
+        ('Skills', ', '.join(decode_skills(candidate.skills))),
+        ('Experience', candidate.experience),
+        ('Education', candidate.education),
+    ]
+    header = f'Candidate Information:\n{header}'
+    body = compact_sections(sections, budget - count_tokens(header) - 2)
+    context = f'{header}\n\n{body}'.strip()
+    before = count_tokens(header) + sum(count_tokens(text) for _, text in sections)
+    _log_savings('Chat candidate context', before, count_tokens(context))
+    return context
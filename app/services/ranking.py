@@ -0,0 +1,367 @@
+import re
+import json
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.exc import IntegrityError
+from ..config import Config
+from ..extensions import db
+from ..models.candidate import Candidate
+from ..models.ranking_job import RankingJob
+from ..models.ranking_result import RankingResult
+from . import parse_cache, storage
+from .gpt_evaluator import GPTEvaluator, get_evaluator
+from .prompt_builder import count_tokens
+from .skill_search import decode_skills
+from .status_notifier import status_notifier
+
+logger = logging.getLogger(__name__)
+
+PROMPT_OVERHEAD_TOKENS = 150  # Evaluation prompt template around the resume and requirements
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+
+def resume_text(candidate: Candidate) -> str:
+    """Full extracted resume text when still cached, otherwise the parsed fields"""
+    digest = storage.digest_of(candidate.resume_path)
+    if digest:
+        text = parse_cache.cached_text(digest)
+        if text:
+            return text
+    return '\n'.join(part for part in (
+        candidate.name,
+        ', '.join(decode_skills(candidate.skills)),
+        candidate.education,
+        candidate.experience
+    ) if part)
+
+def parse_score(evaluation: str) -> float:
+    """matchScore from an evaluation reply, tolerating prose or code fences around the JSON"""
+    match = JSON_OBJECT_RE.search(evaluation or '')
+    if match is None:
+        raise ValueError('Evaluation is not JSON')
+    score = float(json.loads(match.group(0))['matchScore'])
+    return min(max(score, 0.0), 100.0)
+
+class RankingQueue:
+    """Database-backed queue of bulk candidate ranking jobs.
+
+    Works like the ingest queue: jobs live in ``ranking_jobs`` and are
+    claimed with a conditional UPDATE, so any web process can run them. A
+    claimed job analyzes the job description once, then evaluates its
+    candidates on a thread pool. Each finished evaluation is committed
+    immediately, so rankings can be read while the job runs and a job
+    reclaimed from a dead worker skips candidates that were already scored.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Register with the app; jobs can be submitted, but nothing runs them until start()"""
+        self.app = app
+        app.extensions['ranking_queue'] = self
+
+    def start(self, workers: Optional[int] = None) -> None:
+        """Start the ranking workers for this process"""
+        workers = Config.RANKING_WORKERS if workers is None else workers
+        for i in range(len(self._threads), workers):
+            thread = threading.Thread(target=self._run, name=f'ranking-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if workers:
+            self.app.logger.info(f"Started {workers} candidate ranking workers")
+
+    def stop(self) -> None:
+        """Signal workers to exit after their current job"""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def submit(self, job_description: str, candidate_ids: Optional[Sequence[int]] = None,
+               concurrency: Optional[int] = None, token_budget: Optional[int] = None,
+               prefilter: Optional[int] = None) -> RankingJob:
+        """
+        Queue a ranking job (requires an app context)
+
+        Args:
+            job_description: Job description to rank against
+            candidate_ids: Candidates to evaluate, default every parsed candidate
+            concurrency: Evaluations in flight at once
+            token_budget: Estimated tokens the job may spend, None for the default, 0 for unlimited
+            prefilter: Only send this many best local matches to the LLM
+
+        Returns:
+            The queued job
+        """
+        if token_budget is None:
+            token_budget = Config.RANKING_TOKEN_BUDGET or None
+        else:
+            token_budget = int(token_budget)
+            if token_budget < 0:
+                raise ValueError('token_budget must be a non-negative integer')
+            token_budget = token_budget or None
+        if candidate_ids is not None:
+            # A JSON string would otherwise be iterated into one id per character
+            if not isinstance(candidate_ids, (list, tuple)) or not all(
+                    isinstance(cid, int) and not isinstance(cid, bool) for cid in candidate_ids):
+                raise ValueError('candidate_ids must be a list of integers')
+            candidate_ids = list(dict.fromkeys(candidate_ids))
+        if prefilter:
+            # Cheap local similarity decides who is worth a paid evaluation
+            from .matcher import match_candidates  # NumPy is loaded on first match, not at boot
+
+            matches = match_candidates(job_description, int(prefilter), candidate_ids)
+            candidate_ids = [cid for cid, _ in matches]
+        elif candidate_ids is None:
+            candidate_ids = [cid for (cid,) in (db.session.query(Candidate.id)
+                                                 .filter(Candidate.status == 'parsed')
+                                                 .order_by(Candidate.id)
+                                                 .limit(Config.RANKING_MAX_CANDIDATES))]
+        if not candidate_ids:
+            raise ValueError('No candidates to rank')
+        if len(candidate_ids) > Config.RANKING_MAX_CANDIDATES:
+            raise ValueError(f"At most {Config.RANKING_MAX_CANDIDATES} candidates can be ranked at once")
+
+        concurrency = Config.RANKING_CONCURRENCY if concurrency is None else int(concurrency)
+        job = RankingJob(
+            job_description=job_description,
+            candidate_ids=candidate_ids,
+            concurrency=min(max(concurrency, 1), Config.RANKING_MAX_CONCURRENCY),
+            token_budget=token_budget
+        )
+        db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        return job
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    job_id = self._claim_next()
+                    if job_id is not None:
+                        self._process(job_id)
+                        continue
+            except Exception as e:
+                logger.error(f"Ranking worker error: {str(e)}")
+            self._wakeup.wait(Config.RANKING_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def _claim_next(self) -> Optional[int]:
+        """Atomically move one queued job to 'running' and return its id"""
+        self._requeue_stale()
+        queued = (db.session.query(RankingJob.id)
+                  .filter(RankingJob.status == 'queued')
+                  .order_by(RankingJob.id)
+                  .limit(5)
+                  .all())
+        for (job_id,) in queued:
+            now = datetime.utcnow()
+            claimed = (RankingJob.query
+                       .filter(RankingJob.id == job_id, RankingJob.status == 'queued')
+                       .update({'status': 'running',
+                                'started_at': now,
+                                'updated_at': now,
+                                'attempts': RankingJob.attempts + 1},
+                               synchronize_session=False))
+            db.session.commit()
+            if claimed:
+                return job_id
+        return None
+
+    def _requeue_stale(self) -> None:
+        """Give jobs that stopped making progress another chance"""
+        cutoff = datetime.utcnow() - timedelta(seconds=Config.RANKING_JOB_TIMEOUT)
+        stale = (RankingJob.query
+                 .filter(RankingJob.status == 'running', RankingJob.updated_at < cutoff)
+                 .all())
+        for job in stale:
+            if job.attempts >= Config.RANKING_MAX_ATTEMPTS:
+                self._finish(job, 'failed', 'Ranking timed out')
+            else:
+                logger.warning(f"Requeueing stale ranking job {job.id}")
+                job.status = 'queued'
+        if stale:
+            db.session.commit()
+
+    def _process(self, job_id: int) -> None:
+        job = RankingJob.query.get(job_id)
+        try:
+            evaluator = get_evaluator()
+            if not job.requirements:
+                # One analysis per job instead of one per candidate
+                requirements = evaluator.analyze_job_requirements(job.job_description)
+                if isinstance(requirements, dict):
+                    raise RuntimeError(requirements.get('error') or 'Job analysis failed')
+                job.requirements = requirements
+                job.updated_at = datetime.utcnow()
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self._finish(job, 'failed', str(e))
+            db.session.commit()
+            return
+
+        done = {cid for (cid,) in (db.session.query(RankingResult.candidate_id)
+                                   .filter(RankingResult.ranking_job_id == job.id))}
+        todo = [cid for cid in json.loads(job.candidate_ids) if cid not in done]
+        budget_exhausted = self._evaluate_all(job, evaluator, todo)
+        if self._stopping.is_set():
+            # Shutting down: hand the rest of the job to another process
+            job.status = 'queued'
+            db.session.commit()
+            return
+
+        error = None
+        if budget_exhausted:
+            error = f"Token budget exhausted after {job.evaluated + job.failed} of {job.total} candidates"
+        self._finish(job, 'completed', error)
+        db.session.commit()
+        logger.info(f"Ranking job {job.id} finished: {job.evaluated} evaluated, {job.failed} failed")
+
+    def _evaluate_all(self, job: RankingJob, evaluator: GPTEvaluator, candidate_ids: List[int]) -> bool:
+        """
+        Evaluate candidates with at most job.concurrency requests in flight
+
+        Candidates are loaded and results written on this thread only; pool
+        threads just call the evaluator. A candidate is only started if its
+        estimated cost still fits in the token budget.
+
+        Returns:
+            Whether candidates were skipped because the budget ran out
+        """
+        app = self.app
+        requirements = job.requirements
+        # evaluate_resume compacts both inputs to their prompt budgets
+        requirement_tokens = min(count_tokens(requirements), Config.PROMPT_JOB_TOKENS)
+
+        def evaluate(text: str):
+            with app.app_context():
+                return evaluator.evaluate_resume(text, requirements)
+
+        pending = {}
+        reserved = 0
+        remaining = iter(candidate_ids)
+        budget_exhausted = False
+        with ThreadPoolExecutor(max_workers=job.concurrency, thread_name_prefix=f'ranking-{job.id}') as pool:
+            while True:
+                while not budget_exhausted and len(pending) < job.concurrency and not self._stopping.is_set():
+                    candidate_id = next(remaining, None)
+                    if candidate_id is None:
+                        break
+                    candidate = Candidate.query.get(candidate_id)
+                    if candidate is None:
+                        self._drop_missing(job, candidate_id, 0)
+                        continue
+                    text = resume_text(candidate)
+                    prompt_tokens = (min(count_tokens(text), Config.PROMPT_RESUME_TOKENS)
+                                     + requirement_tokens + PROMPT_OVERHEAD_TOKENS)
+                    estimate = prompt_tokens + evaluator.EVALUATE_MAX_TOKENS
+                    if job.token_budget and job.tokens_used + reserved + estimate > job.token_budget:
+                        budget_exhausted = True
+                        break
+                    reserved += estimate
+                    pending[pool.submit(evaluate, text)] = (candidate_id, prompt_tokens, estimate)
+                if not pending:
+                    return budget_exhausted
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    candidate_id, prompt_tokens, estimate = pending.pop(future)
+                    reserved -= estimate
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'error': str(e)}
+                    if isinstance(result, dict):
+                        # evaluate_resume reports failures as an error dict
+                        self._record(job, candidate_id, None, result.get('error') or 'Evaluation failed', prompt_tokens)
+                    else:
+                        self._record(job, candidate_id, result, None,
+                                     prompt_tokens + count_tokens(result))
+
+    def _record(self, job: RankingJob, candidate_id: int, evaluation: Optional[str],
+                error: Optional[str], tokens: int) -> None:
+        """Commit one candidate's result and the job's progress"""
+        candidate = Candidate.query.get(candidate_id)
+        if candidate is None:
+            self._drop_missing(job, candidate_id, tokens)
+            return
+        score = None
+        if evaluation is not None:
+            try:
+                score = parse_score(evaluation)
+            except (ValueError, KeyError, TypeError):
+                error = 'Could not read matchScore from evaluation'
+            candidate.evaluation = evaluation
+        db.session.add(RankingResult(ranking_job_id=job.id, candidate_id=candidate_id,
+                                     score=score, evaluation=evaluation, error=error))
+        if score is None:
+            job.failed = (job.failed or 0) + 1
+        else:
+            job.evaluated = (job.evaluated or 0) + 1
+        job.tokens_used = (job.tokens_used or 0) + tokens
+        job.updated_at = datetime.utcnow()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Deleted between the lookup and the commit
+            db.session.rollback()
+            self._drop_missing(job, candidate_id, tokens)
+            return
+        if evaluation is not None:
+            status_notifier.notify()
+
+    @staticmethod
+    def _drop_missing(job: RankingJob, candidate_id: int, tokens: int) -> None:
+        """
+        Count a deleted candidate as failed on the job row only
+
+        A RankingResult would break its candidate foreign key. The id also
+        leaves job.candidate_ids, so a requeued job does not count it twice.
+        """
+        logger.warning(f"Ranking job {job.id}: candidate {candidate_id} no longer exists")
+        job.candidate_ids = json.dumps([cid for cid in json.loads(job.candidate_ids) if cid != candidate_id])
+        job.failed = (job.failed or 0) + 1
+        job.tokens_used = (job.tokens_used or 0) + tokens
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+
+    @staticmethod
+    def _finish(job: RankingJob, status: str, error: Optional[str]) -> None:
+        if status == 'failed':
+            logger.error(f"Ranking job {job.id} failed: {error}")
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        job.updated_at = job.finished_at
+
+def get_rankings(job: RankingJob, limit: int = 50, include_failed: bool = False) -> List[Dict]:
+    """
+    Best-first rankings recorded so far for a job
+
+    Returns:
+        Candidate summaries with 'score', 'evaluation' and 'error' keys
+    """
+    query = (db.session.query(RankingResult, Candidate)
+             .join(Candidate, Candidate.id == RankingResult.candidate_id)
+             .filter(RankingResult.ranking_job_id == job.id))
+    if not include_failed:
+        query = query.filter(RankingResult.score.isnot(None))
+    rows: List[Tuple[RankingResult, Candidate]] = (query
+                                                   .order_by(RankingResult.score.is_(None),
+                                                             RankingResult.score.desc(),
+                                                             RankingResult.candidate_id)
+                                                   .limit(limit)
+                                                   .all())
+    return [dict(candidate.to_dict(Candidate.SUMMARY_FIELDS), score=result.score,
+                 evaluation=result.evaluation, error=result.error)
+            for result, candidate in rows]
+
+ranking_queue = RankingQueue()
@@ -0,0 +1,191 @@
+import re
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import text as sql
+from sqlalchemy.orm import load_only
+from ..extensions import db
+from ..models.candidate import Candidate
+from .skill_search import decode_skills
+from .skill_taxonomy import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+TERM_RE = re.compile(r'\w+')
+MAX_QUERY_TERMS = 16
+
+def normalize(value: Optional[str]) -> str:
+    """Lowercase and strip Vietnamese diacritics so 'Hà Nội' matches 'ha noi'"""
+    return fold_diacritics(value or '').lower()
+
+def query_terms(query: str) -> List[str]:
+    return list(dict.fromkeys(TERM_RE.findall(normalize(query))))[:MAX_QUERY_TERMS]
+
+class SQLiteSearchBackend:
+    """FTS5 virtual table keyed by candidate id, ranked with bm25"""
+
+    # bm25 column weights: name, skills, experience, education, body
+    WEIGHTS = (8.0, 6.0, 3.0, 2.0, 1.0)
+
+    def ensure_schema(self) -> None:
+        db.session.execute(sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS candidate_search "
+            "USING fts5(name, skills, experience, education, body, tokenize='unicode61')"))
+        db.session.commit()
+
+    def index(self, candidate_id: int, document: Dict[str, str]) -> None:
+        db.session.execute(sql("DELETE FROM candidate_search WHERE rowid = :id"), {'id': candidate_id})
+        db.session.execute(sql(
+            "INSERT INTO candidate_search (rowid, name, skills, experience, education, body) "
+            "VALUES (:id, :name, :skills, :experience, :education, :body)"),
+            dict(document, id=candidate_id))
+
+    def remove(self, candidate_id: int) -> None:
+        db.session.execute(sql("DELETE FROM candidate_search WHERE rowid = :id"), {'id': candidate_id})
+
+    def search(self, terms: List[str], limit: int) -> List[tuple]:
+        # Any term may match (OR); bm25 ranks documents matching more terms higher
+        match = ' OR '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        weights = ', '.join(str(w) for w in self.WEIGHTS)
+        rows = db.session.execute(sql(
+            f"SELECT rowid, -bm25(candidate_search, {weights}) AS score FROM candidate_search "
+            "WHERE candidate_search MATCH :match ORDER BY score DESC LIMIT :limit"),
+            {'match': match, 'limit': limit})
+        return [(row[0], row[1]) for row in rows]
+
+class PostgresSearchBackend:
+    """Weighted tsvector per candidate with a GIN index, ranked with ts_rank_cd"""
+
+    def ensure_schema(self) -> None:
+        db.session.execute(sql(
+            "CREATE TABLE IF NOT EXISTS candidate_search ("
+            "candidate_id INTEGER PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"))
+        db.session.execute(sql(
+            "CREATE INDEX IF NOT EXISTS ix_candidate_search_document "
+            "ON candidate_search USING GIN (document)"))
+        db.session.commit()
+
+    def index(self, candidate_id: int, document: Dict[str, str]) -> None:
+        db.session.execute(sql(
+            "INSERT INTO candidate_search (candidate_id, document) VALUES (:id, "
+            "setweight(to_tsvector('simple', :name), 'A') || "
+            "setweight(to_tsvector('simple', :skills), 'A') || "
+            "setweight(to_tsvector('simple', :experience), 'B') || "
+            "setweight(to_tsvector('simple', :education), 'C') || "
+            "setweight(to_tsvector('simple', :body), 'D')) "
+            "ON CONFLICT (candidate_id) DO UPDATE SET document = EXCLUDED.document"),
+            dict(document, id=candidate_id))
+
+    def remove(self, candidate_id: int) -> None:
+        db.session.execute(sql("DELETE FROM candidate_search WHERE candidate_id = :id"), {'id': candidate_id})
+
+    def search(self, terms: List[str], limit: int) -> List[tuple]:
+        tsquery = ' | '.join(f'{term}:*' for term in terms)
+        rows = db.session.execute(sql(
+            "SELECT candidate_id, ts_rank_cd(document, query) AS score "
+            "FROM candidate_search, to_tsquery('simple', :tsquery) AS query "
+            "WHERE document @@ query ORDER BY score DESC LIMIT :limit"),
+            {'tsquery': tsquery, 'limit': limit})
+        return [(row[0], row[1]) for row in rows]
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backends = {}
+
+def get_backend():
+    """Search backend for the current database, or None if unsupported"""
+    dialect = db.engine.dialect.name
+    if dialect not in _backends:
+        backend_class = BACKENDS.get(dialect)
+        _backends[dialect] = backend_class() if backend_class else None
+        if backend_class is None:
+            logger.warning(f"Full-text search is not supported on {dialect}")
+    return _backends[dialect]
+
+def ensure_schema() -> None:
+    """Create the search index table for the current database"""
+    backend = get_backend()
+    if backend is not None:
+        backend.ensure_schema()
+
+def build_document(candidate: Candidate, resume_text: Optional[str] = None) -> Dict[str, str]:
+    return {
+        'name': normalize(candidate.name),
+        'skills': normalize(' '.join(decode_skills(candidate.skills))),
+        'experience': normalize(candidate.experience),
+        'education': normalize(candidate.education),
+        'body': normalize(resume_text)
+    }
+
+def index_candidate(candidate: Candidate, resume_text: Optional[str] = None) -> None:
+    """
+    Add or refresh a candidate in the search index
+
+    Runs in the caller's transaction, so the index is committed together
+    with the candidate. The candidate must already have an id (flush first).
+    """
+    backend = get_backend()
+    if backend is None:
+        return
+    backend.index(candidate.id, build_document(candidate, resume_text))
+
+def remove_candidate(candidate_id: int) -> None:
+    backend = get_backend()
+    if backend is not None:
+        backend.remove(candidate_id)
+
+def search_candidates(query: str, limit: int = 20) -> List[Dict]:
+    """
+    Ranked full-text search over resume text and parsed sections
+
+    Matching ignores case and Vietnamese diacritics. Every query term is
+    treated as a prefix and any term may match; candidates matching more
+    terms, or matching in the name/skills, rank higher.
+
+    Returns:
+        Candidate summaries with a 'score' key, best match first
+    """
+    backend = get_backend()
+    terms = query_terms(query)
+    if backend is None or not terms:
+        return []
+    ranked = backend.search(terms, limit)
+    summary_columns = [getattr(Candidate, f) for f in Candidate.SUMMARY_FIELDS if f != 'id']
+    candidates = {c.id: c for c in (Candidate.query
+                                    .options(load_only(*summary_columns))
+                                    .filter(Candidate.id.in_([cid for cid, _ in ranked]))
+                                    .all())}
+    results = []
+    for candidate_id, score in ranked:
+        candidate = candidates.get(candidate_id)
+        if candidate is not None:
+            results.append(dict(candidate.to_dict(Candidate.SUMMARY_FIELDS), score=float(score)))
+    return results
+
+def reindex_all(batch_size: int = 500) -> int:
+    """Rebuild the index for every candidate, reusing cached resume text where available"""
+    from .parse_cache import cached_text
+    from .storage import digest_of
+
+    backend = get_backend()
+    if backend is None:
+        return 0
+    last_id = 0
+    indexed = 0
+    while True:
+        candidates = (Candidate.query.filter(Candidate.id > last_id)
+                      .order_by(Candidate.id).limit(batch_size).all())
+        if not candidates:
+            break
+        for candidate in candidates:
+            digest = digest_of(candidate.resume_path)
+            resume_text = cached_text(digest) if digest else None
+            backend.index(candidate.id, build_document(candidate, resume_text))
+        db.session.commit()
+        indexed += len(candidates)
+        last_id = candidates[-1].id
+        logger.info(f"Reindexed {indexed} candidates")
+    return indexed
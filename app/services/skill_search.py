@@ -0,0 +1,94 @@
+import json
+import logging
+import unicodedata
+from typing import Iterable, List, Union
+from sqlalchemy import exists, func
+from ..extensions import db
+from ..models.candidate import Candidate
+from ..models.candidate_skill import CandidateSkill
+from .skill_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+SKILL_MAX_LENGTH = 100
+
+def normalize_skill(name: str) -> str:
+    """Index key for a skill: canonical taxonomy name, NFC, lowercased"""
+    canonical = get_taxonomy().canonical(name) or name
+    return unicodedata.normalize('NFC', canonical).strip().lower()[:SKILL_MAX_LENGTH]
+
+def decode_skills(value: Union[str, Iterable[str], None]) -> List[str]:
+    """Skills from a JSON array string, a comma-separated string or a list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+        if isinstance(value, str):
+            value = [value]
+    return [str(skill).strip() for skill in value if str(skill).strip()]
+
+def set_candidate_skills(candidate: Candidate, skills: Union[str, Iterable[str], None]) -> None:
+    """Store skills on the candidate and keep the candidate_skills rows in sync"""
+    names = decode_skills(skills)
+    candidate.skills = json.dumps(names, ensure_ascii=False)
+    keys = dict.fromkeys(key for key in (normalize_skill(name) for name in names) if key)
+    candidate.skill_links = [CandidateSkill(skill=key) for key in keys]
+
+def filter_by_skills(query, all_of: Iterable[str] = (), any_of: Iterable[str] = ()):
+    """
+    Restrict a Candidate query by skills, entirely in SQL
+
+    Args:
+        query: Query over Candidate
+        all_of: Candidate must have every one of these skills (AND)
+        any_of: Candidate must have at least one of these skills (OR)
+
+    Returns:
+        The filtered query
+    """
+    all_of = list(dict.fromkeys(normalize_skill(s) for s in all_of if s.strip()))
+    any_of = list(dict.fromkeys(normalize_skill(s) for s in any_of if s.strip()))
+    if all_of:
+        matching = (db.session.query(CandidateSkill.candidate_id)
+                    .filter(CandidateSkill.skill.in_(all_of))
+                    .group_by(CandidateSkill.candidate_id)
+                    .having(func.count(CandidateSkill.skill) == len(all_of)))
+        query = query.filter(Candidate.id.in_(matching))
+    if any_of:
+        matching = (db.session.query(CandidateSkill.candidate_id)
+                    .filter(CandidateSkill.skill.in_(any_of)))
+        query = query.filter(Candidate.id.in_(matching))
+    return query
+
+def backfill_candidate_skills(batch_size: int = 1000) -> int:
+    """
+    Create candidate_skills rows for candidates stored before the table existed
+
+    Only candidates without any rows are touched, so the backfill can be
+    re-run safely. Returns the number of candidates backfilled.
+    """
+    missing = ~exists().where(CandidateSkill.candidate_id == Candidate.id)
+    last_id = 0
+    backfilled = 0
+    while True:
+        rows = (db.session.query(Candidate.id, Candidate.skills)
+                .filter(Candidate.id > last_id, Candidate.skills.isnot(None), missing)
+                .order_by(Candidate.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        values = []
+        for candidate_id, skills in rows:
+            keys = dict.fromkeys(key for key in (normalize_skill(s) for s in decode_skills(skills)) if key)
+            values.extend({'candidate_id': candidate_id, 'skill': key} for key in keys)
+        if values:
+            db.session.execute(CandidateSkill.__table__.insert(), values)
+        db.session.commit()
+        backfilled += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Backfilled skills for {backfilled} candidates")
+    return backfilled
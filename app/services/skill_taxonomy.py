@@ -0,0 +1,256 @@
+import os
+import re
+import csv
+import json
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Token: chữ/số, cho phép dấu chấm ở giữa (Node.js) và +/# ở cuối (C++, C#)
+TOKEN_RE = re.compile(r'\w+(?:\.\w+)*[+#]*')
+
+def tokenize(text: str, lower: bool = True) -> List[str]:
+    """Tách văn bản (đã chuẩn hóa NFC, chữ thường nếu ``lower``) thành các token"""
+    tokens = TOKEN_RE.findall(unicodedata.normalize('NFC', text))
+    return [token.lower() for token in tokens] if lower else tokens
+
+# Bảng ánh xạ từng ký tự (dạng NFC) -> ký tự đã bỏ dấu, bổ sung dần khi gặp ký tự mới
+_FOLD_TABLE: Dict[int, str] = {ord('đ'): 'd', ord('Đ'): 'D'}
+
+def _fold_char(char: str) -> str:
+    decomposed = unicodedata.normalize('NFD', char)
+    return unicodedata.normalize('NFC', ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn'))
+
+def fold_diacritics(text: str) -> str:
+    """Bỏ dấu tiếng Việt: 'Quản lý dự án' -> 'Quan ly du an'"""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFC', text)
+    for char in set(text):
+        if ord(char) > 127 and ord(char) not in _FOLD_TABLE:
+            _FOLD_TABLE[ord(char)] = _fold_char(char)
+    return text.translate(_FOLD_TABLE)
+
+@dataclass(frozen=True)
+class _Rule:
+    """Cụm từ chỉ được tính khi thỏa điều kiện ("AI" viết hoa, "Express" cạnh "Node.js")"""
+    canonical: str
+    cased: Optional[Tuple[str, ...]] = None  # Phải khớp đúng chữ hoa/thường
+    near: FrozenSet[str] = frozenset()  # Phải đứng liền trước/sau một trong các kỹ năng này
+
+class SkillMatcher:
+    """
+    Tìm kỹ năng bằng chỉ mục n-gram token
+
+    Mỗi kỹ năng được tách token giống như văn bản, và chỉ mục ánh xạ bộ
+    token -> tên chuẩn. Khi dò, mỗi vị trí chỉ tra cứu tối đa ``max_tokens``
+    khóa trong dict, nên chi phí không tăng theo kích thước từ điển.
+
+    Cụm từ trùng với từ thông dụng ("ai" là "who" trong tiếng Việt) được
+    thêm kèm điều kiện: chỉ khớp đúng chữ hoa/thường, hoặc chỉ khi đứng
+    cạnh một kỹ năng khác.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.index: Dict[Tuple[str, ...], Union[str, _Rule]] = {}
+        self.max_tokens = 0
+        for skill in skills:
+            self.add(skill, skill)
+
+    def add(self, phrase: str, canonical: str, cased: bool = False, near: Iterable[str] = ()) -> None:
+        key = tuple(tokenize(phrase))
+        if key:
+            near = frozenset(near)
+            value = _Rule(canonical, tuple(tokenize(phrase, lower=False)) if cased else None, near) \
+                if cased or near else canonical
+            self.index.setdefault(key, value)
+            self.max_tokens = max(self.max_tokens, len(key))
+
+    def lookup(self, phrase: str) -> Optional[str]:
+        """Tên chuẩn của một cụm từ (tên hoặc bí danh), nếu có"""
+        value = self.index.get(tuple(tokenize(phrase)))
+        if value is None or value.__class__ is str:
+            return value
+        if value.near or value.cased != tuple(tokenize(phrase, lower=False)):
+            return None
+        return value.canonical
+
+    def find(self, tokens: List[str], cased_tokens: Optional[List[str]] = None) -> List[str]:
+        """
+        Các kỹ năng xuất hiện trong dãy token, theo thứ tự gặp, ưu tiên cụm dài nhất
+
+        ``cased_tokens`` là cùng dãy token nhưng giữ nguyên chữ hoa/thường;
+        thiếu nó thì các cụm từ phân biệt hoa/thường không bao giờ khớp.
+        """
+        max_tokens = self.max_tokens
+        index = self.index
+        found = []  # (vị trí đầu, vị trí cuối, tên chuẩn, điều kiện cạnh)
+        conditional = False
+        i, n = 0, len(tokens)
+        while i < n:
+            for length in range(min(max_tokens, n - i), 0, -1):
+                value = index.get(tuple(tokens[i:i + length]))
+                if value is None:
+                    continue
+                if value.__class__ is str:
+                    found.append((i, i + length, value, None))
+                elif value.cased is not None and (cased_tokens is None
+                                                  or tuple(cased_tokens[i:i + length]) != value.cased):
+                    continue
+                else:
+                    found.append((i, i + length, value.canonical, value.near or None))
+                    conditional = conditional or bool(value.near)
+                i += length
+                break
+            else:
+                i += 1
+        if not conditional:
+            return [match[2] for match in found]
+        skills = []
+        for k, (start, end, canonical, near) in enumerate(found):
+            if near is not None and not (
+                    (k > 0 and found[k - 1][1] == start and found[k - 1][2] in near)
+                    or (k + 1 < len(found) and found[k + 1][0] == end and found[k + 1][2] in near)):
+                continue
+            skills.append(canonical)
+        return skills
+
+@dataclass
+class SkillEntry:
+    """Một kỹ năng chuẩn và các bí danh của nó"""
+    name: str
+    category: Optional[str] = None
+    aliases: List[str] = field(default_factory=list)
+    cased_aliases: List[str] = field(default_factory=list)  # Chỉ khớp đúng chữ hoa/thường ("AI")
+    context: List[str] = field(default_factory=list)  # Tên chỉ khớp khi đứng cạnh các kỹ năng này
+
+class SkillTaxonomy:
+    """Danh mục kỹ năng đã biên dịch thành chỉ mục tra cứu trong bộ nhớ"""
+
+    def __init__(self, entries: Iterable[SkillEntry], source: Optional[str] = None,
+                 mtime: Optional[float] = None, checksum: str = ''):
+        self.entries: Dict[str, SkillEntry] = {}
+        self.matcher = SkillMatcher()
+        self.source = source
+        self.mtime = mtime
+        self.checksum = checksum
+        self.loaded_at = time.time()
+        for entry in entries:
+            self.entries.setdefault(entry.name, entry)
+            phrases = [(entry.name, False, entry.context)] + [(alias, False, ()) for alias in entry.aliases] \
+                + [(alias, True, ()) for alias in entry.cased_aliases]
+            for phrase, cased, near in phrases:
+                self.matcher.add(phrase, entry.name, cased, near)
+                # CV gõ không dấu vẫn khớp được kỹ năng tiếng Việt
+                folded = fold_diacritics(phrase)
+                if folded != phrase:
+                    self.matcher.add(folded, entry.name, cased, near)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def canonical(self, phrase: str) -> Optional[str]:
+        return self.matcher.lookup(phrase)
+
+    def category(self, name: str) -> Optional[str]:
+        entry = self.entries.get(name)
+        return entry.category if entry else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'source': self.source,
+            'skills': len(self.entries),
+            'phrases': len(self.matcher.index),
+            'checksum': self.checksum,
+            'loaded_at': self.loaded_at
+        }
+
+def _read_entries(path: str, raw: bytes) -> List[SkillEntry]:
+    text = raw.decode('utf-8-sig')
+    if path.lower().endswith('.csv'):
+        # Cột: name, category, aliases, cased_aliases, context (các giá trị cách nhau bởi '|')
+        def split(value):
+            return [a.strip() for a in (value or '').split('|') if a.strip()]
+
+        rows = csv.DictReader(text.splitlines())
+        return [SkillEntry(name=row['name'].strip(),
+                           category=(row.get('category') or '').strip() or None,
+                           aliases=split(row.get('aliases')),
+                           cased_aliases=split(row.get('cased_aliases')),
+                           context=split(row.get('context')))
+                for row in rows if (row.get('name') or '').strip()]
+
+    data = json.loads(text)
+    items = data['skills'] if isinstance(data, dict) else data
+    return [SkillEntry(name=item['name'], category=item.get('category'), aliases=list(item.get('aliases', [])),
+                       cased_aliases=list(item.get('cased_aliases', [])), context=list(item.get('context', [])))
+            for item in items]
+
+def load_taxonomy(path: str) -> SkillTaxonomy:
+    """Đọc file danh mục kỹ năng (JSON hoặc CSV) và biên dịch chỉ mục"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    mtime = os.path.getmtime(path)
+    started = time.perf_counter()
+    taxonomy = SkillTaxonomy(_read_entries(path, raw), source=path, mtime=mtime,
+                             checksum=hashlib.sha256(raw).hexdigest())
+    logger.info(f"Đã nạp {len(taxonomy)} kỹ năng từ {path} trong {time.perf_counter() - started:.3f}s")
+    return taxonomy
+
+_current: Optional[SkillTaxonomy] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    Danh mục kỹ năng hiện hành của tiến trình
+
+    Cứ mỗi SKILL_TAXONOMY_CHECK_INTERVAL giây, mtime của file được kiểm tra
+    và danh mục được nạp lại nếu file đã đổi, nên mọi gunicorn worker tự cập
+    nhật mà không cần khởi động lại.
+    """
+    global _last_check
+    now = time.monotonic()
+    if _current is not None and now - _last_check < Config.SKILL_TAXONOMY_CHECK_INTERVAL:
+        return _current
+    with _lock:
+        if _current is None or now - _last_check >= Config.SKILL_TAXONOMY_CHECK_INTERVAL:
+            _last_check = now
+            path = Config.SKILL_TAXONOMY_PATH
+            try:
+                changed = _current is None or _current.source != path or os.path.getmtime(path) != _current.mtime
+            except OSError as e:
+                logger.error(f"Không đọc được danh mục kỹ năng {path}: {str(e)}")
+                changed = _current is None
+            if changed:
+                _reload_locked(path)
+    return _current
+
+def reload_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """
+    Nạp lại danh mục ngay lập tức
+
+    Khác với lần kiểm tra mtime định kỳ, lỗi của file mới được ném ra cho
+    người gọi (bản cũ vẫn được giữ), để người vận hành biết việc nạp thất bại.
+    """
+    global _last_check
+    with _lock:
+        _last_check = time.monotonic()
+        _reload_locked(path or Config.SKILL_TAXONOMY_PATH, strict=True)
+    return _current
+
+def _reload_locked(path: str, strict: bool = False) -> None:
+    global _current
+    try:
+        _current = load_taxonomy(path)
+    except Exception as e:
+        if strict or _current is None:
+            raise
+        logger.error(f"Lỗi khi nạp lại danh mục kỹ năng, giữ bản hiện tại: {str(e)}")
@@ -0,0 +1,174 @@
+import queue
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+from ..config import Config
+from ..extensions import db
+from ..models.candidate import Candidate
+from ..models.parse_job import ParseJob
+
+logger = logging.getLogger(__name__)
+
+STATUS_FIELDS = ('id', 'name', 'status', 'updated_at')
+SUBSCRIPTION_BUFFER = 256  # Events held for a slow watcher before its stream is ended
+
+class Subscription:
+    """One watcher's bounded queue of candidate status events"""
+
+    def __init__(self, notifier: 'StatusNotifier', candidate_ids: Optional[Set[int]]):
+        self.candidate_ids = candidate_ids  # None watches every candidate
+        self.overflowed = False
+        self._events = queue.Queue(maxsize=SUBSCRIPTION_BUFFER)
+        self._notifier = notifier
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def wants(self, candidate_id: int) -> bool:
+        return self.candidate_ids is None or candidate_id in self.candidate_ids
+
+    def put(self, event: Dict) -> None:
+        try:
+            self._events.put_nowait(event)
+        except queue.Full:
+            # The client reconnects and starts from a fresh snapshot
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[Dict]:
+        """Next event, or None if nothing arrived within timeout seconds"""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._notifier.unsubscribe(self)
+
+class StatusNotifier:
+    """
+    Fans candidate status changes out to every watcher in this process
+
+    A single thread looks for candidates whose updated_at moved, at most
+    once per STATUS_POLL_INTERVAL and only while someone is watching, so
+    any number of open tabs costs one small query per interval. Commits
+    made in this process (ingest workers, ranking) call notify() to wake
+    it at once; changes committed by other gunicorn processes arrive on
+    the next poll. Rows are re-read over a short STATUS_LOOKBACK window so
+    a transaction that commits late is not skipped.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.Lock()
+        self._subscriptions: Set[Subscription] = set()
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._watermark: Optional[datetime] = None
+        self._started_at: Optional[datetime] = None
+        self._seen: Dict[int, datetime] = {}
+
+    def init_app(self, app) -> None:
+        self.app = app
+        app.extensions['status_notifier'] = self
+
+    def subscribe(self, candidate_ids: Optional[Iterable[int]] = None) -> Subscription:
+        """Watch the given candidates, or every candidate when None"""
+        subscription = Subscription(self, set(candidate_ids) if candidate_ids is not None else None)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if self._thread is None:
+                self._watermark = None
+                self._started_at = datetime.utcnow()
+                self._seen.clear()
+                self._thread = threading.Thread(target=self._run, name='status-notifier', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def notify(self) -> None:
+        """Check for changes now instead of at the next poll"""
+        self._wakeup.set()
+
+    def watcher_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def snapshot(self, candidate_ids: Iterable[int]) -> List[Dict]:
+        """Current status events for the given candidates (requires an app context)"""
+        candidates = (Candidate.query
+                      .options(load_only(*[getattr(Candidate, f) for f in STATUS_FIELDS]))
+                      .filter(Candidate.id.in_(list(candidate_ids)))
+                      .all())
+        return self._events(candidates)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    # Nobody is watching: stop polling until the next subscribe
+                    self._thread = None
+                    return
+            try:
+                with self.app.app_context():
+                    self._poll()
+            except Exception as e:
+                logger.error(f"Status notifier error: {str(e)}")
+            self._wakeup.wait(Config.STATUS_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def _poll(self) -> None:
+        starting = self._watermark is None
+        if starting:
+            self._watermark = db.session.query(func.max(Candidate.updated_at)).scalar() or datetime.utcnow()
+        since = self._watermark - timedelta(seconds=Config.STATUS_LOOKBACK)
+        changed = (Candidate.query
+                   .options(load_only(*[getattr(Candidate, f) for f in STATUS_FIELDS]))
+                   .filter(Candidate.updated_at >= since)
+                   .order_by(Candidate.updated_at, Candidate.id)
+                   .all())
+        self._seen = {cid: seen for cid, seen in self._seen.items() if seen >= since}
+        fresh = [c for c in changed if self._seen.get(c.id) != c.updated_at]
+        for candidate in fresh:
+            self._seen[candidate.id] = candidate.updated_at
+        if starting:
+            # Watchers get a snapshot when they connect; only later changes are pushed
+            fresh = [c for c in fresh if c.updated_at >= self._started_at]
+        if not fresh:
+            return
+        self._watermark = max(self._watermark, fresh[-1].updated_at)
+        events = self._events(fresh)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for event in events:
+            for subscription in subscriptions:
+                if subscription.wants(event['id']):
+                    subscription.put(event)
+
+    @staticmethod
+    def _events(candidates: List[Candidate]) -> List[Dict]:
+        failed = [c.id for c in candidates if c.status == 'failed']
+        errors = {}
+        if failed:
+            # Latest parse error per failed candidate
+            for candidate_id, error in (db.session.query(ParseJob.candidate_id, ParseJob.error)
+                                        .filter(ParseJob.candidate_id.in_(failed))
+                                        .order_by(ParseJob.id)):
+                errors[candidate_id] = error
+        events = []
+        for candidate in candidates:
+            event = candidate.to_dict(STATUS_FIELDS)
+            if candidate.id in errors:
+                event['error'] = errors[candidate.id]
+            events.append(event)
+        return events
+
+status_notifier = StatusNotifier()
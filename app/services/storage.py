@@ -0,0 +1,187 @@
+import os
+import re
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+ADDRESS_RE = re.compile(r'^([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{60})\.([a-z0-9]{1,10})$')
+EXTENSION_RE = re.compile(r'[^a-z0-9]')
+
+class StorageLimitError(ValueError):
+    """An upload is larger than allowed"""
+
+class StoredFile(NamedTuple):
+    address: str  # ab/cd/<sha256>.<ext>, what Candidate.resume_path stores
+    digest: str
+    size: int
+    created: bool  # False when identical bytes were already stored
+
+def content_address(digest: str, extension: str) -> str:
+    """Sharded address for a SHA-256 hex digest: ab/cd/abcd....<ext>"""
+    extension = EXTENSION_RE.sub('', extension.lower().lstrip('.'))[:10] or 'bin'
+    return f'{digest[:2]}/{digest[2:4]}/{digest}.{extension}'
+
+def is_address(path: Optional[str]) -> bool:
+    return bool(path and ADDRESS_RE.match(path))
+
+def address_digest(address: str) -> str:
+    """The SHA-256 a content address was derived from"""
+    match = ADDRESS_RE.match(address)
+    if match is None:
+        raise ValueError(f"Not a content address: {address}")
+    return match.group(3)
+
+class StorageBackend(ABC):
+    """
+    Content-addressed blob storage for uploaded resumes
+
+    Backends only need to store and return bytes by address; parsers work
+    on local files, so the default local_path spools a blob to a temporary
+    file that is deleted when the block ends. The local filesystem backend
+    overrides it to yield its own path.
+    """
+
+    @abstractmethod
+    def save(self, stream: BinaryIO, extension: str, limit: Optional[int] = None) -> StoredFile:
+        """Store a stream, hashing it while it is written, and return its address"""
+
+    @abstractmethod
+    def open(self, address: str) -> BinaryIO:
+        """Open a stored blob for binary reading"""
+
+    @abstractmethod
+    def exists(self, address: str) -> bool:
+        """Whether a blob is stored under address"""
+
+    @abstractmethod
+    def delete(self, address: str) -> None:
+        """Remove a blob; identical uploads share it, so callers must know it is unreferenced"""
+
+    @contextmanager
+    def local_path(self, address: str) -> Iterator[str]:
+        """Filesystem path holding the blob's bytes while the block runs"""
+        # Parsers pick a backend by extension, so the copy keeps it
+        fd, path = tempfile.mkstemp(prefix='resume-', suffix='.' + address.rsplit('.', 1)[-1])
+        try:
+            with os.fdopen(fd, 'wb') as target, self.open(address) as source:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+            yield path
+        finally:
+            os.remove(path)
+
+class LocalStorage(StorageBackend):
+    """
+    Blobs under a root directory, sharded two levels deep by hash prefix
+
+    Uploads are streamed into a temporary file on the same filesystem
+    while their SHA-256 is computed, then renamed into place, so a blob is
+    either complete or absent and identical bytes are stored once.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._tmp_dir = os.path.join(self.root, '.tmp')
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+    def _path(self, address: str) -> str:
+        if not is_address(address):
+            raise ValueError(f"Not a content address: {address}")
+        return os.path.join(self.root, *address.split('/'))
+
+    def save(self, stream: BinaryIO, extension: str, limit: Optional[int] = None) -> StoredFile:
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    size += len(chunk)
+                    if limit is not None and size > limit:
+                        raise StorageLimitError(f"File is larger than {limit} bytes")
+                    sha.update(chunk)
+                    target.write(chunk)
+                target.flush()
+                os.fsync(target.fileno())
+            digest = sha.hexdigest()
+            address = content_address(digest, extension)
+            path = self._path(address)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                return StoredFile(address, digest, size, False)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            return StoredFile(address, digest, size, True)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, address: str) -> BinaryIO:
+        return open(self._path(address), 'rb')
+
+    def exists(self, address: str) -> bool:
+        return os.path.exists(self._path(address))
+
+    def delete(self, address: str) -> None:
+        try:
+            os.remove(self._path(address))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def local_path(self, address: str) -> Iterator[str]:
+        yield self._path(address)
+
+BACKENDS = {
+    'local': lambda: LocalStorage(Config.UPLOAD_FOLDER),
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> StorageBackend:
+    """Process-wide storage backend selected by STORAGE_BACKEND"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if Config.STORAGE_BACKEND not in BACKENDS:
+                raise ValueError(f"Unknown STORAGE_BACKEND: {Config.STORAGE_BACKEND}")
+            _storage = BACKENDS[Config.STORAGE_BACKEND]()
+        return _storage
+
+@contextmanager
+def resolve(resume_path: Optional[str]) -> Iterator[Optional[str]]:
+    """
+    Local file for a stored resume while the block runs, or None if it is gone
+
+    Accepts content addresses as well as the plain paths older rows hold.
+    """
+    if is_address(resume_path) and get_storage().exists(resume_path):
+        with get_storage().local_path(resume_path) as path:
+            yield path
+    elif resume_path and not is_address(resume_path) and os.path.exists(resume_path):
+        yield resume_path
+    else:
+        yield None
+
+def digest_of(resume_path: Optional[str]) -> Optional[str]:
+    """
+    SHA-256 of a stored resume, or None if it is gone
+
+    Content addresses carry the digest, so only older plain paths are rehashed.
+    """
+    if is_address(resume_path):
+        return address_digest(resume_path)
+    if not resume_path or not os.path.exists(resume_path):
+        return None
+    from .parse_cache import file_digest
+    return file_digest(resume_path)
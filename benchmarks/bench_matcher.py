@@ -0,0 +1,103 @@
+"""Benchmark the local candidate matcher on a large synthetic candidate set.
+
+Builds N synthetic candidates from the skill taxonomy, indexes them in a
+CandidateMatcher and times ranking job descriptions against all of them.
+With --db the candidates are seeded into a throwaway SQLite database and
+loaded through the same incremental sync the web app uses.
+
+    python benchmarks/bench_matcher.py --candidates 100000 --max-ms 1000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = ('phát triển hệ thống backend frontend dữ liệu quản lý dự án nhóm khách hàng '
+         'ngân hàng thương mại điện tử microservices api hiệu năng bảo mật kiểm thử '
+         'senior junior lead engineer developer analyst university bachelor master '
+         'đại học bách khoa kinh tế công nghệ thông tin years experience team agile').split()
+
+JOBS = [
+    'Senior Python backend engineer: Django, PostgreSQL, Docker, Kubernetes, AWS, microservices',
+    'Lập trình viên Java Spring Boot, có kinh nghiệm ngân hàng, MySQL, Kafka',
+    'Frontend developer React TypeScript, HTML/CSS, REST APIs, agile team',
+    'Data engineer: Spark, Airflow, SQL, Python, data warehouse',
+]
+
+def synthetic_candidates(count: int, rng: random.Random):
+    from app.services.skill_taxonomy import get_taxonomy
+
+    names = list(get_taxonomy().entries)
+    weights = [1.0 / (rank + 1) for rank in range(len(names))]
+    for candidate_id in range(1, count + 1):
+        skills = list(dict.fromkeys(rng.choices(names, weights=weights, k=rng.randint(3, 12))))
+        experience = ' '.join(rng.choices(WORDS, k=rng.randint(20, 80)) + rng.sample(skills, min(3, len(skills))))
+        education = ' '.join(rng.choices(WORDS, k=rng.randint(4, 12)))
+        yield candidate_id, skills, education, experience
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--db', action='store_true', help='Load candidates through the database sync path')
+    parser.add_argument('--max-ms', type=float, help='Exit non-zero if any ranking median exceeds this')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_matcher_')
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(workdir, 'bench.db'))
+
+    from app import create_app
+    from app.extensions import db
+    from app.models.candidate import Candidate
+    from app.services.matcher import CandidateMatcher
+
+    app = create_app()
+    with app.app_context():
+        matcher = CandidateMatcher()
+        rng = random.Random(7)
+        started = time.perf_counter()
+        if args.db:
+            rows = [{'id': cid, 'name': f'Candidate {cid}', 'status': 'parsed', 'education': education,
+                     'experience': experience, 'skills': json.dumps(skills, ensure_ascii=False)}
+                    for cid, skills, education, experience in synthetic_candidates(args.candidates, rng)]
+            for i in range(0, len(rows), 5000):
+                db.session.execute(Candidate.__table__.insert(), rows[i:i + 5000])
+            db.session.commit()
+            print(f"seeded {args.candidates} candidates in {time.perf_counter() - started:.1f}s")
+            started = time.perf_counter()
+            matcher.sync(force=True)
+        else:
+            for cid, skills, education, experience in synthetic_candidates(args.candidates, rng):
+                matcher.add(cid, skills, education, experience)
+        print(f"indexed {len(matcher)} candidates in {time.perf_counter() - started:.1f}s "
+              f"({matcher._nnz} stored entries)")
+
+        started = time.perf_counter()
+        for cid, skills, education, experience in synthetic_candidates(100, random.Random(8)):
+            matcher.add(args.candidates + cid, skills, education, experience)
+        print(f"incremental add: {(time.perf_counter() - started) * 10:.2f} ms/candidate")
+
+        worst = 0.0
+        for job in JOBS:
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                top = matcher.rank(job, args.limit)
+                samples.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(samples)
+            worst = max(worst, median)
+            print(f"{median:8.2f} ms  best {top[0][1]:.3f}  {job[:60]}")
+
+    if args.max_ms is not None and worst > args.max_ms:
+        print(f"FAIL: slowest ranking {worst:.2f}ms > {args.max_ms}ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
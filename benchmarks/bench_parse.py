@@ -0,0 +1,202 @@
+"""Benchmark resume parsing end to end and per extractor on a synthetic corpus.
+
+Generates (or reuses) a corpus with resume_corpus.py, then for every file
+times parse_resume() cold, text extraction alone, and each extract_*
+function of resume_parser on the extracted text. Reports throughput and
+p50/p95/p99 latency per file kind plus field accuracy against the
+manifest, and writes everything with the commit to a JSON file so runs
+on different commits can be compared.
+
+    python benchmarks/bench_parse.py --count 2000 --json results/$(git rev-parse --short HEAD).json
+    python benchmarks/bench_parse.py --count 2000 --compare results/abc1234.json
+
+Scanned PDFs need Tesseract and Poppler; without them they are reported
+as errors, or leave them out with --kinds text_pdf,long_pdf,docx.
+"""
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_corpus import KINDS, generate, parse_kinds
+
+FIELD_EXTRACTORS = ('extract_name', 'extract_email', 'extract_phone', 'extract_skills',
+                    'extract_education', 'extract_experience')
+
+def percentile(sorted_samples, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return None
+    index = max(0, min(len(sorted_samples) - 1, math.ceil(q / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+def summarize(samples, errors=0, pages=None):
+    """Latency percentiles in ms and throughput for one series of seconds"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    stats = {'count': len(ordered), 'errors': errors, 'total_s': round(total, 4),
+             'per_second': round(len(ordered) / total, 2) if total else None}
+    for q in (50, 95, 99):
+        value = percentile(ordered, q)
+        stats[f'p{q}_ms'] = round(value * 1000, 3) if value is not None else None
+    stats['max_ms'] = round(ordered[-1] * 1000, 3) if ordered else None
+    if pages:
+        stats['pages_per_second'] = round(pages / total, 2) if total else None
+    return stats
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+def field_matches(parsed, expected):
+    from app.services.skill_search import normalize_skill
+
+    found_skills = {normalize_skill(skill) for skill in json.loads(parsed.get('skills') or '[]')}
+    expected_skills = {normalize_skill(skill) for skill in expected['skills']}
+    return {
+        'name': (parsed.get('name') or '').casefold() == expected['name'].casefold(),
+        'email': parsed.get('email') == expected['email'],
+        'phone': parsed.get('phone') == expected['phone'],
+        'skills': len(found_skills & expected_skills) / len(expected_skills),  # Recall
+    }
+
+def run(manifest, corpus_dir, limit=None):
+    from app.services import resume_parser
+    from app.services.parser.registry import Document
+
+    timings = defaultdict(list)  # series name -> seconds
+    errors = defaultdict(int)
+    pages = defaultdict(int)
+    accuracy = defaultdict(list)
+    files = manifest['files'][:limit] if limit else manifest['files']
+    started = time.perf_counter()
+    for number, entry in enumerate(files, 1):
+        path = os.path.join(corpus_dir, entry['file'])
+        kind = entry['kind']
+
+        # End to end, as an ingest worker runs it; the document cache is off so nothing is reused
+        try:
+            t0 = time.perf_counter()
+            parsed = resume_parser.parse_resume(path)
+            elapsed = time.perf_counter() - t0
+        except Exception:
+            errors[f'parse_resume/{kind}'] += 1
+            errors['parse_resume/all'] += 1
+            continue
+        for series in (f'parse_resume/{kind}', 'parse_resume/all'):
+            timings[series].append(elapsed)
+            pages[series] += entry['pages']
+        for field, score in field_matches(parsed, entry['expected']).items():
+            accuracy[f'{field}/{kind}'].append(score)
+            accuracy[f'{field}/all'].append(score)
+
+        # Text extraction alone, by the backend that produced most pages
+        t0 = time.perf_counter()
+        document = Document(path)
+        text = document.text
+        timings[f'extract_text/{kind}'].append(time.perf_counter() - t0)
+        timings[f'extract_text/backend={document.backend}'].append(time.perf_counter() - t0)
+
+        for name in FIELD_EXTRACTORS:
+            extractor = getattr(resume_parser, name)
+            # The name/skills/education/experience shims share one memoized pass; time each cold
+            resume_parser._cached_fields.cache_clear()
+            t0 = time.perf_counter()
+            extractor(text)
+            timings[f'{name}/all'].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        resume_parser.parse_text(text)
+        timings['parse_text/all'].append(time.perf_counter() - t0)
+
+        if number % 200 == 0:
+            print(f"  {number}/{len(files)} files, {time.perf_counter() - started:.0f}s", file=sys.stderr)
+
+    series = {name: summarize(timings.get(name, []), errors.get(name, 0), pages.get(name))
+              for name in sorted(set(timings) | set(errors))}
+    scores = {name: round(sum(values) / len(values), 4) for name, values in sorted(accuracy.items())}
+    return series, scores, time.perf_counter() - started
+
+def print_report(series, scores, previous=None):
+    print(f"{'series':38} {'n':>6} {'err':>4} {'files/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in series.items():
+        line = (f"{name:38} {stats['count']:6} {stats['errors']:4} {stats['per_second'] or 0:9.1f} "
+                f"{stats['p50_ms'] or 0:9.3f} {stats['p95_ms'] or 0:9.3f} {stats['p99_ms'] or 0:9.3f}")
+        old = (previous or {}).get('series', {}).get(name)
+        if old and old.get('p50_ms') and stats['p50_ms']:
+            line += f"  p50 {100 * (stats['p50_ms'] / old['p50_ms'] - 1):+6.1f}%"
+            line += f"  p95 {100 * (stats['p95_ms'] / old['p95_ms'] - 1):+6.1f}%" if old.get('p95_ms') else ''
+        print(line)
+    print()
+    print("field accuracy (skills: recall)")
+    for name, score in scores.items():
+        old = (previous or {}).get('accuracy', {}).get(name)
+        delta = f"  {100 * (score - old):+.1f} pts" if old is not None else ''
+        print(f"  {name:28} {100 * score:6.1f}%{delta}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='Corpus directory (default: a cached one in the temp dir)')
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--kinds', type=parse_kinds, help=f"Kinds and weights, default {KINDS}")
+    parser.add_argument('--font', help='TrueType font with Vietnamese glyphs for the generated PDFs')
+    parser.add_argument('--limit', type=int, help='Only parse the first N files')
+    parser.add_argument('--json', help='Write results to this path')
+    parser.add_argument('--compare', help='Earlier results JSON to print deltas against')
+    parser.add_argument('--verbose', action='store_true', help='Show the application log')
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or os.path.join(tempfile.gettempdir(), f'hr_resume_corpus_{args.seed}_{args.count}')
+    started = time.perf_counter()
+    manifest = generate(corpus_dir, args.count, args.seed, args.kinds, args.font)
+    print(f"corpus: {corpus_dir} ({len(manifest['files'])} files, ready in {time.perf_counter() - started:.1f}s)")
+
+    # Every parse extracts from scratch; the parse cache is never consulted by parse_resume
+    os.environ['PARSER_DOCUMENT_CACHE'] = '0'
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    from app.config import Config
+
+    series, scores, wall = run(manifest, corpus_dir, args.limit)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"comparing with {previous.get('commit', '?')[:12]} ({args.compare})")
+    print_report(series, scores, previous)
+
+    commit, dirty = git_commit()
+    print(f"\n{wall:.1f}s wall, commit {commit[:12] if commit else 'unknown'}{' (dirty)' if dirty else ''}")
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        results = {
+            'commit': commit, 'dirty': dirty, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'config': {'pdf_backends': Config.PARSER_PDF_BACKENDS, 'docx_backends': Config.PARSER_DOCX_BACKENDS,
+                       'ocr_lang': Config.OCR_LANG, 'ocr_dpi': Config.OCR_DPI},
+            'corpus': {key: manifest[key] for key in ('generator_version', 'seed', 'count', 'kinds', 'font')},
+            'limit': args.limit, 'wall_s': round(wall, 2), 'series': series, 'accuracy': scores,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"results: {args.json}")
+
+if __name__ == '__main__':
+    main()
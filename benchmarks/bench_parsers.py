@@ -0,0 +1,80 @@
+"""Compare resume text extraction backends on a corpus of PDF and DOCX files.
+
+Every registered backend for a file's sniffed format is timed on every
+file, along with whether its text passed the usability check. The summary
+suggests an order for PARSER_PDF_BACKENDS / PARSER_DOCX_BACKENDS: usable
+backends fastest first.
+
+    python benchmarks/bench_parsers.py sample_resumes --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def corpus_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', default=[os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_resumes')])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='Write per-file results to this path')
+    args = parser.parse_args()
+
+    from app.services.parser.registry import backends, is_usable, sniff, text_quality
+
+    rows = []
+    for file_path in corpus_files(args.paths):
+        file_format = sniff(file_path)
+        if file_format is None:
+            continue
+        for backend in backends(file_format):
+            samples = []
+            try:
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    pages = [page or '' for page in backend.extract(file_path)]
+                    samples.append((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                rows.append({'file': file_path, 'format': file_format, 'backend': backend.name, 'error': str(e)})
+                print(f"{backend.name:12} {'error':>10}  {os.path.basename(file_path)}: {e}")
+                continue
+            chars_per_page, garbage = text_quality(pages)
+            row = {'file': file_path, 'format': file_format, 'backend': backend.name,
+                   'median_ms': statistics.median(samples), 'pages': len(pages),
+                   'chars_per_page': chars_per_page, 'garbage': round(garbage, 4), 'usable': is_usable(pages)}
+            rows.append(row)
+            print(f"{backend.name:12} {row['median_ms']:8.2f} ms  {len(pages):3} pages  "
+                  f"{chars_per_page:6} chars/page  garbage {garbage:.3f}  "
+                  f"{'usable' if row['usable'] else 'UNUSABLE'}  {os.path.basename(file_path)}")
+
+    summary = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        if 'error' not in row and row['usable']:
+            summary[row['format']][row['backend']].append(row['median_ms'])
+    print()
+    for file_format, by_backend in summary.items():
+        order = sorted(by_backend, key=lambda name: statistics.median(by_backend[name]))
+        for name in order:
+            times = by_backend[name]
+            print(f"{file_format:5} {name:12} median {statistics.median(times):8.2f} ms over {len(times)} usable files")
+        print(f"PARSER_{file_format.upper()}_BACKENDS={','.join(order)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark indexed skill search over a large synthetic candidate table.
+
+Seeds a throwaway SQLite database (or DATABASE_URL if given) with N
+candidates and their candidate_skills rows, then times AND/OR skill
+filters through the same query path as GET /api/candidates.
+
+    python benchmarks/bench_skill_search.py --candidates 100000 --max-ms 100
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    {'skills_all': 'Python,Docker'},
+    {'skills_all': 'Java,Spring Boot,Kubernetes'},
+    {'skills_any': 'Golang,Rust'},
+    {'skills_all': 'React', 'skills_any': 'TypeScript,JavaScript', 'status': 'parsed'},
+    {'skills_all': 'k8s'},
+]
+
+def seed(count: int, rng: random.Random) -> None:
+    from app.extensions import db
+    from app.models.candidate import Candidate
+    from app.models.candidate_skill import CandidateSkill
+    from app.services.skill_search import normalize_skill
+    from app.services.skill_taxonomy import get_taxonomy
+
+    names = list(get_taxonomy().entries)
+    weights = [1.0 / (rank + 1) for rank in range(len(names))]  # A few skills are very common
+    batch = 5000
+    for start in range(0, count, batch):
+        candidates, links = [], []
+        for candidate_id in range(start + 1, min(start + batch, count) + 1):
+            skills = list(dict.fromkeys(rng.choices(names, weights=weights, k=rng.randint(3, 12))))
+            candidates.append({'id': candidate_id, 'name': f'Candidate {candidate_id}',
+                               'skills': json.dumps(skills, ensure_ascii=False),
+                               'status': rng.choice(['parsed', 'parsed', 'parsed', 'failed'])})
+            links.extend({'candidate_id': candidate_id, 'skill': normalize_skill(s)} for s in skills)
+        db.session.execute(Candidate.__table__.insert(), candidates)
+        db.session.execute(CandidateSkill.__table__.insert(), links)
+        db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, help='Exit non-zero if any query median exceeds this')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_skill_search_')
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(workdir, 'bench.db'))
+
+    from app import create_app
+    from app.services.candidate_query import list_candidates
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        seed(args.candidates, random.Random(7))
+        print(f"seeded {args.candidates} candidates in {time.perf_counter() - started:.1f}s")
+
+        worst = 0.0
+        for params in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                page = list_candidates(params)
+                samples.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(samples)
+            worst = max(worst, median)
+            print(f"{median:8.2f} ms  {len(page['candidates']):3d} rows  {params}")
+
+    if args.max_ms is not None and worst > args.max_ms:
+        print(f"FAIL: slowest query {worst:.2f}ms > {args.max_ms}ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
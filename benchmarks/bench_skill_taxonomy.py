@@ -0,0 +1,79 @@
+"""Benchmark skill matching as the taxonomy grows.
+
+Builds synthetic taxonomies of increasing size on top of the shipped
+app/data/skills.json and times compiling the index and matching resume
+text against it. For comparison it also times the original approach of
+one regex search per skill.
+
+    python benchmarks/bench_skill_taxonomy.py
+    python benchmarks/bench_skill_taxonomy.py --sizes 1000 10000 50000 --max-match-ms 5
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.services.skill_taxonomy import SkillEntry, SkillTaxonomy, load_taxonomy, tokenize
+
+SAMPLE_RESUME = os.path.join(Config.BASE_DIR, 'sample_resumes', 'nguyen_van_a_cv.txt')
+SYLLABLES = ['da', 'ta', 'ko', 'mi', 'ren', 'lo', 'vex', 'qui', 'zor', 'pan', 'tel', 'gro', 'nu', 'sa', 'bel']
+
+def synthetic_entries(count: int, rng: random.Random):
+    """Plausible-looking skill names with one or two aliases each"""
+    for i in range(count):
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words).title() + f' {i}'
+        yield SkillEntry(name=name, category='synthetic', aliases=[f'{words[0]}{i}', f'{name} framework'])
+
+def time_it(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--naive-limit', type=int, default=10000,
+                        help='Skip the per-skill regex baseline above this many skills')
+    parser.add_argument('--max-match-ms', type=float,
+                        help='Exit non-zero if matching at the largest size exceeds this')
+    args = parser.parse_args()
+
+    with open(SAMPLE_RESUME, encoding='utf-8') as f:
+        text = f.read()
+    tokens = tokenize(text)
+    base = list(load_taxonomy(Config.SKILL_TAXONOMY_PATH).entries.values())
+    rng = random.Random(42)
+
+    print(f"resume: {len(text)} chars, {len(tokens)} tokens")
+    print(f"{'skills':>8} {'phrases':>8} {'build ms':>9} {'match ms':>9} {'regex ms':>9}")
+    match_ms = None
+    for size in args.sizes:
+        entries = base + list(synthetic_entries(size, rng))
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy(entries)
+        build_ms = (time.perf_counter() - started) * 1000
+        match_ms = time_it(lambda: taxonomy.matcher.find(tokenize(text)), args.repeat)
+
+        regex_ms = '-'
+        if len(entries) <= args.naive_limit:
+            patterns = [re.compile(r'\b' + re.escape(e.name) + r'\b', re.IGNORECASE) for e in entries]
+            regex_ms = f"{time_it(lambda: [p.search(text) for p in patterns], max(1, args.repeat // 4)):.2f}"
+        print(f"{len(entries):>8} {len(taxonomy.matcher.index):>8} {build_ms:>9.1f} {match_ms:>9.3f} {regex_ms:>9}")
+
+    if args.max_match_ms is not None and match_ms > args.max_match_ms:
+        print(f"FAIL: matching took {match_ms:.3f}ms > {args.max_match_ms}ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Measure worker boot time and guard against heavy imports creeping back in.
+
+Each run boots the app the way a gunicorn worker does (import app,
+create_app()) in a fresh interpreter under `python -X importtime`. The
+script reports median wall time, the slowest imports, and every heavy
+dependency that was loaded at boot instead of on first use.
+
+    python benchmarks/bench_startup.py --runs 5 --max-ms 1500
+    python benchmarks/bench_startup.py --root /path/to/other/checkout   # compare a baseline
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Loaded on first use only: parsing backends, OCR, NumPy, HTTP and tokenizer libraries
+HEAVY_MODULES = ('PyPDF2', 'docx2txt', 'docx', 'pdfminer', 'pdfplumber', 'PIL', 'pytesseract',
+                 'pdf2image', 'numpy', 'openai', 'requests', 'tiktoken')
+
+BOOT = ("import time; started = time.perf_counter(); "
+        "from app import create_app; create_app(); "
+        "print('BOOT_MS', (time.perf_counter() - started) * 1000)")
+
+def boot_once(root: str, workdir: str):
+    """Boot the app in a fresh interpreter; returns (wall ms, {module: cumulative us})"""
+    env = dict(os.environ,
+               PYTHONPATH=root,
+               DATABASE_URL='sqlite:///' + os.path.join(workdir, 'startup.db'),
+               INGEST_WORKERS='0',
+               RANKING_WORKERS='0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', BOOT], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True)
+    boot_ms = next(float(line.split()[1]) for line in result.stdout.splitlines() if line.startswith('BOOT_MS'))
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = [part.strip() for part in line[len('import time:'):].split('|')]
+        if len(parts) == 3 and parts[1].isdigit():
+            modules[parts[2]] = int(parts[1])
+    return boot_ms, modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help='Checkout to boot (defaults to this one)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+    parser.add_argument('--max-ms', type=float, help='Fail if the median boot takes longer')
+    parser.add_argument('--allow-heavy', action='store_true', help='Report heavy imports without failing')
+    parser.add_argument('--json', help='Write results to this path')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_startup_')
+    boot_once(args.root, workdir)  # Creates the database and warms the OS file cache
+    samples, modules = [], {}
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        boot_ms, modules = boot_once(args.root, workdir)
+        samples.append({'boot_ms': boot_ms, 'process_ms': (time.perf_counter() - started) * 1000})
+
+    boot_ms = statistics.median(s['boot_ms'] for s in samples)
+    process_ms = statistics.median(s['process_ms'] for s in samples)
+    heavy = sorted(name for name in modules if name.split('.')[0] in HEAVY_MODULES and '.' not in name)
+    print(f"create_app: median {boot_ms:.0f} ms, whole interpreter {process_ms:.0f} ms over {args.runs} runs")
+    print("slowest imports (cumulative):")
+    for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    print(f"heavy modules loaded at boot: {', '.join(heavy) or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'root': args.root, 'boot_ms': boot_ms, 'process_ms': process_ms,
+                       'samples': samples, 'heavy_modules': heavy}, f, indent=2)
+
+    failed = False
+    if heavy and not args.allow_heavy:
+        print(f"FAIL: {', '.join(heavy)} should be imported on first use, not at boot")
+        failed = True
+    if args.max_ms is not None and boot_ms > args.max_ms:
+        print(f"FAIL: boot took {boot_ms:.0f}ms > {args.max_ms}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Local fake of the OpenAI chat completions API for tests and load runs.
+
+Replies after a configurable latency and fails a configurable share of
+requests with 429 or 500, so retries, rate limiting and concurrency can be
+exercised without network access or API spend. stream=true replies send
+one word every --token-ms as Server-Sent Events, like the real API. Point the app at it with
+OPENAI_API_BASE=http://127.0.0.1:8089/v1 and any OPENAI_API_KEY.
+
+    python benchmarks/fake_openai.py --port 8089 --latency-ms 800 --error-rate 0.05
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = ('{"matchScore": 72, "strengths": ["Python", "SQL", "Teamwork"], '
+         '"improvements": ["Cloud", "Testing", "English"], '
+         '"assessment": "Solid backend profile. Worth a first interview."}')
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        if self.server.options.get('verbose'):
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            return self._send_json(200, {'object': 'list', 'data': [{'id': 'gpt-3.5-turbo', 'object': 'model'}]})
+        self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+
+    def do_POST(self):
+        options = self.server.options
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with self.server.lock:
+            self.server.requests += 1
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._send_json(401, {'error': {'message': 'Missing API key'}})
+
+        latency = max(0.0, random.gauss(options['latency_ms'], options['jitter_ms'])) / 1000
+        time.sleep(latency)
+        roll = random.random()
+        if roll < options['rate_limit_rate']:
+            return self._send_json(429, {'error': {'message': 'Rate limit reached'}}, {'Retry-After': '0.1'})
+        if roll < options['rate_limit_rate'] + options['error_rate']:
+            return self._send_json(500, {'error': {'message': 'Fake server error'}})
+
+        if body.get('stream'):
+            return self._send_stream(body, options['token_ms'] / 1000)
+
+        prompt_tokens = sum(len(m.get('content') or '') for m in body.get('messages', [])) // 4
+        completion_tokens = len(REPLY) // 4
+        self._send_json(200, {
+            'id': f'chatcmpl-fake{self.server.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-3.5-turbo'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': REPLY}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        })
+
+    def _send_stream(self, body, token_delay):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        base = {'id': f'chatcmpl-fake{self.server.requests}', 'object': 'chat.completion.chunk',
+                'created': int(time.time()), 'model': body.get('model', 'gpt-3.5-turbo')}
+        words = REPLY.split(' ')
+        for i, word in enumerate(words):
+            content = word if i == 0 else ' ' + word
+            chunk = dict(base, choices=[{'index': 0, 'delta': {'content': content}, 'finish_reason': None}])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(token_delay)
+        chunk = dict(base, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        if (body.get('stream_options') or {}).get('include_usage'):
+            prompt_tokens = sum(len(m.get('content') or '') for m in body.get('messages', [])) // 4
+            usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': len(REPLY) // 4,
+                     'total_tokens': prompt_tokens + len(REPLY) // 4}
+            self.wfile.write(f"data: {json.dumps(dict(base, choices=[], usage=usage))}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+def start_server(port=0, latency_ms=200.0, jitter_ms=50.0, error_rate=0.0, rate_limit_rate=0.0,
+                 token_ms=30.0, verbose=False):
+    """Start the fake server on a background thread, returning (server, api_base)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.options = {'latency_ms': latency_ms, 'jitter_ms': jitter_ms, 'error_rate': error_rate,
+                      'rate_limit_rate': rate_limit_rate, 'token_ms': token_ms, 'verbose': verbose}
+    server.lock = threading.Lock()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=200.0)
+    parser.add_argument('--jitter-ms', type=float, default=50.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests failing with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests failing with 429')
+    parser.add_argument('--token-ms', type=float, default=30.0, help='Delay between streamed chunks')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server, api_base = start_server(args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                                    args.rate_limit_rate, args.token_ms, args.verbose)
+    print(f"Fake OpenAI API listening on {api_base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+"""Load-test the app under gunicorn against a local fake OpenAI server.
+
+For every --workers / --worker-class combination the script boots gunicorn
+on a fresh database, points it at fake_openai.py with the given latency
+and error rates, and replays a weighted mix of uploads, candidate listing
+(the first page, then a few more by next_cursor), search, candidate detail
+and (streamed) chat from --concurrency client threads for --duration
+seconds. It reports throughput, p50/p95/p99 latency and errors per
+endpoint, plus cache hit counts from /metrics, and can save everything
+with the commit to JSON.
+
+    python benchmarks/load_test.py --workers 2,4,8 --worker-class sync,gthread --concurrency 32
+    python benchmarks/load_test.py --mix upload=1,list=4,chat=1 --openai-latency-ms 1500 --openai-error-rate 0.05
+    python benchmarks/load_test.py --env PARSE_CACHE_ENABLED=false --json results/no-cache.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # an already running server
+
+SQLite serializes writers across workers; pass --database-url to test
+against PostgreSQL the way production runs.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import itertools
+import subprocess
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parse import git_commit, percentile
+from fake_openai import start_server
+from resume_corpus import generate
+
+DEFAULT_MIX = 'upload=2,list=5,search=3,candidate=3,chat=1,chat_stream=1'
+SEARCH_TERMS = ('Python', 'Java', 'React', 'Docker', 'SQL', 'Kubernetes', 'Hà Nội', 'backend', 'AWS')
+CHAT_QUESTIONS = ('Ứng viên này có phù hợp với vị trí Backend Developer không?',
+                  'Tóm tắt điểm mạnh của ứng viên',
+                  'What are the main gaps in this profile?')
+
+class Traffic:
+    """One client thread's view of the app: issues requests and records their outcome"""
+
+    def __init__(self, base_url, uploads, results, lock):
+        import requests
+
+        self.base_url = base_url
+        self.uploads = uploads
+        self.results = results
+        self.lock = lock
+        self.session = requests.Session()
+        self.candidate_ids = []
+        self.rng = random.Random()
+
+    def record(self, endpoint, started, status, extra=None):
+        with self.lock:
+            self.results.append((endpoint, started, time.perf_counter() - started, status, extra))
+
+    def call(self, endpoint, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=120, **kwargs)
+            body = response.content
+        except Exception as e:
+            self.record(endpoint, started, type(e).__name__)
+            return None
+        self.record(endpoint, started, response.status_code)
+        return response.json() if body and response.headers.get('Content-Type', '').startswith('application/json') else None
+
+    def upload(self):
+        name, data = self.rng.choice(self.uploads)
+        body = self.call('upload', 'POST', '/api/upload', files={'resume': (name, data)})
+        if body and body.get('candidate_id'):
+            self.candidate_ids.append(body['candidate_id'])
+
+    def list(self):
+        """First page, then next_cursor for 0-4 more pages, like a user scrolling (reported as list_next)"""
+        endpoint, params = 'list', {'limit': 20}
+        for _ in range(1 + self.rng.randint(0, 4)):
+            body = self.call(endpoint, 'GET', '/api/candidates', params=params) or {}
+            for candidate in body.get('candidates', []):
+                if candidate.get('id') and len(self.candidate_ids) < 1000:
+                    self.candidate_ids.append(candidate['id'])
+            if not body.get('next_cursor'):
+                break
+            endpoint, params = 'list_next', {'limit': 20, 'cursor': body['next_cursor']}
+
+    def search(self):
+        self.call('search', 'GET', '/api/search', params={'q': self.rng.choice(SEARCH_TERMS)})
+
+    def candidate(self):
+        if not self.candidate_ids:
+            return self.list()
+        self.call('candidate', 'GET', f"/api/candidates/{self.rng.choice(self.candidate_ids)}")
+
+    def _chat_body(self):
+        body = {'message': self.rng.choice(CHAT_QUESTIONS)}
+        if self.candidate_ids:
+            body['candidate_id'] = self.rng.choice(self.candidate_ids)
+        return body
+
+    def chat(self):
+        self.call('chat', 'POST', '/api/chat', json=self._chat_body())
+
+    def chat_stream(self):
+        """Streamed chat, also recording time to the first delta"""
+        started = time.perf_counter()
+        first_delta = None
+        status = None
+        try:
+            with self.session.post(self.base_url + '/api/chat', json=dict(self._chat_body(), stream=True),
+                                   stream=True, timeout=120) as response:
+                status = response.status_code
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith('event: delta') and first_delta is None:
+                        first_delta = time.perf_counter() - started
+                    elif line.startswith('event: error'):
+                        status = 'stream_error'
+        except Exception as e:
+            status = type(e).__name__
+        self.record('chat_stream', started, status, {'ttft': first_delta})
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        if not hasattr(Traffic, name) or name.startswith('_') or name in ('record', 'call'):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(base_url, process, timeout=60):
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(base_url + '/health', timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{base_url} did not become healthy within {timeout}s")
+
+def boot(workers, worker_class, threads, api_base, workdir, args):
+    """Start gunicorn from the repo root (so gunicorn.conf.py applies); returns (process, base_url)"""
+    port = free_port()
+    env = dict(os.environ,
+               DATABASE_URL=args.database_url or 'sqlite:///' + os.path.join(workdir, 'load.db'),
+               UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+               OPENAI_API_BASE=api_base,
+               OPENAI_API_KEY='sk-load-test',
+               METRICS_DIR=os.path.join(workdir, 'metrics'))
+    env.pop('PROFILING_ENABLED', None)
+    env.update(args.env)
+    command = [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--worker-class', worker_class,
+               '--bind', f'127.0.0.1:{port}', '--timeout', '120', '--log-level', 'warning']
+    if worker_class == 'gthread':
+        command += ['--threads', str(threads)]
+    command.append('wsgi:application')
+    log = open(os.path.join(workdir, 'gunicorn.log'), 'w')
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_ready(base_url, process)
+    except RuntimeError:
+        process.terminate()
+        with open(log.name) as f:
+            sys.stderr.write(f.read()[-3000:])
+        raise
+    return process, base_url
+
+def drive(base_url, uploads, mix, concurrency, duration, warmup):
+    """Run the traffic mix; returns samples started after the warmup"""
+    results, lock = [], threading.Lock()
+    stop_at = time.perf_counter() + warmup + duration
+    names, weights = list(mix), list(mix.values())
+
+    def client():
+        traffic = Traffic(base_url, uploads, results, lock)
+        while time.perf_counter() < stop_at:
+            getattr(traffic, traffic.rng.choices(names, weights=weights)[0])()
+
+    measure_from = time.perf_counter() + warmup
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [sample for sample in results if sample[1] >= measure_from]
+
+def summarize(samples, duration):
+    """Per-endpoint throughput, latency percentiles and errors"""
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample[0]].append(sample)
+        by_endpoint['all'].append(sample)
+    report = {}
+    for endpoint, rows in sorted(by_endpoint.items()):
+        latencies = sorted(row[2] for row in rows)
+        statuses = Counter(str(row[3]) for row in rows)
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+        stats = {'requests': len(rows), 'per_second': round(len(rows) / duration, 2),
+                 'errors': errors, 'error_rate': round(errors / len(rows), 4), 'statuses': dict(statuses)}
+        for q in (50, 95, 99):
+            stats[f'p{q}_ms'] = round(percentile(latencies, q) * 1000, 1)
+        stats['max_ms'] = round(latencies[-1] * 1000, 1)
+        ttft = sorted(row[4]['ttft'] for row in rows if row[4] and row[4].get('ttft') is not None)
+        if ttft and endpoint != 'all':
+            stats['ttft_p50_ms'] = round(percentile(ttft, 50) * 1000, 1)
+            stats['ttft_p95_ms'] = round(percentile(ttft, 95) * 1000, 1)
+        report[endpoint] = stats
+    return report
+
+def scrape_caches(base_url):
+    """hr_cache_requests_total from /metrics as {'parse/hit': n, ...}"""
+    import requests
+
+    try:
+        text = requests.get(base_url + '/metrics', timeout=10).text
+    except requests.RequestException:
+        return {}
+    caches = {}
+    for line in text.splitlines():
+        if line.startswith('hr_cache_requests_total{'):
+            labels, value = line[len('hr_cache_requests_total{'):].rsplit('} ', 1)
+            pairs = dict(pair.split('=', 1) for pair in labels.split(','))
+            caches[f"{pairs['cache'].strip(chr(34))}/{pairs['result'].strip(chr(34))}"] = float(value)
+    return caches
+
+def print_report(label, report, caches):
+    print(f"\n{label}")
+    print(f"  {'endpoint':12} {'req':>7} {'req/s':>8} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint, stats in report.items():
+        ttft = f"  ttft p50 {stats['ttft_p50_ms']:.0f} ms" if 'ttft_p50_ms' in stats else ''
+        print(f"  {endpoint:12} {stats['requests']:7} {stats['per_second']:8.1f} {100 * stats['error_rate']:6.1f} "
+              f"{stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}{ttft}")
+        failures = {status: count for status, count in stats['statuses'].items()
+                    if not status.isdigit() or int(status) >= 400}
+        if failures and endpoint != 'all':
+            print(f"  {'':12} errors: {failures}")
+    if caches:
+        print(f"  caches: {', '.join(f'{name} {int(count)}' for name, count in sorted(caches.items()))}")
+
+def parse_env(value):
+    name, sep, setting = value.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got {value}")
+    return name, setting
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Load an already running server instead of booting gunicorn')
+    parser.add_argument('--workers', default='4', help='Comma-separated worker counts to compare')
+    parser.add_argument('--worker-class', default='gthread', help='Comma-separated gunicorn worker classes')
+    parser.add_argument('--threads', type=int, default=16, help='Threads per gthread worker')
+    parser.add_argument('--concurrency', type=int, default=16, help='Client threads')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds per configuration')
+    parser.add_argument('--warmup', type=float, default=5, help='Seconds of traffic before measuring')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Endpoint weights, default {DEFAULT_MIX}")
+    parser.add_argument('--uploads', type=int, default=200, help='Distinct resumes to upload (repeats hit the parse cache)')
+    parser.add_argument('--upload-kinds', default='text_pdf,docx,long_pdf', help='Corpus kinds for uploads')
+    parser.add_argument('--database-url', help='Database for the app (default: a fresh SQLite file per run)')
+    parser.add_argument('--env', type=parse_env, action='append', default=[], help='Extra KEY=VALUE for the app')
+    parser.add_argument('--openai-latency-ms', type=float, default=800.0)
+    parser.add_argument('--openai-jitter-ms', type=float, default=200.0)
+    parser.add_argument('--openai-error-rate', type=float, default=0.0, help='Share of completions failing with 500')
+    parser.add_argument('--openai-rate-limit-rate', type=float, default=0.0, help='Share failing with 429')
+    parser.add_argument('--openai-token-ms', type=float, default=30.0, help='Delay between streamed chunks')
+    parser.add_argument('--json', help='Write results to this path')
+    args = parser.parse_args()
+    args.env = dict(args.env)
+
+    from resume_corpus import parse_kinds
+
+    corpus_dir = os.path.join(tempfile.gettempdir(), f'hr_resume_load_corpus_{args.uploads}')
+    manifest = generate(corpus_dir, args.uploads, kinds=parse_kinds(args.upload_kinds))
+    uploads = []
+    for entry in manifest['files']:
+        with open(os.path.join(corpus_dir, entry['file']), 'rb') as f:
+            uploads.append((entry['file'], f.read()))
+
+    fake, api_base = start_server(latency_ms=args.openai_latency_ms, jitter_ms=args.openai_jitter_ms,
+                                  error_rate=args.openai_error_rate, rate_limit_rate=args.openai_rate_limit_rate,
+                                  token_ms=args.openai_token_ms)
+    print(f"fake OpenAI at {api_base}: {args.openai_latency_ms:.0f}±{args.openai_jitter_ms:.0f} ms, "
+          f"{100 * args.openai_error_rate:.1f}% 500s, {100 * args.openai_rate_limit_rate:.1f}% 429s")
+
+    if args.url:
+        configurations = [(None, None)]
+    else:
+        configurations = list(itertools.product([int(w) for w in args.workers.split(',')],
+                                                [c.strip() for c in args.worker_class.split(',')]))
+    runs = []
+    for workers, worker_class in configurations:
+        workdir = tempfile.mkdtemp(prefix='hr_resume_load_')
+        process = None
+        try:
+            if args.url:
+                base_url, label = args.url.rstrip('/'), args.url
+            else:
+                process, base_url = boot(workers, worker_class, args.threads, api_base, workdir, args)
+                label = f"{workers} x {worker_class}" + (f" ({args.threads} threads)" if worker_class == 'gthread' else '')
+            openai_before = fake.requests
+            samples = drive(base_url, uploads, args.mix, args.concurrency, args.duration, args.warmup)
+            report = summarize(samples, args.duration)
+            caches = scrape_caches(base_url)
+            print_report(label, report, caches)
+            runs.append({'workers': workers, 'worker_class': worker_class, 'url': args.url,
+                         'threads': args.threads if worker_class == 'gthread' else None,
+                         'endpoints': report, 'caches': caches, 'openai_requests': fake.requests - openai_before})
+        finally:
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if len(runs) > 1:
+        print(f"\n{'configuration':28} {'req/s':>8} {'err%':>6} {'p95 ms':>9} {'p99 ms':>9}")
+        for run in runs:
+            total = run['endpoints'].get('all', {})
+            print(f"{run['workers']} x {run['worker_class']:22} {total.get('per_second', 0):8.1f} "
+                  f"{100 * total.get('error_rate', 0):6.1f} {total.get('p95_ms', 0):9.1f} {total.get('p99_ms', 0):9.1f}")
+
+    if args.json:
+        commit, dirty = git_commit()
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'commit': commit, 'dirty': dirty, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                       'concurrency': args.concurrency, 'duration_s': args.duration, 'warmup_s': args.warmup,
+                       'mix': args.mix, 'uploads': args.uploads, 'env': args.env,
+                       'database': 'custom' if args.database_url else 'sqlite',
+                       'openai': {'latency_ms': args.openai_latency_ms, 'jitter_ms': args.openai_jitter_ms,
+                                  'error_rate': args.openai_error_rate, 'rate_limit_rate': args.openai_rate_limit_rate,
+                                  'token_ms': args.openai_token_ms},
+                       'runs': runs}, f, indent=2, ensure_ascii=False)
+        print(f"results: {args.json}")
+    fake.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+"""Generate a reproducible synthetic resume corpus for parsing benchmarks.
+
+Every file is built from its own seeded random stream, so the same
+--seed and --count always give the same resumes. The corpus mixes:
+
+    text_pdf     1-2 page PDFs with a text layer
+    long_pdf     4-10 page CVs with long work histories
+    scanned_pdf  image-only PDFs (no text layer, needs OCR)
+    docx         Word documents
+
+in Vietnamese, English or both mixed. manifest.json lists every file with
+its kind, language, page count and the fields the parser should find.
+
+Vietnamese needs a TrueType font with its diacritics (DejaVu Sans, Arial);
+without one PDFs fall back to Helvetica and lose them, like badly embedded
+real-world PDFs do. Needs reportlab, Pillow and python-docx.
+
+    python benchmarks/resume_corpus.py /tmp/corpus --count 2000 --seed 7
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import zipfile
+import unicodedata
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GENERATOR_VERSION = 1  # Bump when the same seed would produce different files
+KINDS = {'text_pdf': 0.5, 'docx': 0.25, 'long_pdf': 0.15, 'scanned_pdf': 0.1}
+LANGUAGES = ('vi', 'en', 'mixed')
+FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+    'C:\\Windows\\Fonts\\arial.ttf',
+)
+SCAN_DPI = 150
+
+SURNAMES = ('Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng', 'Bùi', 'Đỗ')
+MIDDLE_NAMES = ('Văn', 'Thị', 'Minh', 'Thanh', 'Quốc', 'Ngọc', 'Hữu', 'Đức', 'Thu', 'Gia')
+GIVEN_NAMES = ('An', 'Bình', 'Châu', 'Dũng', 'Giang', 'Hà', 'Hải', 'Hùng', 'Khánh', 'Linh',
+               'Long', 'Mai', 'Nam', 'Phúc', 'Quân', 'Sơn', 'Thảo', 'Trang', 'Tuấn', 'Vy')
+EN_FIRST_NAMES = ('James', 'Emily', 'Daniel', 'Sophie', 'Michael', 'Olivia', 'David', 'Hannah')
+EN_LAST_NAMES = ('Smith', 'Johnson', 'Brown', 'Taylor', 'Wilson', 'Clarke', 'Walker', 'Hughes')
+
+TITLES = ('Software Engineer', 'Backend Developer', 'Data Engineer', 'Frontend Developer',
+          'DevOps Engineer', 'QA Engineer', 'Mobile Developer', 'Data Scientist')
+COMPANIES = ('FPT Software', 'Viettel Solutions', 'VNG Corporation', 'Tiki', 'MoMo', 'KMS Technology',
+             'Shopee Vietnam', 'Tech Company ABC', 'XYZ Solutions', 'NashTech')
+UNIVERSITIES = {
+    'vi': ('Đại học Bách Khoa Hà Nội', 'Đại học Quốc gia TP.HCM', 'Đại học FPT', 'Học viện Bưu chính Viễn thông'),
+    'en': ('Hanoi University of Science and Technology', 'Vietnam National University', 'RMIT University Vietnam'),
+}
+HEADINGS = {
+    'vi': {'education': 'HỌC VẤN', 'experience': 'KINH NGHIỆM LÀM VIỆC', 'skills': 'KỸ NĂNG',
+           'projects': 'DỰ ÁN NỔI BẬT', 'certificates': 'CHỨNG CHỈ'},
+    'en': {'education': 'EDUCATION', 'experience': 'WORK EXPERIENCE', 'skills': 'SKILLS',
+           'projects': 'PROJECTS', 'certificates': 'CERTIFICATIONS'},
+}
+LABELS = {
+    'vi': {'phone': 'Điện thoại', 'address': 'Địa chỉ', 'major': 'Chuyên ngành', 'present': 'Hiện tại'},
+    'en': {'phone': 'Phone', 'address': 'Address', 'major': 'Major', 'present': 'Present'},
+}
+BULLETS = {
+    'vi': ('Phát triển và duy trì các dịch vụ sử dụng {skill} và {other}',
+           'Tối ưu hóa hiệu suất truy vấn, giảm {n}% thời gian phản hồi',
+           'Hướng dẫn {n2} lập trình viên mới về {skill}',
+           'Xây dựng pipeline CI/CD với {skill}, triển khai hằng ngày',
+           'Thiết kế kiến trúc microservices phục vụ {n}0.000 người dùng',
+           'Phối hợp với đội sản phẩm để phân tích yêu cầu và ước lượng công việc'),
+    'en': ('Built and maintained services using {skill} and {other}',
+           'Cut query latency by {n}% through indexing and caching',
+           'Mentored {n2} junior developers on {skill}',
+           'Set up CI/CD pipelines with {skill}, shipping daily releases',
+           'Designed a microservice architecture serving {n}0,000 users',
+           'Worked with product owners on requirements and estimates'),
+}
+ADDRESSES = ('Hà Nội, Việt Nam', 'TP. Hồ Chí Minh, Việt Nam', 'Đà Nẵng, Việt Nam', 'Cần Thơ, Việt Nam')
+CERTIFICATES = ('AWS Certified Developer Associate', 'IELTS 7.0', 'TOEIC 850', 'Google Cloud Professional Engineer',
+                'Certified Kubernetes Administrator', 'Oracle Certified Java Programmer')
+
+def load_skill_names():
+    with open(os.path.join(ROOT, 'app', 'data', 'skills.json'), encoding='utf-8') as f:
+        return [skill['name'] for skill in json.load(f)['skills']]
+
+def ascii_fold(text):
+    text = text.replace('Đ', 'D').replace('đ', 'd')
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+def phone_number(rng):
+    digits = '09' + ''.join(rng.choice('0123456789') for _ in range(8))
+    layout = rng.choice(('plain', 'spaced', 'dashed', 'international'))
+    if layout == 'spaced':
+        return digits, f"{digits[:4]} {digits[4:7]} {digits[7:]}"
+    if layout == 'dashed':
+        return digits, f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+    if layout == 'international':
+        return '+84' + digits[1:], '+84' + digits[1:]
+    return digits, digits
+
+def build_resume(rng, language, skill_names, long=False):
+    """(lines, headings, expected fields) for one synthetic resume"""
+    def lang():
+        return rng.choice(('vi', 'en')) if language == 'mixed' else language
+
+    if language == 'en' and rng.random() < 0.5:
+        name = f"{rng.choice(EN_FIRST_NAMES)} {rng.choice(EN_LAST_NAMES)}"
+    else:
+        name = f"{rng.choice(SURNAMES)} {rng.choice(MIDDLE_NAMES)} {rng.choice(GIVEN_NAMES)}"
+    email = f"{ascii_fold(name).lower().replace(' ', '.')}{rng.randint(1, 999)}@{rng.choice(('gmail.com', 'email.com', 'outlook.com'))}"
+    phone, phone_text = phone_number(rng)
+    skills = rng.sample(skill_names, rng.randint(4, 12))
+    labels = LABELS[lang()]
+
+    lines = [name.upper() if rng.random() < 0.3 else name, rng.choice(TITLES), '',
+             f"Email: {email}", f"{labels['phone']}: {phone_text}", f"{labels['address']}: {rng.choice(ADDRESSES)}", '']
+    headings = set()
+
+    def section(key):
+        heading = HEADINGS[lang()][key]
+        headings.add(heading)
+        lines.append(heading)
+
+    section('education')
+    university_lang = lang()
+    year = rng.randint(2005, 2019)
+    lines += [f"{rng.choice(UNIVERSITIES[university_lang])} ({year}-{year + 4})",
+              f"- {LABELS[university_lang]['major']}: {rng.choice(('Computer Science', 'Công nghệ thông tin', 'Software Engineering'))}",
+              f"- GPA: {rng.randint(25, 40) / 10}/4.0", '']
+
+    section('experience')
+    jobs = rng.randint(12, 30) if long else rng.randint(1, 4)
+    end = 2025
+    for job in range(jobs):
+        start = end - rng.randint(1, 3)
+        job_lang = lang()
+        period = LABELS[job_lang]['present'] if job == 0 else end
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} ({start}-{period})")
+        for _ in range(rng.randint(3, 8) if long else rng.randint(2, 4)):
+            template = rng.choice(BULLETS[lang()])
+            lines.append('- ' + template.format(skill=rng.choice(skills), other=rng.choice(skills),
+                                                n=rng.randint(10, 70), n2=rng.randint(2, 8)))
+        lines.append('')
+        end = start
+
+    section('skills')
+    lines += [', '.join(skills), '']
+
+    section('certificates')
+    lines += [f"- {certificate}" for certificate in rng.sample(CERTIFICATES, rng.randint(1, 3))] + ['']
+
+    if long:
+        section('projects')
+        for project in range(rng.randint(4, 10)):
+            lines.append(f"Project {project + 1}: {rng.choice(('E-commerce Platform', 'AI Chatbot', 'Payment Gateway', 'HR Portal'))}")
+            lines += ['- ' + rng.choice(BULLETS[lang()]).format(skill=rng.choice(skills), other=rng.choice(skills),
+                                                                  n=rng.randint(10, 70), n2=rng.randint(2, 8))
+                      for _ in range(rng.randint(2, 4))]
+            lines.append('')
+
+    expected = {'name': name, 'email': email, 'phone': phone, 'skills': sorted(skills)}
+    return lines, headings, expected
+
+def find_font(font=None):
+    for candidate in ((font,) if font else FONT_CANDIDATES):
+        if candidate and os.path.exists(candidate):
+            return candidate
+    if font:
+        raise FileNotFoundError(f"Font not found: {font}")
+    return None
+
+def write_pdf(path, lines, headings, font_path):
+    """Text-layer PDF with wrapped lines; returns the page count"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfgen import canvas
+
+    regular, bold = 'Helvetica', 'Helvetica-Bold'
+    if font_path:
+        if 'CorpusFont' not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont('CorpusFont', font_path))
+        regular = bold = 'CorpusFont'
+
+    # invariant=1 leaves out the creation date so the same seed gives identical bytes
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    width, height = A4
+    y = height - inch
+    pages = 1
+    for line in lines:
+        if not line:
+            y -= 8
+            continue
+        font, size = (bold, 13) if line in headings else (regular, 11)
+        if line in headings:
+            y -= 10
+        for part in simpleSplit(line, font, size, width - 2 * inch):
+            if y < inch:
+                c.showPage()
+                pages += 1
+                y = height - inch
+            c.setFont(font, size)
+            c.drawString(inch, y, part)
+            y -= size + 4
+    c.save()
+    return pages
+
+def write_scanned_pdf(path, lines, font_path, rng):
+    """Image-only PDF: every page is a grayscale bitmap, as a scanner produces"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = int(8.27 * SCAN_DPI), int(11.69 * SCAN_DPI)
+    size = SCAN_DPI * 11 // 72
+    font = ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default()
+    margin, step = SCAN_DPI, size + size // 3
+    pages, draw, y = [], None, height
+    for line in lines:
+        if y + step > height - margin:
+            pages.append(Image.new('L', (width, height), 255))
+            draw, y = ImageDraw.Draw(pages[-1]), margin
+        if line:
+            # A little skew in the left edge, like a hand-fed page
+            draw.text((margin + rng.randint(-3, 3), y), line[:110], fill=rng.randint(0, 60), font=font)
+        y += step
+    fixed_date = time.gmtime(1577836800)  # 2020-01-01; Pillow stamps the current time otherwise
+    pages[0].save(path, 'PDF', resolution=SCAN_DPI, save_all=True, append_images=pages[1:],
+                  creationDate=fixed_date, modDate=fixed_date)
+    return len(pages)
+
+def write_docx(path, lines, headings):
+    from docx import Document
+
+    document = Document()
+    document.core_properties.created = document.core_properties.modified = datetime(2020, 1, 1)
+    for line in lines:
+        if line in headings:
+            document.add_heading(line, level=2)
+        elif line:
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    # Repack with fixed entry timestamps so the same seed gives identical bytes
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            target.writestr(zipfile.ZipInfo(info.filename, date_time=(2020, 1, 1, 0, 0, 0)),
+                            source.read(info.filename), zipfile.ZIP_DEFLATED)
+    return 1
+
+def generate(out_dir, count, seed=7, kinds=None, font=None):
+    """Write count resumes to out_dir and return the manifest (reused when it already matches)"""
+    kinds = kinds or KINDS
+    font_path = find_font(font)
+    settings = {'generator_version': GENERATOR_VERSION, 'seed': seed, 'count': count,
+                'kinds': kinds, 'font': os.path.basename(font_path) if font_path else None}
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if all(manifest.get(key) == value for key, value in settings.items()):
+            return manifest
+
+    if font_path is None:
+        print("warning: no TrueType font found, Vietnamese diacritics will be lost in PDFs (use --font)",
+              file=sys.stderr)
+    os.makedirs(out_dir, exist_ok=True)
+    skill_names = load_skill_names()
+    names, weights = list(kinds), list(kinds.values())
+    files = []
+    for i in range(count):
+        rng = random.Random(f"{seed}-{i}")
+        kind = rng.choices(names, weights=weights)[0]
+        language = rng.choice(LANGUAGES)
+        lines, headings, expected = build_resume(rng, language, skill_names, long=kind == 'long_pdf')
+        name = f"{i:05d}_{kind}_{language}.{'docx' if kind == 'docx' else 'pdf'}"
+        path = os.path.join(out_dir, name)
+        if kind == 'docx':
+            pages = write_docx(path, lines, headings)
+        elif kind == 'scanned_pdf':
+            pages = write_scanned_pdf(path, lines, font_path, rng)
+        else:
+            pages = write_pdf(path, lines, headings, font_path)
+        files.append({'file': name, 'kind': kind, 'language': language, 'pages': pages,
+                      'bytes': os.path.getsize(path), 'expected': expected})
+
+    manifest = dict(settings, files=files)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+    return manifest
+
+def parse_kinds(value):
+    """'text_pdf,docx' or 'text_pdf=3,docx=1' -> weights"""
+    kinds = {}
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name not in KINDS:
+            raise argparse.ArgumentTypeError(f"Unknown kind {name}, expected one of {', '.join(KINDS)}")
+        kinds[name] = float(weight or KINDS[name])
+    return kinds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('out_dir')
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--kinds', type=parse_kinds, help=f"Kinds and weights, default {KINDS}")
+    parser.add_argument('--font', help='TrueType font with Vietnamese glyphs')
+    args = parser.parse_args()
+
+    manifest = generate(args.out_dir, args.count, args.seed, args.kinds, args.font)
+    by_kind = {}
+    for entry in manifest['files']:
+        by_kind.setdefault(entry['kind'], []).append(entry)
+    for kind, entries in sorted(by_kind.items()):
+        print(f"{kind:12} {len(entries):6} files {sum(e['pages'] for e in entries):7} pages "
+              f"{sum(e['bytes'] for e in entries) / 1024 / 1024:8.1f} MB")
+    print(f"manifest: {os.path.join(args.out_dir, 'manifest.json')}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Gunicorn hooks; loaded automatically when gunicorn starts from this directory.
+
+Worker count and class stay on the command line (Procfile, service file).
+This file only gives the workers a shared METRICS_DIR, so /metrics reports
+totals for the whole server instead of the worker that happened to answer.
+"""
+import os
+import shutil
+import tempfile
+
+# One directory per master process, unless the deployment picks its own
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f'hr_resume_metrics_{os.getpid()}'))
+
+def on_starting(server):
+    # Counters restart with the server, like a single process would
+    shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['METRICS_DIR'], exist_ok=True)
+
+def child_exit(server, worker):
+    # Keep a recycled or crashed worker's counts so totals never go backwards
+    from app.services.metrics import archive_process
+
+    try:
+        archive_process(worker.pid)
+    except Exception as e:
+        server.log.warning(f"Could not archive metrics of worker {worker.pid}: {str(e)}")
+
+def on_exit(server):
+    shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
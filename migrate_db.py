@@ -0,0 +1,25 @@
+from app import create_app, db
+from app.schema import upgrade_schema
+from app.services.search import reindex_all
+from app.services.skill_search import backfill_candidate_skills
+
+def migrate_db():
+    """Upgrade an existing database without dropping data"""
+    app = create_app()
+    with app.app_context():
+        print("Creating missing tables and indexes...")
+        db.create_all()
+        upgrade_schema()
+        
+        print("Backfilling candidate skills...")
+        count = backfill_candidate_skills()
+        print(f"Backfilled skills for {count} candidates")
+        
+        print("Rebuilding the search index...")
+        count = reindex_all()
+        print(f"Indexed {count} candidates")
+        
+        print("Database migration completed successfully!")
+
+if __name__ == '__main__':
+    migrate_db()
@@ -12,7 +12,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 try:
-    app = create_app()
+    app = create_app(start_workers=True)
     logger.info("Application created successfully")
 except Exception as e:
     logger.error(f"Error creating application: {str(e)}")
@@ -0,0 +1,21 @@
+from app.config import Config
+from app.services.field_extractor import FieldExtractor
+from app.services.skill_taxonomy import load_taxonomy
+
+def _skills(text):
+    taxonomy = load_taxonomy(Config.SKILL_TAXONOMY_PATH)
+    return FieldExtractor(taxonomy.matcher).extract(text)['skills']
+
+def test_common_words_are_not_skills():
+    skills = _skills("Tôi là người mà ai cũng quý. Dùng ml để đo.\nCó thể express ý kiến rõ ràng.")
+    assert 'Trí tuệ nhân tạo' not in skills
+    assert 'Machine Learning' not in skills
+    assert 'Express' not in skills
+
+def test_guarded_aliases_still_match():
+    skills = _skills("Kỹ sư AI và ML\nBackend: Node.js, Express, Python")
+    assert 'Trí tuệ nhân tạo' in skills
+    assert 'Machine Learning' in skills
+    assert 'Express' in skills
+    assert 'Node.js' in skills
+    assert 'Express' in _skills("Xây dựng API bằng express.js")
@@ -1,6 +1,6 @@
 from app import create_app
 
-application = create_app()
+application = create_app(start_workers=True)
 
 if __name__ == "__main__":
     application.run()